@@ -1,7 +1,8 @@
 import dash
 from dash import html, dcc, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
-from pages import input_module, output_module, power_profiles, reporting, database
+import config
+from pages import input_module, output_module, power_profiles, reporting, database, fleet
 
 ###############################################################################
 # APP SETUP
@@ -57,6 +58,8 @@ def get_sidebar():
                         href="/output", active="exact", style=link_style),
             dbc.NavLink([html.I(className="fas fa-chart-line me-2"), " Dashboard & Scenarios"],
                         href="/power-profiles", active="exact", style=link_style),
+            dbc.NavLink([html.I(className="fas fa-ship me-2"), " Fleet"],
+                        href="/fleet", active="exact", style=link_style),
             dbc.NavLink([html.I(className="fas fa-chart-bar me-2"), " Reporting"],
                         href="/reporting", active="exact", style=link_style),
             dbc.NavLink([html.I(className="fas fa-database me-2"), " Reference Data Table"],
@@ -123,8 +126,15 @@ app.layout = html.Div([
     dcc.Store(id="vessel-data-store"),
     dcc.Store(id="future-data-store"),
     dcc.Store(id="api-data-store", storage_type="session"),
+    dcc.Store(id="api-data-base-store", storage_type="session"),  # Financial results in EUR
     dcc.Store(id="dashboard-scenarios-store"),  # Store for dashboard scenarios
+    dcc.Store(id="dashboard-scenarios-base-store"),  # Scenario results in EUR
+    dcc.Store(id="dashboard-columnar-store"),  # Columnar scenario results for clientside charts
+    dcc.Store(id="plotly-templates-store",
+              data=power_profiles.plotly_templates() if config.CLIENTSIDE_DASHBOARD else None),
+    dcc.Store(id="currency-store", storage_type="session", data="EUR"),  # Display currency
     dcc.Store(id="financial-data-store", storage_type="session"),
+    dcc.Store(id="financial-params-store", storage_type="session"),  # Params of the last Calculate
     dcc.Store(id="tab-switch"),
     # Replace the debug store with a Pre element for displaying debug text
     html.Pre(id="debug-dashboard-data", style={"backgroundColor": "#f8f9fa", "padding": "10px", "maxHeight": "200px", "overflowY": "scroll"}),
@@ -161,6 +171,8 @@ def update_breadcrumb(pathname):
         return base_items + [{"label": "Output", "href": "/output", "external_link": False}]
     elif pathname == "/power-profiles":
         return base_items + [{"label": "Dashboard & Scenarios", "href": "/power-profiles", "external_link": False}]
+    elif pathname == "/fleet":
+        return base_items + [{"label": "Fleet", "href": "/fleet", "external_link": False}]
     elif pathname == "/reporting":
         return base_items + [{"label": "Reporting", "href": "/reporting", "external_link": False}]
     elif pathname == "/database":
@@ -182,6 +194,8 @@ def display_page(pathname):
         return output_module.layout()
     elif pathname == "/power-profiles":
         return power_profiles.layout()
+    elif pathname == "/fleet":
+        return fleet.layout()
     elif pathname == "/reporting":
         return reporting.layout()
     elif pathname == "/database":
@@ -0,0 +1,356 @@
+// assets/dashboard_clientside.js
+//
+// Clientside versions of the dashboard chart callbacks (CLIENTSIDE_DASHBOARD).
+// They read the columnar scenario results in dashboard-columnar-store:
+//   {scenarios: [...], years: [...], columns: {metric: [[value per year] per scenario]}}
+// and build the same figures as pages/power_profiles.py and the summary
+// helpers in callbacks.py. Moving a year slider or changing the scenario
+// filter therefore never leaves the browser.
+(function () {
+    "use strict";
+
+    var COMPONENTS = [
+        ["Fuel", "fuel_price", "#EF553B"],
+        ["Maintenance", "maintenance", "#00CC96"],
+        ["Penalty", "penalty", "#FFA15A"],
+        ["Spare", "spare", "#19D3F3"],
+        ["EU ETS", "eu_ets", "#FF6692"]
+    ];
+    var PIE_COMPONENTS = [
+        ["Fuel", "fuel_price", "#1f77b4"],
+        ["Maintenance", "maintenance", "#ff7f0e"],
+        ["Spares", "spare", "#2ca02c"],
+        ["EU ETS", "eu_ets", "#d62728"],
+        ["FuelEU", "penalty", "#9467bd"]
+    ];
+    var SUMMARY_COMPONENTS = [
+        ["Fuel", "fuel_price", "#D9D2E9"],
+        ["Maintenance", "maintenance", "#F9CB9C"],
+        ["Spare", "spare", "#00CC96"],
+        ["EU ETS", "eu_ets", "#6FA8DC"],
+        ["Penalty", "penalty", "#FF9966"]
+    ];
+    var CHART_KEYS = ["metric", "min_future_opex", "dwelling", "single_year"];
+
+    // --- data helpers ---------------------------------------------------------
+    function yearIndexes(payload, start, end) {
+        var idx = [];
+        payload.years.forEach(function (year, y) {
+            if (year >= start && year <= end) { idx.push(y); }
+        });
+        return idx;
+    }
+
+    // Scenario rows in payload order, restricted to `selected` (all if null).
+    function scenarioRows(payload, selected) {
+        var rows = [];
+        payload.scenarios.forEach(function (name, s) {
+            if (!selected || selected.indexOf(name) !== -1) { rows.push(s); }
+        });
+        return rows;
+    }
+
+    function column(payload, metric) {
+        return payload.columns[metric] || null;
+    }
+
+    function total(payload, metric, s, years) {
+        var col = column(payload, metric);
+        var sum = 0;
+        if (!col) { return 0; }
+        years.forEach(function (y) {
+            var v = col[s][y];
+            if (v !== null && v !== undefined) { sum += v; }
+        });
+        return sum;
+    }
+
+    function hasRecord(payload, s, y) {
+        return Object.keys(payload.columns).some(function (metric) {
+            var v = payload.columns[metric][s][y];
+            return v !== null && v !== undefined;
+        });
+    }
+
+    // Stable sort of indexes by key (ascending unless `descending`).
+    function order(n, key, descending) {
+        var idx = [];
+        for (var i = 0; i < n; i++) { idx.push(i); }
+        return idx.sort(function (a, b) {
+            var d = descending ? key(b) - key(a) : key(a) - key(b);
+            return d !== 0 ? d : a - b;
+        });
+    }
+
+    // Python's f"{v:,.0f}"
+    function money(v) {
+        var r = Math.round(Math.abs(v));
+        var text = String(r).replace(/\B(?=(\d{3})+(?!\d))/g, ",");
+        return (v < 0 && r !== 0 ? "-" : "") + text;
+    }
+
+    // Python's str.title()
+    function titleCase(text) {
+        return text.toLowerCase().replace(/(^|[^a-z])([a-z])/g, function (m, p, c) {
+            return p + c.toUpperCase();
+        });
+    }
+
+    function figure(data, layout, templates, template) {
+        if (templates && templates[template || "plotly"]) {
+            layout.template = templates[template || "plotly"];
+        }
+        return {data: data, layout: layout};
+    }
+
+    // --- figures (mirror pages/power_profiles.py) ------------------------------
+    function metricFigure(payload, metric, range, selected, templates) {
+        var years = yearIndexes(payload, range[0], range[1]);
+        var col = column(payload, metric);
+        var data = [];
+        (selected || []).forEach(function (name) {
+            var s = payload.scenarios.indexOf(name);
+            if (s === -1 || !col) { return; }
+            var x = [], y = [];
+            years.forEach(function (i) {
+                var v = col[s][i];
+                if (v !== null && v !== undefined) { x.push(payload.years[i]); y.push(v); }
+            });
+            if (x.length) {
+                data.push({type: "scatter", x: x, y: y, mode: "lines+markers", name: name});
+            }
+        });
+        var label = titleCase(metric.replace(/_/g, " "));
+        return figure(data, {
+            title: {text: label + " Comparison"},
+            xaxis: {title: {text: "Year"}},
+            yaxis: {title: {text: label}},
+            legend: {orientation: "h", yanchor: "bottom", y: 1.02, xanchor: "center", x: 0.5},
+            margin: {l: 40, r: 40, t: 60, b: 40},
+            hovermode: "y unified"
+        }, templates);
+    }
+
+    function minFutureOpexFigure(payload, rows, range, templates) {
+        var years = yearIndexes(payload, range[0], range[1]);
+        var names = [], totals = [];
+        rows.forEach(function (s) {
+            var t = total(payload, "opex", s, years);
+            if (t) { names.push(payload.scenarios[s]); totals.push(t); }
+        });
+        return figure([{
+            type: "bar", x: totals, y: names, orientation: "h", marker: {color: "steelblue"},
+            text: totals.map(function (v) { return "€" + money(v); }), textposition: "auto"
+        }], {
+            title: {text: "Summed Opex per Scenario (" + range[0] + "–" + range[1] + ")"},
+            xaxis: {title: {text: "Total Opex (€)"}},
+            yaxis: {title: {text: "Scenario"}},
+            margin: {l: 140, r: 40, t: 60, b: 50},
+            hovermode: "y unified"
+        }, templates);
+    }
+
+    function dwellingPieFigure(payload, selected, templates) {
+        var all = payload.years.map(function (_, y) { return y; });
+        var n = selected.length;
+        var cols = Math.min(3, n), rows = Math.ceil(n / cols);
+        var hs = 0.2 / cols, vs = 0.3 / rows;
+        var width = (1 - hs * (cols - 1)) / cols, height = (1 - vs * (rows - 1)) / rows;
+        var data = [], annotations = [];
+        selected.forEach(function (name, i) {
+            var s = payload.scenarios.indexOf(name);
+            var sums = PIE_COMPONENTS.map(function (c) { return s === -1 ? 0 : total(payload, c[1], s, all); });
+            var sum = sums.reduce(function (a, b) { return a + b; }, 0) || 1;
+            var r = Math.floor(i / cols), c = i % cols;
+            var x0 = c * (width + hs), top = 1 - r * (height + vs);
+            data.push({
+                type: "pie",
+                labels: PIE_COMPONENTS.map(function (p) { return p[0]; }),
+                values: sums.map(function (v) { return v / sum * 100; }),
+                marker: {colors: PIE_COMPONENTS.map(function (p) { return p[2]; })},
+                textinfo: "percent+label", hoverinfo: "value", showlegend: false,
+                domain: {x: [x0, x0 + width], y: [top - height, top]}
+            });
+            annotations.push({
+                text: name, x: x0 + width / 2, y: top, xref: "paper", yref: "paper",
+                xanchor: "center", yanchor: "bottom", showarrow: false, font: {size: 16}
+            });
+        });
+        return figure(data, {
+            annotations: annotations,
+            title: {text: "Dwelling at Berth – Cost Distribution"},
+            height: rows * 350,
+            uniformtext: {minsize: 12, mode: "hide"},
+            margin: {t: 80, b: 40, l: 40, r: 40}
+        }, templates);
+    }
+
+    function rangeStackedBar(payload, rows, range, templates) {
+        var years = yearIndexes(payload, range[0], range[1]);
+        var names = [], sums = [];
+        rows.forEach(function (s) {
+            var row = COMPONENTS.map(function (c) { return total(payload, c[1], s, years); });
+            if (row.some(function (v) { return v !== 0; })) { names.push(payload.scenarios[s]); sums.push(row); }
+        });
+        if (!names.length) {
+            return figure([], {title: {text: "No data between " + range[0] + " and " + range[1]}}, templates);
+        }
+        var byTotal = order(names.length, function (i) {
+            return sums[i].reduce(function (a, b) { return a + b; }, 0);
+        }, true);
+        var compOrder = order(COMPONENTS.length, function (c) {
+            return sums.reduce(function (a, row) { return a + row[c]; }, 0);
+        }, true);
+        var data = compOrder.map(function (c) {
+            var values = byTotal.map(function (i) { return sums[i][c]; });
+            return {
+                type: "bar", y: byTotal.map(function (i) { return names[i]; }), x: values,
+                name: COMPONENTS[c][0], orientation: "h", marker: {color: COMPONENTS[c][2]},
+                text: values.map(function (v) { return "€" + money(v); }), textposition: "auto",
+                hovertemplate: "Scenario: %{y}<br>" + COMPONENTS[c][0] + ": €%{x:,.0f}<extra></extra>"
+            };
+        });
+        return figure(data, {
+            barmode: "stack",
+            hovermode: "y unified",
+            title: {text: "Cost Breakdown per Scenario (" + range[0] + "–" + range[1] + ")"},
+            xaxis: {title: {text: "Cost"}, tickprefix: "€", hoverformat: ", .0f"},
+            yaxis: {title: {text: "Scenario"}},
+            margin: {l: 140, r: 40, t: 60, b: 50},
+            legend: {title: {text: "Component"}}
+        }, templates);
+    }
+
+    // --- summary charts (mirror callbacks.create_opex_chart / create_other_costs_chart)
+    function summaryTotals(payload, fuels, start, end) {
+        var years = yearIndexes(payload, start, end);
+        var totals = {};
+        scenarioRows(payload, fuels).forEach(function (s) {
+            if (!years.some(function (y) { return hasRecord(payload, s, y); })) { return; }
+            var t = {opex: total(payload, "opex", s, years)};
+            SUMMARY_COMPONENTS.forEach(function (c) { t[c[1]] = total(payload, c[1], s, years); });
+            totals[payload.scenarios[s]] = t;
+        });
+        return totals;
+    }
+
+    function emptySummaryFigure(title, text, templates) {
+        var annotations = text ? [{text: text, xref: "paper", yref: "paper", x: 0.5, y: 0.5,
+                                   showarrow: false, font: {size: 16}}] : [];
+        return figure([], {title: {text: title}, annotations: annotations}, templates);
+    }
+
+    function opexChart(fuels, totals, start, end, templates) {
+        var sorted = fuels.slice().sort(function (a, b) {
+            var d = totals[a].opex - totals[b].opex;
+            return d !== 0 ? d : (a < b ? -1 : a > b ? 1 : 0);
+        });
+        return figure([{
+            type: "bar", x: sorted, y: sorted.map(function (f) { return totals[f].opex; }), name: "OPEX Σ"
+        }], {
+            title: {text: "OPEX Summary (" + start + "–" + end + ")"},
+            xaxis: {title: {text: "Scenario"}},
+            yaxis: {title: {text: "€"}, tickformat: ",.0f"},
+            height: 400,
+            margin: {l: 50, r: 50, t: 50, b: 50}
+        }, templates, "plotly_white");
+    }
+
+    function otherCostsChart(fuels, totals, start, end, templates) {
+        var scenarioTotal = function (f) {
+            return SUMMARY_COMPONENTS.reduce(function (a, c) { return a + totals[f][c[1]]; }, 0);
+        };
+        var sorted = order(fuels.length, function (i) { return scenarioTotal(fuels[i]); }, false)
+            .map(function (i) { return fuels[i]; });
+        var comps = order(SUMMARY_COMPONENTS.length, function (c) {
+            return fuels.reduce(function (a, f) { return a + totals[f][SUMMARY_COMPONENTS[c][1]]; }, 0);
+        }, false);
+        var data = comps.map(function (c) {
+            var comp = SUMMARY_COMPONENTS[c];
+            return {
+                type: "bar", x: sorted, y: sorted.map(function (f) { return totals[f][comp[1]]; }),
+                name: comp[0], marker: {color: comp[2]}
+            };
+        });
+        return figure(data, {
+            barmode: "stack",
+            title: {text: "Other Costs Breakdown (" + start + "–" + end + ")"},
+            xaxis: {title: {text: "Scenario"}},
+            yaxis: {title: {text: "€"}, tickformat: ",.0f"},
+            height: 400,
+            margin: {l: 50, r: 50, t: 50, b: 50}
+        }, templates, "plotly_white");
+    }
+
+    // --- callbacks --------------------------------------------------------------
+    function dashboardCharts(selectedCharts, metric, range, payload, singleYear, selected, templates) {
+        // dash-renderer defines no_update only once it runs clientside callbacks,
+        // after this asset has loaded, so look it up on every call.
+        var noUpdate = window.dash_clientside.no_update;
+        var hidden = CHART_KEYS.map(function () { return {display: "none"}; });
+        var noFigures = CHART_KEYS.map(function () { return noUpdate; });
+        if (!payload || !payload.scenarios.length) {
+            return ["No data available. Please calculate scenarios first.", "text-center text-danger"]
+                .concat(noFigures, hidden);
+        }
+        if (!selected || !selected.length) {
+            return ["No scenarios selected. Please select scenarios to display.", "text-warning"]
+                .concat(noFigures, hidden);
+        }
+        var charts = CHART_KEYS.filter(function (key) { return (selectedCharts || []).indexOf(key) !== -1; });
+        if (!charts.length) {
+            return ["Please select at least one chart to display.", "text-warning"].concat(noFigures, hidden);
+        }
+        var rows = scenarioRows(payload, selected);
+        var figures = {};
+        if (charts.indexOf("metric") !== -1) {
+            figures.metric = metricFigure(payload, metric, range, selected, templates);
+        }
+        if (charts.indexOf("min_future_opex") !== -1) {
+            figures.min_future_opex = minFutureOpexFigure(payload, rows, range, templates);
+        }
+        if (charts.indexOf("dwelling") !== -1) {
+            figures.dwelling = dwellingPieFigure(payload, selected, templates);
+        }
+        if (charts.indexOf("single_year") !== -1) {
+            if (singleYear === "all") {
+                figures.single_year = rangeStackedBar(payload, rows, range, templates);
+            } else if (isNaN(parseInt(singleYear, 10))) {
+                figures.single_year = figure([], {title: {text: "Invalid year selected"}}, templates);
+            } else {
+                var yr = parseInt(singleYear, 10);
+                figures.single_year = rangeStackedBar(payload, rows, [yr, yr], templates);
+            }
+        }
+        return [null, ""]
+            .concat(CHART_KEYS.map(function (key) { return figures[key] || noUpdate; }))
+            .concat(CHART_KEYS.map(function (key) { return {display: figures[key] ? "block" : "none"}; }));
+    }
+
+    function summaryCharts(payload, fuels, range, templates) {
+        if (!payload || !payload.scenarios.length || !fuels || !fuels.length) {
+            var empty = emptySummaryFigure("No data available", "Please select scenarios to compare", templates);
+            return [empty, empty];
+        }
+        var start = range[0], end = range[1];
+        var totals = summaryTotals(payload, fuels, start, end);
+        fuels = fuels.filter(function (f) { return totals.hasOwnProperty(f); });
+        if (!fuels.length) {
+            var none = emptySummaryFigure("No data between " + start + " and " + end, null, templates);
+            return [none, none];
+        }
+        return [opexChart(fuels, totals, start, end, templates), otherCostsChart(fuels, totals, start, end, templates)];
+    }
+
+    var namespace = {
+        dashboardCharts: dashboardCharts,
+        summaryCharts: summaryCharts
+    };
+    if (typeof window !== "undefined") {
+        window.dash_clientside = Object.assign({}, window.dash_clientside);
+        window.dash_clientside.dashboard = Object.assign({}, window.dash_clientside.dashboard, namespace);
+    }
+    if (typeof module !== "undefined") {
+        module.exports = namespace;
+    }
+})();
@@ -1,6 +1,9 @@
+import base64
+import hashlib
 import json
+import os
+import sqlite3
 from dash import dash_table
-import requests
 from urllib.parse import urlencode
 from datetime import datetime
 import pandas as pd
@@ -18,15 +21,25 @@ from dash.dcc import send_bytes
 #from reportlab.lib.pagesizes import A4
 #from reportlab.pdfgen import canvas
 import dash
-from dash import html, dcc, Input, Output, State, no_update, callback_context
+from dash import html, dcc, Input, Output, State, no_update, callback_context, ClientsideFunction, Patch
 from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import config
+from services.cache import cached_get, financial_cache
+from services.currency import BASE_CURRENCY, to_currency
+from services.result_store import load_scenario_results, resolve_result, store_result
+from services.scenarios import fetch_scenarios, scenario_cache
+from services.vessel_index import get_vessel_index
+from services.fleet import FleetJob, read_imos, list_jobs as list_fleet_jobs, start_job as start_fleet_run
+from services import async_client
+from engine import ScenarioResults, compare_with_remote, evaluate_scenarios, optimize_blend, run_financial_model
 import plotly.graph_objects as go
+from plotly.utils import PlotlyJSONEncoder
 import numpy as np
 import pages
 import pages.power_profiles
 import pages.input_module
+import pages.fleet
 from pages.input_module import get_vessel_details, DEFAULT_VESSEL, DEFAULT_PLACES 
 from pages.output_module import (
     get_current_output_table,
@@ -84,6 +97,62 @@ def build_api_url(params, endpoint):
     print(f"Final API URL: {url}")
     return url
 
+# -------------------------------------------------------------------------------
+# Figure updates: a dash.Patch instead of the whole figure when only data changed
+# -------------------------------------------------------------------------------
+# A figure's signature hashes everything except its title and the contents of
+# the top-level arrays of its traces (x, y, text, values, ...). A callback keeps the
+# signatures of the figures the browser shows in a dcc.Store next to the graphs.
+# If the layout is unchanged, only the arrays and the title are sent. Moving a
+# year slider rewrites trace data only. Toggling scenarios deletes and appends
+# traces. Anything else (a new layout, reordered traces) sends the full figure.
+def _digest(value):
+    text = json.dumps(value, sort_keys=True, cls=PlotlyJSONEncoder)
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+def _is_array(value):
+    return isinstance(value, (list, tuple, np.ndarray))
+
+def figure_signature(fig):
+    """{"layout": hash, "traces": [[name, hash], ...]} of a go.Figure."""
+    fig = fig.to_plotly_json()
+    layout = {k: v for k, v in fig.get("layout", {}).items() if k != "title"}
+    layout["has_title"] = "title" in fig.get("layout", {})
+    traces = [[trace.get("name"), _digest({**{k: v for k, v in trace.items() if not _is_array(v)},
+                                           "arrays": sorted(k for k, v in trace.items() if _is_array(v))})]
+              for trace in fig.get("data", [])]
+    return {"layout": _digest(layout), "traces": traces}
+
+def figure_update(fig, previous):
+    """
+    (figure or Patch, signature) for a graph currently showing the figure whose
+    signature is `previous` (None when unknown, e.g. on a fresh page).
+    """
+    signature = figure_signature(fig)
+    if not previous or previous["layout"] != signature["layout"]:
+        return fig, signature
+    old = [tuple(t) for t in previous["traces"]]
+    new = [tuple(t) for t in signature["traces"]]
+    kept = [t for t in old if t in new]
+    if len(set(old)) != len(old) or len(set(new)) != len(new) or new[:len(kept)] != kept:
+        return fig, signature
+
+    data = fig.to_plotly_json()
+    patch = Patch()
+    for i in reversed(range(len(old))):
+        if old[i] not in new:
+            del patch["data"][i]
+    for i, trace in enumerate(data.get("data", [])):
+        if i < len(kept):
+            for k, v in trace.items():
+                if _is_array(v):
+                    patch["data"][i][k] = v
+        else:
+            patch["data"].append(trace)
+    if "title" in data.get("layout", {}):
+        patch["layout"]["title"] = data["layout"]["title"]
+    return patch, signature
+
 # -------------------------------------------------------------------------------
 # Dashboard Scenarios:
 # -------------------------------------------------------------------------------
@@ -137,19 +206,94 @@ def fetch_dashboard_scenarios(vessel_data, future_data):
         "MAIN_ENGINE_TYPE": vessel_data.get("MAIN_ENGINE_TYPE", "4-STROKE"),
         "AUX_ENGINE_SPEED": vessel_data.get("AUX_ENGINE_SPEED", "MEDIUM"),
         "AUX_ENGINE_TYPE": vessel_data.get("AUX_ENGINE_TYPE", "4-STROKE"),
-        "price_conversion": float(vessel_data.get("price_conversion", 1)),
+        "price_conversion": 1,  # EUR; converted locally for display
     }
     qs = urlencode(params, doseq=True)
     url = f"{config.DASHBOARD_ENDPOINT}?{qs}"
     print(f"Dashboard API URL: {url}")
     try:
-        response = requests.get(url, timeout=60)
-        response.raise_for_status()
-        return response.json()
+        return cached_get(scenario_cache, config.DASHBOARD_ENDPOINT, params, timeout=60)
     except Exception as e:
         print(f"Dashboard API Error: {str(e)}")
         return {}
 
+# -------------------------------------------------------------------------------
+# Dashboard Scenarios: base parameters shared by every scenario request
+# -------------------------------------------------------------------------------
+def build_scenario_params(vessel_data, future_data):
+    """Base query parameters for the scenarios endpoint, built from the stores."""
+    vessel_data = merge_vessel_data(vessel_data)
+    future_data = future_data or {}
+
+    main_power = vessel_data.get("total_engine_power", 10400)
+    aux_power = vessel_data.get("average_hoteling_kw", 2246)
+    main_fuel_type = vessel_data.get("main_fuel_type", "MDO")
+    aux_fuel_type = vessel_data.get("aux_fuel_type", "MDO")
+    sailing_days = vessel_data.get("sailing_days", 199)
+    working_days = vessel_data.get("working_days", 40)
+    idle_days = vessel_data.get("idle_days", 126)
+    shore_days = vessel_data.get("shore_days", 0)
+    sailing_engine_load = vessel_data.get("sailing_engine_load", 50)
+    engine_maint_cost = vessel_data.get("ENGINE_MAINTENANCE_COSTS_PER_HOUR", 20)
+    spares_cost = vessel_data.get("SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR", 2)
+    shore_enable = vessel_data.get("shore_enable", False)
+    shore_port = vessel_data.get("shore_port", 2)
+    reporting_year = vessel_data.get("reporting_year", 2030)
+    capex = vessel_data.get("CAPEX", 19772750)
+    main_engine_speed = vessel_data.get("MAIN_ENGINE_SPEED", "MEDIUM")
+    main_engine_type = vessel_data.get("MAIN_ENGINE_TYPE", "4-STROKE")
+    aux_engine_speed = vessel_data.get("AUX_ENGINE_SPEED", "MEDIUM")
+    aux_engine_type = vessel_data.get("AUX_ENGINE_TYPE", "4-STROKE")
+
+    biofuels_spares_cost = future_data.get("biofuels-spares-cost", 3)
+    parasitic_load = future_data.get("parasitic-load", 95)
+    biofuels_blend = future_data.get("biofuels-blend", 30)
+    shore_maint_cost = future_data.get("shore-maint-cost", 480)
+    shore_spares_cost = future_data.get("shore-spares-cost", 480)
+    inflation_rate = future_data.get("inflation-rate", 2)
+    npv_rate = future_data.get("npv-rate", 0)
+
+    shore_enable_bool = str(shore_enable).strip().lower() in ["yes", "true"]
+
+    try:
+        blend_value = float(biofuels_blend)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid biofuels blend percentage provided.")
+    if blend_value > 1:
+        blend_value /= 100.0
+
+    # Each selected scenario is requested (and cached) separately on top of these.
+    # Results are always fetched in EUR; the display currency is applied locally.
+    return {
+        "vessel_id": vessel_data.get("vessel_id", 48217),
+        "main_engine_power_kw": float(main_power),
+        "aux_engine_power_kw": float(aux_power),
+        "sailing_engine_load": float(sailing_engine_load) / 100,
+        "working_days": float(working_days),
+        "idle_days": int(idle_days),
+        "shore_days": int(shore_days),
+        "shore_port": int(shore_port),
+        "main_fuel_type": main_fuel_type,
+        "aux_fuel_type": aux_fuel_type,
+        "BIOFUELS_BLEND_PERCENTAGE": blend_value,
+        "reporting_year": int(reporting_year),
+        "ENGINE_MAINTENANCE_COSTS_PER_HOUR": float(engine_maint_cost),
+        "SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(spares_cost),
+        "SHORE_POWER_MAINTENANCE_PER_DAY": float(shore_maint_cost),
+        "SHORE_POWER_SPARES_PER_DAY": float(shore_spares_cost),
+        "BIOFUELS_SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(biofuels_spares_cost),
+        "PARASITIC_LOAD_ENGINE": float(parasitic_load) / 100 if parasitic_load else 0.95,
+        "shore_enable": str(shore_enable_bool).lower(),
+        "inflation_rate": float(inflation_rate) / 100 if inflation_rate else 0.02,
+        "npv_rate": float(npv_rate) / 100.0,
+        "CAPEX": float(capex),
+        "MAIN_ENGINE_SPEED": main_engine_speed,
+        "MAIN_ENGINE_TYPE": main_engine_type,
+        "AUX_ENGINE_SPEED": aux_engine_speed,
+        "AUX_ENGINE_TYPE": aux_engine_type,
+        "price_conversion": 1,
+    }
+
 # -------------------------------------------------------------------------------
 # Financial Data: Using your first API (penalty parameters removed, scenario omitted)
 # -------------------------------------------------------------------------------
@@ -220,16 +364,194 @@ def get_financial_data(input_params=None, vessel_data_override=None):
         if final_params.get(key, 0) < 0:
             raise ValueError(f"{key} cannot be negative")
     
-    qs = urlencode(final_params, doseq=True)
-    url = f"{config.FINANCIAL_ENDPOINT}?{qs}"
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        return response.json()
+        return run_financial(final_params)
     except Exception as e:
         print(f"Financial API Error: {str(e)}")
         return {}
 
+def run_financial(params):
+    """
+    Financial model for `params`, from the local engine or the (cached) API
+    depending on config.FINANCIAL_MODEL_SOURCE.
+    """
+    if config.FINANCIAL_MODEL_SOURCE != "local":
+        return cached_get(financial_cache, config.FINANCIAL_ENDPOINT, params, timeout=15)
+    result = run_financial_model(params)
+    if config.LOCAL_MODEL_CROSS_CHECK:
+        async_client.submit(_cross_check(dict(params)), label="financial model cross-check")
+    return result
+
+async def _cross_check(params):
+    report = await async_client.to_io(compare_with_remote, params)
+    worst = sorted(report.items(), key=lambda kv: kv[1], reverse=True)[:3]
+    print("Local model cross-check (max relative diff): "
+          + ", ".join(f"{key}={diff:.1%}" for key, diff in worst))
+
+# -------------------------------------------------------------------------------
+# Financial Data: parameters for the Calculate button
+# -------------------------------------------------------------------------------
+# Field names in the same order as the States of update_financial_data.
+FINANCIAL_FORM_FIELDS = (
+    "main_power", "aux_power", "main_fuel_type", "aux_fuel_type",
+    "sailing_days", "working_days", "idle_days", "shore_days",
+    "sailing_engine_load", "working_engine_load", "shore_engine_load",
+    "engine_maint_cost", "spares_cost",
+    "future_main_fuel_type", "future_aux_fuel_type", "biofuels_spares_cost",
+    "parasitic_load", "biofuels_blend",
+    "shore_maint_cost", "shore_spares_cost", "shore_enable", "npv_rate", "capex",
+    "shore_port", "reporting_year", "inflation_rate",
+    "main_engine_speed", "main_engine_type",
+    "aux_engine_speed", "aux_engine_type", "vessel_data",
+    "existing_future_data", "currency_choice",
+)
+
+def build_financial_params(form):
+    """Query parameters for the financial endpoint from the input form values."""
+    vessel_data = form.get("vessel_data") or {}
+    shore_enable_bool = str(form["shore_enable"]).strip().lower() in ["yes", "true"]
+
+    try:
+        blend_value = float(form["biofuels_blend"])
+    except ValueError:
+        raise ValueError("Invalid biofuels blend percentage provided.")
+    if blend_value > 1:
+        blend_value /= 100.0
+
+    sailing_engine_load = form["sailing_engine_load"]
+    working_engine_load = form["working_engine_load"]
+    shore_engine_load = form["shore_engine_load"]
+    parasitic_load = form["parasitic_load"]
+    inflation_rate = form["inflation_rate"]
+
+    params = {
+        "vessel_id": vessel_data.get("vessel_id", 48217),
+        "main_engine_power_kw": float(form["main_power"]),
+        "aux_engine_power_kw": float(form["aux_power"]),
+        "main_fuel_type": form["main_fuel_type"],
+        "aux_fuel_type": form["aux_fuel_type"],
+        "future_main_fuel_type": form["future_main_fuel_type"],
+        "future_aux_fuel_type": form["future_aux_fuel_type"],
+        "sailing_days": int(form["sailing_days"]),
+        "working_days": int(form["working_days"]),
+        "idle_days": int(form["idle_days"]),
+        "shore_days": int(form["shore_days"]),
+        "shore_port": int(form["shore_port"]),
+        "sailing_engine_load": float(sailing_engine_load)/100 if sailing_engine_load else 0.5,
+        "working_engine_load": float(working_engine_load)/100 if working_engine_load else 0.3,
+        "shore_engine_load": float(shore_engine_load)/100 if shore_engine_load else 0.4,
+        "reporting_year": int(form["reporting_year"]),
+        "ENGINE_MAINTENANCE_COSTS_PER_HOUR": float(form["engine_maint_cost"]),
+        "SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(form["spares_cost"]),
+        "SHORE_POWER_MAINTENANCE_PER_DAY": float(form["shore_maint_cost"]),
+        "SHORE_POWER_SPARES_PER_DAY": float(form["shore_spares_cost"]),
+        "BIOFUELS_SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(form["biofuels_spares_cost"]),
+        "PARASITIC_LOAD_ENGINE": float(parasitic_load)/100 if parasitic_load else 0.95,
+        "BIOFUELS_BLEND_PERCENTAGE": blend_value,
+        "shore_enable": shore_enable_bool,
+        "inflation_rate": float(inflation_rate)/100 if inflation_rate else 0.02,
+        "npv_rate": float(form["npv_rate"]) / 100.0,
+        "CAPEX": float(form["capex"]),
+        "MAIN_ENGINE_SPEED": form["main_engine_speed"],
+        "MAIN_ENGINE_TYPE": form["main_engine_type"],
+        "AUX_ENGINE_SPEED": form["aux_engine_speed"],
+        "AUX_ENGINE_TYPE": form["aux_engine_type"],
+        "price_conversion": 1,  # EUR; converted locally for display
+    }
+
+    if params["BIOFUELS_BLEND_PERCENTAGE"] > 1:
+        raise ValueError("Biofuel blend percentage cannot exceed 100%")
+    for key in ["sailing_days", "working_days", "idle_days"]:
+        if params[key] < 0:
+            raise ValueError(f"{key} cannot be negative")
+    return params
+
+def default_financial_form(vessel_data, future_data=None):
+    """
+    The form values the input page shows right after `vessel_data` is loaded,
+    i.e. what update_financial_data would receive if Calculate is pressed
+    without further edits.
+    """
+    from pages.input_module import (
+        DEFAULT_SHORE_ENABLE,
+        DEFAULT_CAPEX,
+        DEFAULT_SHORE_PORT,
+        DEFAULT_REPORTING_YEAR,
+        DEFAULT_MAIN_ENGINE_SPEED,
+        DEFAULT_AUX_ENGINE_SPEED,
+    )
+    specs = vessel_data or DEFAULT_VESSEL
+    merged = {**DEFAULT_VESSEL, **(vessel_data or {})}
+    (
+        future_main_fuel_type, future_aux_fuel_type, biofuels_spares_cost,
+        parasitic_load, biofuels_blend, shore_maint_cost, shore_spares_cost,
+        inflation_rate, npv_rate, currency_choice
+    ) = update_future_inputs_callback(vessel_data, future_data)
+    return {
+        "main_power": specs.get("total_engine_power", DEFAULT_VESSEL.get("total_engine_power", 10400)),
+        "aux_power": specs.get("average_hoteling_kw", 2246),
+        "main_fuel_type": specs.get("main_fuel_type", "MDO"),
+        "aux_fuel_type": specs.get("aux_fuel_type", "MDO"),
+        "sailing_days": merged.get("sailing_days", 199),
+        "working_days": merged.get("working_days", 40),
+        "idle_days": merged.get("idle_days", 126),
+        "shore_days": merged.get("shore_days", 0),
+        "sailing_engine_load": merged.get("sailing_engine_load", 0.5),
+        "working_engine_load": merged.get("working_engine_load", 0.3),
+        "shore_engine_load": merged.get("shore_engine_load", 0.395),
+        "engine_maint_cost": merged.get("ENGINE_MAINTENANCE_COSTS_PER_HOUR", 20),
+        "spares_cost": merged.get("SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR", 2),
+        "future_main_fuel_type": future_main_fuel_type,
+        "future_aux_fuel_type": future_aux_fuel_type,
+        "biofuels_spares_cost": biofuels_spares_cost,
+        "parasitic_load": parasitic_load,
+        "biofuels_blend": biofuels_blend,
+        "shore_maint_cost": shore_maint_cost,
+        "shore_spares_cost": shore_spares_cost,
+        "shore_enable": "Yes" if DEFAULT_SHORE_ENABLE else "No",
+        "npv_rate": npv_rate,
+        "capex": DEFAULT_CAPEX,
+        "shore_port": DEFAULT_SHORE_PORT,
+        "reporting_year": DEFAULT_REPORTING_YEAR,
+        "inflation_rate": inflation_rate,
+        "main_engine_speed": DEFAULT_MAIN_ENGINE_SPEED,
+        "main_engine_type": specs.get("main_engine_type", "4-STROKE"),
+        "aux_engine_speed": DEFAULT_AUX_ENGINE_SPEED,
+        "aux_engine_type": specs.get("aux_engine_type", "4-STROKE"),
+        "vessel_data": vessel_data or {},
+        "existing_future_data": future_data or {},
+        "currency_choice": currency_choice,
+    }
+
+# -------------------------------------------------------------------------------
+# Prefetch: warm the response caches as soon as a vessel is selected
+# -------------------------------------------------------------------------------
+async def prefetch_vessel_models(vessel_data, future_data=None):
+    """
+    Request the default financial model and the default scenario set for
+    `vessel_data` concurrently, so the first Calculate on /output and
+    /power-profiles is served from cache.
+    """
+    financial_params = build_financial_params(default_financial_form(vessel_data, future_data))
+    scenario_params = build_scenario_params(vessel_data, future_data)
+    financial, scenarios = await async_client.gather(
+        async_client.fetch_json(config.FINANCIAL_ENDPOINT, financial_params, timeout=15, cache=financial_cache),
+        async_client.to_io(fetch_scenarios, scenario_params, pages.power_profiles.DEFAULT_SCENARIOS, 60),
+    )
+    for label, result in (("financial", financial), ("scenarios", scenarios)):
+        if isinstance(result, Exception):
+            print(f"Prefetch {label} failed: {result}")
+    return financial, scenarios
+
+async def load_vessel_bundle(search_term, search_type="imo", future_data=None):
+    """
+    Look up a vessel and then fetch its default financial model and scenarios
+    in parallel. Returns (vessel_data, places_summary, financial, scenarios).
+    """
+    vessel_data, places_summary = await async_client.to_io(get_vessel_details, search_term, search_type)
+    financial, scenarios = await prefetch_vessel_models(vessel_data, future_data)
+    return vessel_data, places_summary, financial, scenarios
+
 # -------------------------------------------------------------------------------
 # Future Inputs Update Callback
 # -------------------------------------------------------------------------------
@@ -273,10 +595,11 @@ def register_callbacks(app):
         Input('search-button', 'n_clicks'),
         [State('search-type', 'value'),
          State('search-term', 'value'),
-         State('vessel-data-store', 'data')],
+         State('vessel-data-store', 'data'),
+         State('future-data-store', 'data')],
         prevent_initial_call=True
     )
-    def search_vessel_callback(n_clicks, search_type, search_term, current_data):
+    def search_vessel_callback(n_clicks, search_type, search_term, current_data, future_data):
         if not search_term:
             return current_data or config.DEFAULT_VESSEL, "Please enter a search term."
 
@@ -294,6 +617,14 @@ def register_callbacks(app):
             
             # Store places_summary inside vessel_data dictionary for easier data handling
             vessel_data['places_summary'] = places_summary
+
+            # Warm the financial/scenario caches in the background; the search
+            # result is returned without waiting for them.
+            if config.PREFETCH_ON_SEARCH:
+                async_client.submit(
+                    prefetch_vessel_models(dict(vessel_data), future_data),
+                    label="vessel model prefetch",
+                )
             
             return vessel_data, f"Found vessel: {vessel_data.get('vessel_name', 'Unknown')}"
             
@@ -301,6 +632,25 @@ def register_callbacks(app):
             print(f"Error in search: {str(e)}")
             return current_data or config.DEFAULT_VESSEL, f"Error searching: {str(e)}"
 
+    @app.callback(
+        Output('search-suggestions', 'children'),
+        Input('search-term', 'value'),
+        State('search-type', 'value'),
+        prevent_initial_call=True
+    )
+    def suggest_vessels_callback(search_term, search_type):
+        # Suggestions come only from vessels already fetched; typing never hits the API.
+        if not search_term or len(str(search_term).strip()) < 2:
+            return []
+        try:
+            matches = get_vessel_index().suggest(search_term, search_type, limit=config.VESSEL_SUGGESTION_LIMIT)
+        except sqlite3.Error as e:
+            print(f"Vessel suggestions unavailable: {e}")
+            return []
+        if search_type == 'name':
+            return [html.Option(value=m["name"], label=f"IMO {m['imo']}") for m in matches]
+        return [html.Option(value=m["imo"], label=m["name"]) for m in matches]
+
     @app.callback(
         [Output('vessel-name', 'value'),
          Output('imo-number', 'value'),
@@ -485,7 +835,7 @@ def register_callbacks(app):
         return update_future_inputs_callback(vessel_data, future_data)
     
     @app.callback(
-        Output('dashboard-scenarios-store', 'data'),
+        Output('dashboard-scenarios-base-store', 'data'),
         Input('calculate-scenarios-btn', 'n_clicks'),
         [
             State('scenario-filter-global', 'value'),         # User-selected scenario list
@@ -503,97 +853,147 @@ def register_callbacks(app):
         # Use the selected scenarios from the dropdown
         scenario_list = selected_scenarios or []
         
-        # Process vessel and future data (make sure merge_vessel_data is defined)
-        vessel_data = merge_vessel_data(vessel_data)
-        future_data = future_data or {}
+        fuels = scenario_list or ["Diesel-Bio-diesel"]
+        params = build_scenario_params(vessel_data, future_data)
+        print(f"Dashboard Scenarios API: {len(fuels)} scenario(s) for vessel {params['vessel_id']}")
+        if config.FINANCIAL_MODEL_SOURCE == "local":
+            scenarios_data_response = evaluate_scenarios(params, fuels).to_store() or None
+        else:
+            scenarios_data_response = fetch_scenarios(params, fuels, timeout=60)
+        if scenarios_data_response is None:
+            return dash.no_update
+        print("Dashboard Scenarios API Call Successful")
+        return store_result(scenarios_data_response)
 
-        main_power = vessel_data.get("total_engine_power", 10400)
-        aux_power = vessel_data.get("average_hoteling_kw", 2246)
-        main_fuel_type = vessel_data.get("main_fuel_type", "MDO")
-        aux_fuel_type = vessel_data.get("aux_fuel_type", "MDO")
-        sailing_days = vessel_data.get("sailing_days", 199)
-        working_days = vessel_data.get("working_days", 40)
-        idle_days = vessel_data.get("idle_days", 126)
-        shore_days = vessel_data.get("shore_days", 0)
-        sailing_engine_load = vessel_data.get("sailing_engine_load", 50)
-        engine_maint_cost = vessel_data.get("ENGINE_MAINTENANCE_COSTS_PER_HOUR", 20)
-        spares_cost = vessel_data.get("SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR", 2)
-        shore_enable = vessel_data.get("shore_enable", False)
-        shore_port = vessel_data.get("shore_port", 2)
-        reporting_year = vessel_data.get("reporting_year", 2030)
-        capex = vessel_data.get("CAPEX", 19772750)
-        main_engine_speed = vessel_data.get("MAIN_ENGINE_SPEED", "MEDIUM")
-        main_engine_type = vessel_data.get("MAIN_ENGINE_TYPE", "4-STROKE")
-        aux_engine_speed = vessel_data.get("AUX_ENGINE_SPEED", "MEDIUM")
-        aux_engine_type = vessel_data.get("AUX_ENGINE_TYPE", "4-STROKE")
-
-        biofuels_spares_cost = future_data.get("biofuels-spares-cost", 3)
-        parasitic_load = future_data.get("parasitic-load", 95)
-        biofuels_blend = future_data.get("biofuels-blend", 30)
-        shore_maint_cost = future_data.get("shore-maint-cost", 480)
-        shore_spares_cost = future_data.get("shore-spares-cost", 480)
-        inflation_rate = future_data.get("inflation-rate", 2)
-        npv_rate = future_data.get("npv-rate", 0)
-        currency_choice = future_data.get("currency-choice", "EUR")
-
-        shore_enable_bool = str(shore_enable).strip().lower() in ["yes", "true"]
-        price_conversion = config.CURRENCIES.get(currency_choice, {}).get("conversion", 1)
 
+    # -------------------------------------------------------------------------------
+    # Fleet batch runs: start a job, then poll its progress and results
+    # -------------------------------------------------------------------------------
+    @app.callback(
+        [Output("fleet-imos", "value"),
+         Output("fleet-upload-status", "children")],
+        Input("fleet-upload", "contents"),
+        State("fleet-upload", "filename"),
+        prevent_initial_call=True
+    )
+    def load_fleet_upload(contents, filename):
+        if not contents:
+            raise PreventUpdate
         try:
-            blend_value = float(biofuels_blend)
-        except (ValueError, TypeError):
-            raise ValueError("Invalid biofuels blend percentage provided.")
-        if blend_value > 1:
-            blend_value /= 100.0
-
-        # Build the parameters for the API call.
-        # Notice that we pass the user-selected scenarios as a list.
-        params = {
-            "vessel_id": vessel_data.get("vessel_id", 48217),
-            "main_engine_power_kw": float(main_power),
-            "aux_engine_power_kw": float(aux_power),
-            "sailing_engine_load": float(sailing_engine_load) / 100,
-            "working_days": float(working_days),
-            "idle_days": int(idle_days),
-            "shore_days": int(shore_days),
-            "shore_port": int(shore_port),
-            "main_fuel_type": main_fuel_type,
-            "aux_fuel_type": aux_fuel_type,
-            "BIOFUELS_BLEND_PERCENTAGE": blend_value,
-            "reporting_year": int(reporting_year),
-            "ENGINE_MAINTENANCE_COSTS_PER_HOUR": float(engine_maint_cost),
-            "SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(spares_cost),
-            "SHORE_POWER_MAINTENANCE_PER_DAY": float(shore_maint_cost),
-            "SHORE_POWER_SPARES_PER_DAY": float(shore_spares_cost),
-            "BIOFUELS_SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(biofuels_spares_cost),
-            "PARASITIC_LOAD_ENGINE": float(parasitic_load) / 100 if parasitic_load else 0.95,
-            "shore_enable": str(shore_enable_bool).lower(),
-            "inflation_rate": float(inflation_rate) / 100 if inflation_rate else 0.02,
-            "npv_rate": float(npv_rate) / 100.0,
-            "CAPEX": float(capex),
-            "MAIN_ENGINE_SPEED": main_engine_speed,
-            "MAIN_ENGINE_TYPE": main_engine_type,
-            "AUX_ENGINE_SPEED": aux_engine_speed,
-            "AUX_ENGINE_TYPE": aux_engine_type,
-            "price_conversion": price_conversion,
-            "scenario_future_aux_fuel": ",".join(scenario_list) if scenario_list else "Diesel-Bio-diesel",
-        }
+            text = base64.b64decode(contents.split(",", 1)[1]).decode("utf-8-sig")
+        except (ValueError, UnicodeDecodeError) as e:
+            return no_update, f"Could not read {filename}: {e}"
+        imos = read_imos(text)
+        return ", ".join(imos), f"{len(imos)} IMOs loaded from {filename}"
 
-        qs = urlencode(params, doseq=True)
-        url = f"{config.DASHBOARD_ENDPOINT}?{qs}"
-        print(f"Final Financial API URL: {url}")
+    @app.callback(
+        Output("fleet-job-dropdown", "value"),
+        Input("fleet-run-btn", "n_clicks"),
+        [State("fleet-imos", "value"),
+         State("fleet-fuels", "value"),
+         State("fleet-source", "value")],
+        prevent_initial_call=True
+    )
+    def start_fleet_job(n_clicks, imos_text, fuels, source):
+        imos = read_imos([v for v in (imos_text or "").replace("\n", ",").split(",")])
+        if not n_clicks or not imos:
+            raise PreventUpdate
+        return start_fleet_run(imos, fuels or [], source)
+
+    @app.callback(
+        [Output("fleet-job-dropdown", "options"),
+         Output("fleet-progress", "value"),
+         Output("fleet-progress", "label"),
+         Output("fleet-job-status", "children"),
+         Output("fleet-kpi-vessels", "children"),
+         Output("fleet-kpi-current", "children"),
+         Output("fleet-kpi-future", "children"),
+         Output("fleet-kpi-npv", "children"),
+         Output("fleet-savings-chart", "figure"),
+         Output("fleet-results-table", "data")],
+        [Input("fleet-progress-interval", "n_intervals"),
+         Input("fleet-job-dropdown", "value")],
+        State("currency-store", "data")
+    )
+    def refresh_fleet_summary(n_intervals, job_name, currency):
+        jobs = list_fleet_jobs()
+        options = [{"label": f"{name} ({p.get('phase', '?')}, {p.get('total', 0)} vessels)", "value": name}
+                   for name, p in jobs]
+        # Only jobs listed under FLEET_JOBS_DIR: the value comes from the client
+        if not job_name or job_name not in {name for name, _ in jobs}:
+            return (options, 0, "", "", "-", "-", "-", "-",
+                    pages.fleet.savings_figure(None), [])
+
+        job = FleetJob(os.path.join(config.FLEET_JOBS_DIR, job_name))
+        progress = job.progress()
+        total = progress.get("total") or 0
+        done = progress.get("modelled", 0) + progress.get("failed", 0)
+        percent = 100 if progress.get("done") else (int(done * 100 / total) if total else 0)
+        status = (f"{progress.get('phase', '')}: fetched {progress.get('fetched', 0)}/{total}, "
+                  f"modelled {progress.get('modelled', 0)}, failed {progress.get('failed', 0)}")
+
+        currency = currency or BASE_CURRENCY
+        factor = config.get_conversion(currency)
+        symbol = config.CURRENCIES.get(currency, {}).get("symbol", currency)
+        frame = job.results()
+        money = ["current_opex", "future_opex", "opex_savings", "future_penalty", "npv"]
+        frame[money] = frame[money].astype(float) * factor
+        table = frame.round(2).to_dict("records")
+        return (
+            options, percent, f"{percent}%", status,
+            f"{len(frame):,}",
+            f"{symbol}{frame['current_opex'].sum():,.0f}",
+            f"{symbol}{frame['future_opex'].sum():,.0f}",
+            f"{symbol}{frame['npv'].sum():,.0f}",
+            pages.fleet.savings_figure(frame, symbol),
+            table,
+        )
+
+    # -------------------------------------------------------------------------------
+    # Blend optimizer: least-cost blend per year from the local engine
+    # -------------------------------------------------------------------------------
+    @app.callback(
+        [Output("optimizer-blend-chart", "figure"),
+         Output("optimizer-summary", "children")],
+        Input("optimize-blend-btn", "n_clicks"),
+        [State("optimizer-require-compliance", "value"),
+         State("vessel-data-store", "data"),
+         State("future-data-store", "data"),
+         State("financial-params-store", "data"),
+         State("currency-store", "data")],
+        prevent_initial_call=True
+    )
+    def optimize_blend_callback(n_clicks, require_compliance, vessel_data, future_data, submitted, currency):
+        if not n_clicks:
+            raise PreventUpdate
+        # Optimize the setup last calculated on the input page; fall back to the
+        # vessel's defaults if nothing was calculated for this vessel yet.
+        vessel_id = (vessel_data or {}).get("vessel_id", 48217)
+        if submitted and submitted.get("vessel_id") == vessel_id:
+            params = dict(submitted)
+        else:
+            params = build_financial_params(default_financial_form(vessel_data, future_data))
         try:
-            response = requests.get(config.DASHBOARD_ENDPOINT, params=params, timeout=60)
-            response.raise_for_status()
-            scenarios_data_response = response.json()
-            print("Dashboard Scenarios API Call Successful")
-            # This API response is assumed to contain only the selected scenarios.
-            return scenarios_data_response
-        except Exception as e:
-            print(f"Scenario API Error: {str(e)}")
-            return dash.no_update
+            result = optimize_blend(params, require_compliance="comply" in (require_compliance or []))
+        except (KeyError, ValueError) as e:
+            print(f"Blend optimizer error: {e}")
+            return dash.no_update, html.Div(f"Blend optimizer failed: {e}", className="text-danger")
+
+        currency = currency or BASE_CURRENCY
+        factor = config.get_conversion(currency)
+        optimized = sum(result["opex"]) * factor
+        entered = sum(result["baseline"]["opex"]) * factor
+        symbol = config.CURRENCIES.get(currency, {}).get("symbol", currency)
+        missed = [year for year, ok in zip(result["years"], result["compliant"]) if not ok]
+        summary = html.Ul([
+            html.Li(f"Total OPEX {result['years'][0]}-{result['years'][-1]}: {symbol}{optimized:,.0f} "
+                    f"(entered blend {result['baseline']['blend']:.0%}: {symbol}{entered:,.0f}, "
+                    f"saving {symbol}{entered - optimized:,.0f})"),
+            html.Li("FuelEU target met in every year" if not missed
+                    else f"No blend meets the target in: {', '.join(map(str, missed))}"),
+        ])
+        return pages.power_profiles.blend_optimizer_figure(result, currency), summary
 
-        
     @app.callback(
         [Output("dashboard-scenario-dropdown", "options"),
          Output("dashboard-scenario-dropdown", "value")],
@@ -601,6 +1001,7 @@ def register_callbacks(app):
          Input("scenario-filter", "value")]
     )
     def update_dashboard_scenario_dropdown(dashboard_data, selected_scenarios):
+        dashboard_data = resolve_result(dashboard_data)
         if not callback_context.triggered:
             raise PreventUpdate
         triggered_id = callback_context.triggered[0]['prop_id'].split('.')[0]
@@ -620,9 +1021,10 @@ def register_callbacks(app):
 
     
     @app.callback(
-        [Output('api-data-store', 'data'),
+        [Output('api-data-base-store', 'data'),
         Output('tab-switch', 'data'),
-        Output('future-data-store', 'data')],
+        Output('future-data-store', 'data'),
+        Output('financial-params-store', 'data')],
         Input('calculate-button', 'n_clicks'),
         [
             State('main-power', 'value'),
@@ -663,7 +1065,7 @@ def register_callbacks(app):
     )
     def update_financial_data(n_clicks, *values):
         if n_clicks is None:
-            return no_update, "input", no_update
+            return no_update, "input", no_update, no_update
         
         (
             main_power, aux_power, main_fuel_type, aux_fuel_type, 
@@ -680,7 +1082,7 @@ def register_callbacks(app):
         ) = values
         
         if not all([main_power, aux_power, main_fuel_type, aux_fuel_type]):
-            return no_update, "input", no_update
+            return no_update, "input", no_update, no_update
         
         new_future_data = {
             "future-main-fuel-type": future_main_fuel_type,
@@ -698,70 +1100,51 @@ def register_callbacks(app):
         }
         updated_future_data = {**(existing_future_data or {}), **new_future_data}
         
-        shore_enable_bool = str(shore_enable).strip().lower() in ["yes", "true"]
-        price_conversion = config.CURRENCIES.get(currency_choice, {}).get("conversion", 1)
-        
-        try:
-            blend_value = float(biofuels_blend)
-        except ValueError:
-            raise ValueError("Invalid biofuels blend percentage provided.")
-        if blend_value > 1:
-            blend_value /= 100.0
-        
-        params = {
-            "vessel_id": vessel_data.get("vessel_id", 48217),
-            "main_engine_power_kw": float(main_power),
-            "aux_engine_power_kw": float(aux_power),
-            "main_fuel_type": main_fuel_type,
-            "aux_fuel_type": aux_fuel_type,
-            "future_main_fuel_type": future_main_fuel_type,
-            "future_aux_fuel_type": future_aux_fuel_type,
-            "sailing_days": int(sailing_days),
-            "working_days": int(working_days),
-            "idle_days": int(idle_days),
-            "shore_days": int(shore_days),
-            "shore_port": int(shore_port),
-            "sailing_engine_load": float(sailing_engine_load)/100 if sailing_engine_load else 0.5,
-            "working_engine_load": float(working_engine_load)/100 if working_engine_load else 0.3,
-            "shore_engine_load": float(shore_engine_load)/100 if shore_engine_load else 0.4,
-            "reporting_year": int(reporting_year),
-            "ENGINE_MAINTENANCE_COSTS_PER_HOUR": float(engine_maint_cost),
-            "SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(spares_cost),
-            "SHORE_POWER_MAINTENANCE_PER_DAY": float(shore_maint_cost),
-            "SHORE_POWER_SPARES_PER_DAY": float(shore_spares_cost),
-            "BIOFUELS_SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": float(biofuels_spares_cost),
-            "PARASITIC_LOAD_ENGINE": float(parasitic_load)/100 if parasitic_load else 0.95,
-            "BIOFUELS_BLEND_PERCENTAGE": blend_value,
-            "shore_enable": shore_enable_bool,
-            "inflation_rate": float(inflation_rate)/100 if inflation_rate else 0.02,
-            "npv_rate": float(npv_rate) / 100.0,
-            "CAPEX": float(capex),
-            "MAIN_ENGINE_SPEED": main_engine_speed,
-            "MAIN_ENGINE_TYPE": main_engine_type,
-            "AUX_ENGINE_SPEED": aux_engine_speed,
-            "AUX_ENGINE_TYPE": aux_engine_type,
-            "price_conversion": price_conversion,
-        }
-        
-        if params["BIOFUELS_BLEND_PERCENTAGE"] > 1:
-            raise ValueError("Biofuel blend percentage cannot exceed 100%")
-        for key in ["sailing_days", "working_days", "idle_days"]:
-            if params[key] < 0:
-                raise ValueError(f"{key} cannot be negative")
+        params = build_financial_params(dict(zip(FINANCIAL_FORM_FIELDS, values)))
         
         qs = urlencode(params, doseq=True)
         url = f"{config.FINANCIAL_ENDPOINT}?{qs}"
         print(f"Final Financial API URL: {url}")
         try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            financial_data = response.json()
+            financial_data = run_financial(params)
             print("Financial API Call Successful")
         except Exception as e:
             print(f"Financial API Error: {str(e)}")
             financial_data = None
         
-        return financial_data, "output", updated_future_data
+        return store_result(financial_data), "output", updated_future_data, params
+
+    # -------------------------------------------------------------------------------
+    # Display currency: results are kept in EUR and converted locally, so a
+    # currency switch re-renders without another model run.
+    # -------------------------------------------------------------------------------
+    @app.callback(
+        Output('currency-store', 'data'),
+        Input('currency-choice', 'value'),
+        prevent_initial_call=True
+    )
+    def remember_currency(currency_choice):
+        return currency_choice or BASE_CURRENCY
+
+    @app.callback(
+        Output('api-data-store', 'data'),
+        [Input('api-data-base-store', 'data'),
+         Input('currency-store', 'data')]
+    )
+    def convert_financial_data(base_data, currency):
+        base_data = resolve_result(base_data)
+        if not base_data:
+            return base_data
+        currency = currency or BASE_CURRENCY
+        return store_result({**to_currency(base_data, currency), "currency": currency})
+
+    @app.callback(
+        Output('dashboard-scenarios-store', 'data'),
+        [Input('dashboard-scenarios-base-store', 'data'),
+         Input('currency-store', 'data')]
+    )
+    def convert_scenarios_data(base_data, currency):
+        return store_result(to_currency(resolve_result(base_data), currency))
     
 
     @app.callback(
@@ -770,6 +1153,7 @@ def register_callbacks(app):
         [Input("dashboard-scenarios-store", "data")]
     )
     def update_scenario_filter(dashboard_data):
+        dashboard_data = resolve_result(dashboard_data)
         if not dashboard_data:
             return [], []
         scenarios = list(dashboard_data.keys())
@@ -786,11 +1170,12 @@ def register_callbacks(app):
         ]
     )
     def update_financial_metrics(dashboard_data, selected_scenarios):
+        dashboard_data = load_scenario_results(dashboard_data)
         if not dashboard_data or not selected_scenarios:
             no_data_fig = go.Figure().update_layout(title="No scenarios selected")
             return no_data_fig, no_data_fig
 
-        filtered_data = {k: v for k, v in dashboard_data.items() if k in selected_scenarios}
+        filtered_data = ScenarioResults.of(dashboard_data).subset(scenarios=selected_scenarios)
         min_future_opex_fig = pages.power_profiles.min_future_opex_figure(filtered_data)
         financial_pie_fig = pages.power_profiles.dwelling_at_berth_pie_figure(filtered_data, selected_scenarios)
         return min_future_opex_fig, financial_pie_fig
@@ -806,14 +1191,12 @@ def register_callbacks(app):
         ]
     )
     def update_single_year_breakdown(single_year, year_range, dashboard_data, selected_scenarios):
+        dashboard_data = load_scenario_results(dashboard_data)
         # guard
         if not dashboard_data or not selected_scenarios:
             return go.Figure().update_layout(title="No scenarios selected")
 
-        filtered_data = {
-            k: v for k, v in dashboard_data.items()
-            if k in selected_scenarios
-        }
+        filtered_data = ScenarioResults.of(dashboard_data).subset(scenarios=selected_scenarios)
 
         # If user wants "all", draw the full-range stacked bar
         if single_year == "all":
@@ -846,15 +1229,12 @@ def register_callbacks(app):
         ]
     )
     def update_metric_comparison(metric, year_range, selected_scenarios, dashboard_data):
+        dashboard_data = load_scenario_results(dashboard_data)
         if not dashboard_data or not selected_scenarios:
             return go.Figure().update_layout(title="No data to display")
 
         # Filter only the selected scenarios
-        filtered_data = {
-            name: data
-            for name, data in dashboard_data.items()
-            if name in selected_scenarios
-        }
+        filtered_data = ScenarioResults.of(dashboard_data).subset(scenarios=selected_scenarios)
 
         # Call without data_view
         fig = pages.power_profiles.generate_metric_figure(
@@ -872,6 +1252,7 @@ def register_callbacks(app):
         Input("dashboard-scenarios-store", "data")
     )
     def debug_dashboard_data(dashboard_data):
+        dashboard_data = resolve_result(dashboard_data)
         if dashboard_data is None:
             return "No dashboard data available."
         try:
@@ -881,35 +1262,70 @@ def register_callbacks(app):
     
 
         
-    @app.callback(
-        Output("dashboard-charts-container", "children"),
-        [
-            Input("dashboard-chart-selector",    "value"),
-            Input("dashboard-metric-dropdown",   "value"),
-            Input("dashboard-year-range-slider", "value"),
-            Input("dashboard-scenarios-store",   "data"),
-            Input("single-year-dropdown",        "value"),
-            Input("scenario-filter",             "value"),
-        ]
+    # -------------------------------------------------------------------------------
+    # Financial metrics charts. With CLIENTSIDE_DASHBOARD the filters, metric and
+    # year slider restyle the fixed graphs in the browser from
+    # dashboard-columnar-store (assets/dashboard_clientside.js). Otherwise they are
+    # computed here and sent as partial updates (figure_update), with the
+    # signatures of the shown figures kept in dashboard-charts-view.
+    # -------------------------------------------------------------------------------
+    dashboard_chart_outputs = (
+        [Output("dashboard-charts-message", "children"),
+         Output("dashboard-charts-message", "className")]
+        + [Output(f"dashboard-chart-{key}", "figure") for key, _ in pages.power_profiles.DASHBOARD_CHARTS]
+        + [Output(f"dashboard-chart-{key}-card", "style") for key, _ in pages.power_profiles.DASHBOARD_CHARTS]
     )
+
+    if config.CLIENTSIDE_DASHBOARD:
+        @app.callback(
+            Output("dashboard-columnar-store", "data"),
+            Input("dashboard-scenarios-store", "data")
+        )
+        def publish_dashboard_columns(dashboard_data):
+            results = load_scenario_results(dashboard_data)
+            return results.to_columnar() if len(results) else None
+
+        app.clientside_callback(
+            ClientsideFunction(namespace="dashboard", function_name="dashboardCharts"),
+            dashboard_chart_outputs,
+            [
+                Input("dashboard-chart-selector",    "value"),
+                Input("dashboard-metric-dropdown",   "value"),
+                Input("dashboard-year-range-slider", "value"),
+                Input("dashboard-columnar-store",    "data"),
+                Input("single-year-dropdown",        "value"),
+                Input("scenario-filter",             "value"),
+            ],
+            State("plotly-templates-store", "data"),
+        )
+
     def update_dashboard_charts(
         selected_charts,
         selected_metric,
         year_range,
         dashboard_data,
         single_year,
-        selected_scenarios
+        selected_scenarios,
+        view=None
     ):
+        keys = [key for key, _ in pages.power_profiles.DASHBOARD_CHARTS]
+        hidden = [{"display": "none"}] * len(keys)
+        no_figures = [no_update] * len(keys)
+
+        dashboard_data = load_scenario_results(dashboard_data)
         # Guards
         if not dashboard_data:
-            return html.Div("No data available. Please calculate scenarios first.",
-                            className="text-center text-danger")
+            return ["No data available. Please calculate scenarios first.",
+                    "text-center text-danger"] + no_figures + hidden + [no_update]
         if not selected_scenarios:
-            return html.Div("No scenarios selected. Please select scenarios to display.",
-                            className="text-warning")
+            return ["No scenarios selected. Please select scenarios to display.",
+                    "text-warning"] + no_figures + hidden + [no_update]
+        selected_charts = [key for key in keys if key in (selected_charts or [])]
+        if not selected_charts:
+            return ["Please select at least one chart to display.", "text-warning"] + no_figures + hidden + [no_update]
 
-        filtered = {k: v for k, v in dashboard_data.items() if k in selected_scenarios}
-        charts = []
+        filtered = ScenarioResults.of(dashboard_data).subset(scenarios=selected_scenarios)
+        figures = {}
 
         # 2.1 Metric Comparison
         if "metric" in selected_charts:
@@ -921,10 +1337,7 @@ def register_callbacks(app):
             )
             # add a unified hovermode for these too
             fig.update_layout(hovermode="y unified")
-            charts.append(card_component(
-                "Metric Comparison",
-                dcc.Graph(figure=fig, className="chart-container")
-            ))
+            figures["metric"] = fig
 
         # 2.2 Future Opex
         if "min_future_opex" in selected_charts:
@@ -933,21 +1346,14 @@ def register_callbacks(app):
                 year_range=tuple(year_range)
             )
             fig.update_layout(hovermode="y unified")
-            charts.append(card_component(
-                "Future Opex",
-                dcc.Graph(figure=fig, className="chart-container")
-            ))
+            figures["min_future_opex"] = fig
 
         # 2.3 Dwelling Pie
         if "dwelling" in selected_charts:
-            fig = pages.power_profiles.dwelling_at_berth_pie_figure(
+            figures["dwelling"] = pages.power_profiles.dwelling_at_berth_pie_figure(
                 filtered,
                 selected_scenarios
             )
-            charts.append(card_component(
-                "Dwelling at Berth",
-                dcc.Graph(figure=fig, className="chart-container")
-            ))
 
         # 2.4 Single‑/Multi‑Year Stacked Bar
         if "single_year" in selected_charts:
@@ -960,16 +1366,35 @@ def register_callbacks(app):
                     fig = pages.power_profiles.create_range_stacked_bar(filtered, year_range=(yr, yr))
                 except (ValueError, TypeError):
                     fig = go.Figure().update_layout(title="Invalid year selected")
-            charts.append(card_component(
-                "Cost Breakdown",
-                dcc.Graph(figure=fig, className="chart-container")
-            ))
-
-        if not charts:
-            return html.Div("Please select at least one chart to display.",
-                            className="text-warning")
-
-        return html.Div(charts)
+            figures["single_year"] = fig
+
+        # Unselected charts keep their (hidden) figure and signature
+        view = dict(view or {})
+        updates = []
+        for key in keys:
+            if key in figures:
+                update, view[key] = figure_update(figures[key], view.get(key))
+                updates.append(update)
+            else:
+                updates.append(no_update)
+        return ([None, ""]
+                + updates
+                + [{"display": "block" if key in figures else "none"} for key in keys]
+                + [view])
+
+    if not config.CLIENTSIDE_DASHBOARD:
+        app.callback(
+            dashboard_chart_outputs + [Output("dashboard-charts-view", "data")],
+            [
+                Input("dashboard-chart-selector",    "value"),
+                Input("dashboard-metric-dropdown",   "value"),
+                Input("dashboard-year-range-slider", "value"),
+                Input("dashboard-scenarios-store",   "data"),
+                Input("single-year-dropdown",        "value"),
+                Input("scenario-filter",             "value"),
+            ],
+            State("dashboard-charts-view", "data")
+        )(update_dashboard_charts)
 
     @app.callback(
         [
@@ -988,15 +1413,32 @@ def register_callbacks(app):
             Output("dashboard-metrics-table",    "children"),
             Output("dashboard-cost-breakdown-year", "options"),
             Output("dashboard-cost-breakdown-year", "value"),
+            Output("executive-dashboard-view",    "data"),
         ],
         [
             Input("dashboard-year-range",         "value"),
             Input("dashboard-scenario-dropdown",  "value"),
             Input("dashboard-scenarios-store",    "data"),
             Input("dashboard-cost-breakdown-year","value"),
-        ]
+        ],
+        State("executive-dashboard-view", "data")
     )
-    def update_executive_dashboard(year_range, selected_scenario, dashboard_data, selected_cb_year_input):
+    def update_executive_dashboard(year_range, selected_scenario, dashboard_data, selected_cb_year_input, view=None):
+        dashboard_data = load_scenario_results(dashboard_data)
+
+        # Figures go out as partial updates against what the page shows
+        # (figure_update), and the year options only when they change.
+        view = dict(view or {})
+
+        def respond(kpis, figures, table, years, selected_year):
+            updates = []
+            for name, fig in zip(("opex", "penalty", "cost_breakdown", "eu_ets"), figures):
+                update, view[name] = figure_update(fig, view.get(name))
+                updates.append(update)
+            options = no_update if view.get("years") == years else [{"label": str(y), "value": y} for y in years]
+            view["years"] = years
+            return (*kpis, *updates, table, options, selected_year, view)
+
         # Build an empty‐data placeholder
         empty_fig = go.Figure().update_layout(
             xaxis={"visible": False}, yaxis={"visible": False},
@@ -1009,39 +1451,32 @@ def register_callbacks(app):
 
         # 1) No data or invalid scenario
         if not dashboard_data or selected_scenario not in dashboard_data:
-            return (
-                "N/A", "No data",
-                "N/A", "No data",
-                "N/A", "No data",
-                "N/A", "No data",
-                empty_fig, empty_fig, empty_fig, empty_fig,
+            return respond(
+                ["N/A", "No data"] * 4,
+                [empty_fig] * 4,
                 html.Div("No data available", className="text-center"),
                 [], None
             )
 
         # 2) Filter records by year_range
-        records = dashboard_data[selected_scenario]
-        filtered = [r for r in records
-                    if r.get("year") is not None
-                    and year_range[0] <= r["year"] <= year_range[1]]
-        if not filtered:
-            return (
-                "N/A", "No data",
-                "N/A", "No data",
-                "N/A", "No data",
-                "N/A", "No data",
-                empty_fig, empty_fig, empty_fig, empty_fig,
+        scenario = ScenarioResults.of(dashboard_data).subset(scenarios=[selected_scenario], year_range=year_range)
+        in_range = scenario.present()[0]
+        if not in_range.any():
+            return respond(
+                ["N/A", "No data"] * 4,
+                [empty_fig] * 4,
                 html.Div("No data for selected years", className="text-center"),
                 [], None
             )
 
         # 3) Extract time series
-        years      = [r["year"]       for r in filtered]
-        opex       = [r["opex"]       for r in filtered]
-        fuel_price = [r["fuel_price"] for r in filtered]
-        eu_ets     = [r["eu_ets"]     for r in filtered]
-        penalty    = [r["penalty"]    for r in filtered]
-        eu_ets     = [r["eu_ets"]     for r in filtered]
+        columns    = {m: scenario.metric(m)[0][in_range].tolist()
+                      for m in ("opex", "fuel_price", "maintenance", "eu_ets", "penalty", "blend_percentage")}
+        years      = scenario.years[in_range].tolist()
+        opex       = columns["opex"]
+        fuel_price = columns["fuel_price"]
+        eu_ets     = columns["eu_ets"]
+        penalty    = columns["penalty"]
 
         # 4) Compute KPIs
         avg_opex        = sum(opex) / len(opex)
@@ -1091,9 +1526,9 @@ def register_callbacks(app):
         )
 
         # 8) Cost Breakdown for selected_cb_year_input
-        unique_years = sorted({r["year"] for r in filtered})
+        unique_years = years
         sel_year     = selected_cb_year_input if selected_cb_year_input in unique_years else unique_years[-1]
-        entry        = next(r for r in filtered if r["year"] == sel_year)
+        entry        = {m: values[years.index(sel_year)] for m, values in columns.items()}
 
         cb_fig = go.Figure()
         for key, label in [
@@ -1128,13 +1563,14 @@ def register_callbacks(app):
 
         # 10) Metrics Table
         table_rows = [{
-            "Year":       r["year"],
-            "Blend %":    f"{r['blend_percentage']*100:.1f}%",
-            "OPEX":       f"€{r['opex']:,.2f}",
-            "fuel_price": f"€{r['fuel_price']:,.2f}",
-            "EU ETS":     f"€{r['eu_ets']:,.2f}",
-            "Penalty":    f"€{r['penalty']:,.2f}"
-        } for r in filtered]
+            "Year":       yr,
+            "Blend %":    f"{blend*100:.1f}%",
+            "OPEX":       f"€{o:,.2f}",
+            "fuel_price": f"€{fp:,.2f}",
+            "EU ETS":     f"€{ets:,.2f}",
+            "Penalty":    f"€{pen:,.2f}"
+        } for yr, blend, o, fp, ets, pen in zip(
+            years, columns["blend_percentage"], opex, fuel_price, eu_ets, penalty)]
 
         metrics_table = dash_table.DataTable(
             columns=[{"name": c, "id": c} for c in ["Year","Blend %","OPEX","fuel_price","EU ETS","Penalty"]],
@@ -1144,17 +1580,17 @@ def register_callbacks(app):
             style_header={'backgroundColor':'rgb(230,230,230)','fontWeight':'bold'}
         )
 
-        return (
+        return respond(
             # KPIs
-            f"€{avg_opex:,.0f}", opex_trend,
-            f"€{avg_fuel_price:,.0f}", fuel_price_stat,
-            f"€{avg_penalty:,.0f}", penalty_trend,
-            f"{avg_eu_ets:,.0f}", euets_trend,
+            [f"€{avg_opex:,.0f}", opex_trend,
+             f"€{avg_fuel_price:,.0f}", fuel_price_stat,
+             f"€{avg_penalty:,.0f}", penalty_trend,
+             f"{avg_eu_ets:,.0f}", euets_trend],
             # Figures
-            opex_fig, penalty_fig, cb_fig, ets_fig,
+            [opex_fig, penalty_fig, cb_fig, ets_fig],
             # Table + breakdown-year controls
             metrics_table,
-            [{"label": str(y), "value": y} for y in unique_years],
+            unique_years,
             sel_year
         )
 
@@ -1168,20 +1604,39 @@ def register_callbacks(app):
         Input("dashboard-scenarios-store", "data")
     )
     def update_summary_scenarios(dashboard_data):
+        dashboard_data = resolve_result(dashboard_data)
         if not dashboard_data:
             return [], []
         scenarios = list(dashboard_data.keys())
         return ([{"label": s, "value": s} for s in scenarios], scenarios[:2])
 
+    # Summary charts follow the same split: clientside with CLIENTSIDE_DASHBOARD,
+    # while the ranking table and cost analysis always come from the server.
+    summary_chart_outputs = [
+        Output("chart-opex-stack", "figure"),
+        Output("chart-other-stack", "figure"),
+    ]
+    summary_table_outputs = [
+        Output("summary-ranking-table", "data"),
+        Output("summary-ranking-table", "columns"),
+        Output("summary-ranking-table", "style_data_conditional"),
+        Output("summary-cost-analysis", "children")
+    ]
+
+    if config.CLIENTSIDE_DASHBOARD:
+        app.clientside_callback(
+            ClientsideFunction(namespace="dashboard", function_name="summaryCharts"),
+            summary_chart_outputs,
+            [
+                Input("dashboard-columnar-store", "data"),
+                Input("summary-scenario-dropdown", "value"),
+                Input("summary-year-range", "value")
+            ],
+            State("plotly-templates-store", "data"),
+        )
+
     @app.callback(
-        [
-            Output("chart-opex-stack", "figure"),
-            Output("chart-other-stack", "figure"),
-            Output("summary-ranking-table", "data"),
-            Output("summary-ranking-table", "columns"),
-            Output("summary-ranking-table", "style_data_conditional"),
-            Output("summary-cost-analysis", "children")
-        ],
+        summary_table_outputs if config.CLIENTSIDE_DASHBOARD else summary_chart_outputs + summary_table_outputs,
         [
             Input("dashboard-scenarios-store", "data"),
             Input("summary-scenario-dropdown", "value"),
@@ -1189,6 +1644,8 @@ def register_callbacks(app):
         ]
     )
     def update_summary(dashboard_data, fuels, year_range):
+        charts = 0 if config.CLIENTSIDE_DASHBOARD else 2
+        dashboard_data = load_scenario_results(dashboard_data)
         if not dashboard_data or not fuels:
             empty = go.Figure().update_layout(
                 title="No data available",
@@ -1200,54 +1657,37 @@ def register_callbacks(app):
                     "font": {"size": 16}
                 }]
             )
-            return [empty, empty] + [[]] * 3 + [html.Div("No data to analyze")]
+            return [empty] * charts + [[]] * 3 + [html.Div("No data to analyze")]
 
         start, end = year_range
         totals = calculate_scenario_totals(dashboard_data, fuels, start, end)
-        fig1 = create_opex_chart(fuels, totals, start, end)
-        fig2 = create_other_costs_chart(fuels, totals, start, end)
+        fuels = [f for f in fuels if f in totals]
+        if not fuels:
+            return [go.Figure().update_layout(title=f"No data between {start} and {end}")] * charts \
+                + [[]] * 3 + [html.Div("No data to analyze")]
         rows, cols, style = create_ranking_table(fuels, totals)
         analysis = create_cost_analysis(fuels, totals)
+        if not charts:
+            return rows, cols, style, analysis
+        fig1 = create_opex_chart(fuels, totals, start, end)
+        fig2 = create_other_costs_chart(fuels, totals, start, end)
         return fig1, fig2, rows, cols, style, analysis
 
 
     def calculate_scenario_totals(data, fuels, start, end):
         """
-        Calculate scenario totals using pandas for concise aggregation.
+        Per-scenario sums of each cost component over start..end, plus the last
+        compliance balance in the range. Scenarios without records in the range are left out.
         """
-        # Flatten data into DataFrame
-        records = []
-        for scenario, recs in data.items():
-            for r in recs:
-                records.append({**r, 'scenario': scenario})
-        df = pd.DataFrame(records)
-        # Filter
-        df = df[df['scenario'].isin(fuels) & df['year'].between(start, end)]
-        # Sum aggregates
-        agg = df.groupby('scenario').agg({
-            'opex': 'sum',
-            'fuel_price': 'sum',
-            'maintenance': 'sum',
-            'spare': 'sum',
-            'eu_ets': 'sum',
-            'penalty': 'sum'
-        }).reset_index()
-        # Last compliance per scenario
-        last_comp = df.sort_values('year').groupby('scenario').last()[['compliance_balance']].reset_index()
-        # Merge
-        result = pd.merge(agg, last_comp, on='scenario')
-        # Convert to dict
+        results = ScenarioResults.of(data).subset(scenarios=fuels, year_range=(start, end))
+        components = ['opex', 'fuel_price', 'maintenance', 'spare', 'eu_ets', 'penalty']
+        sums = results.component_totals(components)
+        comp = results.last('compliance_balance')
+        has_rows = results.present().any(axis=1)
         totals = {}
-        for _, row in result.iterrows():
-            totals[row['scenario']] = {
-                'opex': row['opex'],
-                'fuel_price': row['fuel_price'],
-                'maintenance': row['maintenance'],
-                'spare': row['spare'],
-                'eu_ets': row['eu_ets'],
-                'penalty': row['penalty'],
-                'comp': row['compliance_balance']
-            }
+        for s, scenario in enumerate(results.scenarios):
+            if has_rows[s]:
+                totals[scenario] = {**dict(zip(components, sums[s].tolist())), 'comp': float(comp[s])}
         return totals
 
 
@@ -1586,6 +2026,7 @@ def register_callbacks(app):
         prevent_initial_call=True
     )
     def download_csv(n_clicks, cfg, vessel_data, dash_data):
+        dash_data = resolve_result(dash_data)
         if not n_clicks or not cfg:
             raise exceptions.PreventUpdate
 
@@ -1616,6 +2057,7 @@ def register_callbacks(app):
         Input("dashboard-scenarios-store", "data")
     )
     def update_scenario_options(scenarios_data):
+        scenarios_data = resolve_result(scenarios_data)
         if not scenarios_data:
             return []
         return [{'label': scen, 'value': scen} for scen in scenarios_data.keys()]
@@ -1632,7 +2074,7 @@ def register_callbacks(app):
     )
     def display_emissions_output(api_data, future_data, selected_tables, timeframe):
         # guard against missing
-        api_data    = api_data    or {}
+        api_data    = resolve_result(api_data) or {}
         future_data = future_data or {}
 
         if not api_data:
@@ -1646,7 +2088,7 @@ def register_callbacks(app):
                 className="mt-4"
             )
 
-        currency = future_data.get("currency-choice", "EUR")
+        currency = api_data.get("currency") or future_data.get("currency-choice", "EUR")
         sections = []
 
         if 'vessel_summary' in selected_tables:
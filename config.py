@@ -1,13 +1,107 @@
 #config.py
 import os
-import requests
+import tempfile
 
 # API Endpoints
+# Point API_BASE at the local mock (python -m mock_api) to run offline or load test:
+#   API_BASE=http://127.0.0.1:8060/marinedata
 API_BASE = os.getenv("API_BASE", "https://natpower-marine-api-prod.azurewebsites.net/marinedata")
 VESSEL_ENDPOINT = f"{API_BASE}/getvesseldetails_engine_places"
 FINANCIAL_ENDPOINT = f"{API_BASE}/financialmodelling"
 DASHBOARD_ENDPOINT = f"{API_BASE}/financialmodellingscenarios"
 
+# HTTP connection pool (per gunicorn worker)
+API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "4"))
+API_POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "16"))
+API_POOL_BLOCK = os.getenv("API_POOL_BLOCK", "false").lower() == "true"
+
+# Coalesce identical in-flight requests within a worker
+API_SINGLE_FLIGHT = os.getenv("API_SINGLE_FLIGHT", "true").lower() == "true"
+
+# Resilience: jittered retries, circuit breaker, hedging, per-endpoint latency budgets
+API_RETRY_ATTEMPTS = int(os.getenv("API_RETRY_ATTEMPTS", "3"))
+API_RETRY_BASE_DELAY = float(os.getenv("API_RETRY_BASE_DELAY", "0.25"))  # Seconds
+API_RETRY_MAX_DELAY = float(os.getenv("API_RETRY_MAX_DELAY", "4"))  # Seconds
+API_BREAKER_FAILURES = int(os.getenv("API_BREAKER_FAILURES", "5"))  # Consecutive failures
+API_BREAKER_RESET = float(os.getenv("API_BREAKER_RESET", "30"))  # Seconds before a trial call
+API_HEDGE_ENABLED = os.getenv("API_HEDGE_ENABLED", "false").lower() == "true"
+API_HEDGE_PERCENTILE = float(os.getenv("API_HEDGE_PERCENTILE", "95"))
+API_HEDGE_MIN_SAMPLES = int(os.getenv("API_HEDGE_MIN_SAMPLES", "20"))
+API_DEFAULT_LATENCY_BUDGET = float(os.getenv("API_DEFAULT_LATENCY_BUDGET", "20"))  # Seconds
+API_LATENCY_BUDGETS = {
+    VESSEL_ENDPOINT: float(os.getenv("VESSEL_LATENCY_BUDGET", "20")),
+    FINANCIAL_ENDPOINT: float(os.getenv("FINANCIAL_LATENCY_BUDGET", "30")),
+    DASHBOARD_ENDPOINT: float(os.getenv("DASHBOARD_LATENCY_BUDGET", "90")),
+}
+
+# Response cache (memory tier per worker, optional disk tier shared by workers)
+API_CACHE_TTL = int(os.getenv("API_CACHE_TTL", "3600"))  # Seconds
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "256"))
+API_CACHE_MAX_MB = int(os.getenv("API_CACHE_MAX_MB", "64"))
+API_CACHE_DIR = os.getenv("API_CACHE_DIR")  # Unset disables the disk tier
+API_CACHE_DISK_MAX_MB = int(os.getenv("API_CACHE_DISK_MAX_MB", "256"))
+
+# Vessel lookup cache and typeahead index (SQLite file shared by workers)
+VESSEL_INDEX_PATH = os.getenv(
+    "VESSEL_INDEX_PATH", os.path.join(tempfile.gettempdir(), "marine_vessel_index.sqlite3")
+)
+VESSEL_CACHE_TTL = int(os.getenv("VESSEL_CACHE_TTL", "86400"))  # Seconds
+VESSEL_SUGGESTION_LIMIT = int(os.getenv("VESSEL_SUGGESTION_LIMIT", "8"))
+
+# Server-side result store (services/result_store.py): browser stores hold a key,
+# results live in a per-worker LRU backed by a SQLite file shared by workers
+RESULT_STORE_PATH = os.getenv(
+    "RESULT_STORE_PATH", os.path.join(tempfile.gettempdir(), "marine_results.sqlite3")
+)
+RESULT_STORE_TTL = int(os.getenv("RESULT_STORE_TTL", "86400"))  # Seconds since last use
+RESULT_STORE_MAX_ENTRIES = int(os.getenv("RESULT_STORE_MAX_ENTRIES", "64"))
+RESULT_STORE_MAX_MB = int(os.getenv("RESULT_STORE_MAX_MB", "128"))
+
+# Dashboard aggregates (engine/results.py): subsets and totals of stored scenario
+# results, memoized per (result key, scenarios, year range) and shared by callbacks
+AGGREGATE_CACHE_ENTRIES = int(os.getenv("AGGREGATE_CACHE_ENTRIES", "256"))
+AGGREGATE_CACHE_MB = int(os.getenv("AGGREGATE_CACHE_MB", "32"))
+
+# Dashboard filters and year sliders: "true" restyles the charts in the browser
+# (assets/dashboard_clientside.js) from a columnar copy of the scenario results;
+# "false" rebuilds them on the server
+CLIENTSIDE_DASHBOARD = os.getenv("CLIENTSIDE_DASHBOARD", "true").lower() == "true"
+
+# Financial model: "api" calls FINANCIAL_ENDPOINT, "local" runs the NumPy engine
+# (engine/financial.py, engine/scenarios.py). LOCAL_MODEL_CROSS_CHECK compares local runs against the
+# API in the background and logs the largest relative differences.
+FINANCIAL_MODEL_SOURCE = os.getenv("FINANCIAL_MODEL_SOURCE", "api").lower()
+LOCAL_MODEL_CROSS_CHECK = os.getenv("LOCAL_MODEL_CROSS_CHECK", "false").lower() == "true"
+
+# Parsed reference tables (data/reference.py): binary cache of the typed arrays,
+# rebuilt when FUEL_DATA.csv, PRICES_DATA.csv or FUELEU.csv change. Empty disables it.
+REFERENCE_CACHE_PATH = os.getenv(
+    "REFERENCE_CACHE_PATH", os.path.join(tempfile.gettempdir(), "marine_reference_tables.npz")
+)
+
+# Local model stage cache (engine/graph.py): memoized stage outputs per worker
+MODEL_STAGE_CACHE_ENTRIES = int(os.getenv("MODEL_STAGE_CACHE_ENTRIES", "512"))
+MODEL_STAGE_CACHE_MB = int(os.getenv("MODEL_STAGE_CACHE_MB", "64"))
+
+# Fleet batch runs (services/fleet.py): job directories, concurrent vessel/API
+# calls per job, vessels per local-engine batch and worker processes for batches
+FLEET_JOBS_DIR = os.getenv("FLEET_JOBS_DIR", os.path.join(tempfile.gettempdir(), "marine_fleet_jobs"))
+FLEET_FETCH_CONCURRENCY = int(os.getenv("FLEET_FETCH_CONCURRENCY", "8"))
+FLEET_MODEL_BATCH = int(os.getenv("FLEET_MODEL_BATCH", "256"))
+FLEET_MODEL_WORKERS = int(os.getenv("FLEET_MODEL_WORKERS", "1"))  # Processes for local-engine chunks
+
+# Monte Carlo price risk (engine/montecarlo.py): paths per chunk, and worker
+# processes for the chunks (1 runs them in the calling process)
+MONTE_CARLO_CHUNK = int(os.getenv("MONTE_CARLO_CHUNK", "2000"))
+MONTE_CARLO_WORKERS = int(os.getenv("MONTE_CARLO_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Concurrent per-fuel requests to the scenarios endpoint (per worker)
+SCENARIO_FANOUT_WORKERS = int(os.getenv("SCENARIO_FANOUT_WORKERS", "4"))
+
+# Async client: I/O threads behind the event loop, and model prefetch on vessel search
+ASYNC_IO_WORKERS = int(os.getenv("ASYNC_IO_WORKERS", "8"))
+PREFETCH_ON_SEARCH = os.getenv("PREFETCH_ON_SEARCH", "true").lower() == "true"
+
 # Default Vessel Data with Extended Engine and Operational Parameters
 DEFAULT_VESSEL = {
     "imo": 9803613,
@@ -108,28 +202,41 @@ FUEL_OPTIONS = [
     {"label": "Electricity (Grid)", "value": "Electricity"},
 ]
 
+# Exchange rates: shared on-disk table refreshed in the background (never at import)
+EXCHANGE_RATE_URL = os.getenv("EXCHANGE_RATE_URL", "https://api.exchangerate-api.com/v4/latest/EUR")
+EXCHANGE_RATE_FILE = os.getenv(
+    "EXCHANGE_RATE_FILE", os.path.join(tempfile.gettempdir(), "marine_exchange_rates.json")
+)
+EXCHANGE_RATE_REFRESH = int(os.getenv("EXCHANGE_RATE_REFRESH", "21600"))  # Seconds
+EXCHANGE_RATE_MAX_AGE = int(os.getenv("EXCHANGE_RATE_MAX_AGE", "604800"))  # Seconds before rates count as stale
+EXCHANGE_RATE_BACKGROUND = os.getenv("EXCHANGE_RATE_BACKGROUND", "true").lower() == "true"
+EXCHANGE_RATE_FALLBACK = {"USD": 1.08, "GBP": 0.85}  # Used until the first refresh succeeds
+
+
 def get_exchange_rate(from_currency, to_currency):
-    url = f"https://api.exchangerate-api.com/v4/latest/{from_currency.upper()}"
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        if "rates" in data and to_currency.upper() in data["rates"]:
-            rate = data["rates"][to_currency.upper()]
-            print(f"Exchange Rate ({from_currency} → {to_currency}): {rate}")
-            return rate
-        else:
-            print(f"Error: Conversion rate not available for {from_currency} to {to_currency}.")
-            return None
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching exchange rate: {e}")
+    """Rate between two currencies from the cached rate table (no network call)."""
+    from services.exchange_rates import get_provider
+
+    provider = get_provider()
+    from_rate = provider.rate(from_currency)
+    to_rate = provider.rate(to_currency)
+    if not from_rate or to_rate is None:
+        print(f"Error: Conversion rate not available for {from_currency} to {to_currency}.")
         return None
+    return to_rate / from_rate
+
+
+def get_conversion(currency):
+    """EUR -> currency factor for price_conversion."""
+    from services.exchange_rates import conversion
+
+    return conversion(currency)
 
 
 CURRENCIES = {
-    "EUR": {"symbol": "€", "conversion": 1.0},
-    "USD": {"symbol": "$", "conversion": get_exchange_rate("EUR", "USD")},
-    "GBP": {"symbol": "£", "conversion": get_exchange_rate("EUR", "GBP")}
+    "EUR": {"symbol": "€"},
+    "USD": {"symbol": "$"},
+    "GBP": {"symbol": "£"}
 }
 # General Options
 BOOLEAN_YES_NO_OPTIONS = ["Yes", "No"]
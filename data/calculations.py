@@ -1,4 +1,6 @@
 #data/calculations.py
+import numpy as np
+import pandas as pd
 
 # IMO Emission Factors (g/kWh)
 EMISSION_FACTORS = {
@@ -8,28 +10,106 @@ EMISSION_FACTORS = {
     'battery': {'co2': 0.0, 'nox': 0.0, 'sox': 0.0}
 }
 
+# Array form of EMISSION_FACTORS: fuel code i = FUEL_CODES[i], one column per pollutant
+FUEL_CODES = tuple(EMISSION_FACTORS)
+POLLUTANTS = ('co2', 'nox', 'sox')
+EMISSION_FACTOR_TABLE = np.array([[EMISSION_FACTORS[f][p] for p in POLLUTANTS] for f in FUEL_CODES])
+POLLUTANT_SCALE = np.array([1000, 1e6, 1e6])  # g -> tonnes (co2 factor is in kg/kWh)
+
+# IMO 2023 CII rating boundaries: A < 3.5 <= B < 4.5 <= C < 5.5 <= D < 6.5 <= E
+CII_THRESHOLDS = np.array([3.5, 4.5, 5.5, 6.5])
+CII_RATINGS = np.array(['A', 'B', 'C', 'D', 'E'])
+
+# EEXI reference lines (simplified)
+EEXI_REF_LINES = {
+    'container': 0.081,
+    'bulk': 0.094,
+    'tanker': 0.119
+}
+EEXI_DEFAULT_REF_LINE = 0.1
+
+###############################################################################
+# ARRAY API (whole fleets at once)
+###############################################################################
+def fuel_codes(fuel_types):
+    """Fuel names (or already-encoded integer codes) -> integer codes into FUEL_CODES."""
+    values = np.asarray(fuel_types)
+    if np.issubdtype(values.dtype, np.integer):
+        if values.size and (values.min() < 0 or values.max() >= len(FUEL_CODES)):
+            raise ValueError("Invalid fuel type")
+        return values
+    names, inverse = np.unique(values.astype(str), return_inverse=True)
+    lookup = {f: i for i, f in enumerate(FUEL_CODES)}
+    if any(n not in lookup for n in names):
+        raise ValueError("Invalid fuel type")
+    return np.array([lookup[n] for n in names], dtype=np.int64)[inverse].reshape(values.shape)
+
+
+def calculate_cii_array(co2_emissions, power, hours):
+    """Carbon Intensity Indicator for arrays of vessels (inf where power * hours is 0)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(co2_emissions, dtype=float) / (np.asarray(power, dtype=float) * np.asarray(hours, dtype=float) / 1000)
+
+
+def cii_rating_array(cii_values):
+    """CII ratings ('A'..'E') for an array of CII values."""
+    return CII_RATINGS[np.searchsorted(CII_THRESHOLDS, np.asarray(cii_values, dtype=float), side='right')]
+
+
+def eexi_compliance_array(power, vessel_types):
+    """EEXI compliance for arrays of vessels; unknown types use the default reference line."""
+    types = np.asarray(vessel_types).astype(str)
+    names, inverse = np.unique(types, return_inverse=True)
+    ref_lines = np.array([EEXI_REF_LINES.get(n, EEXI_DEFAULT_REF_LINE) for n in names])[inverse]
+    return np.asarray(power, dtype=float) * ref_lines.reshape(types.shape) < 1.0
+
+
+def calculate_baseline_emissions_array(power, fuel_type, operating_hours, load_factor):
+    """
+    Baseline emissions for many vessels at once. Inputs are arrays (or scalars that
+    broadcast); fuel_type holds fuel names or FUEL_CODES indexes.
+    Returns a dict of arrays: co2, nox, sox (tonnes), cii, cii_rating, eexi_compliance.
+    """
+    codes = fuel_codes(fuel_type)
+    power = np.asarray(power, dtype=float)
+    operating_hours = np.asarray(operating_hours, dtype=float)
+
+    energy_kwh = power * operating_hours * np.asarray(load_factor, dtype=float)
+    emissions = energy_kwh[..., None] * EMISSION_FACTOR_TABLE[codes] / POLLUTANT_SCALE
+    cii = calculate_cii_array(emissions[..., 0], power, operating_hours)
+
+    return {
+        **{p: emissions[..., i] for i, p in enumerate(POLLUTANTS)},
+        'cii': cii,
+        'cii_rating': cii_rating_array(cii),
+        'eexi_compliance': eexi_compliance_array(power, np.asarray(fuel_type).astype(str)),
+    }
+
+
+def calculate_fleet_emissions(fleet, power='power', fuel_type='fuel_type',
+                              operating_hours='operating_hours', load_factor='load_factor'):
+    """DataFrame of vessels -> the same rows with emissions, CII and EEXI columns added."""
+    result = calculate_baseline_emissions_array(
+        fleet[power].to_numpy(), fleet[fuel_type].to_numpy(),
+        fleet[operating_hours].to_numpy(), fleet[load_factor].to_numpy(),
+    )
+    return fleet.assign(**{k: pd.Series(v, index=fleet.index) for k, v in result.items()})
+
+###############################################################################
+# SCALAR API (one vessel)
+###############################################################################
 def calculate_baseline_emissions(power, fuel_type, operating_hours, load_factor):
     """Calculate baseline emissions using IMO formulas"""
     if fuel_type not in EMISSION_FACTORS:
         raise ValueError("Invalid fuel type")
-    
-    # Calculate energy consumption
-    energy_kwh = power * operating_hours * load_factor
-    
-    # Calculate emissions
-    emissions = {
-        'co2': energy_kwh * EMISSION_FACTORS[fuel_type]['co2'] / 1000,  # tonnes
-        'nox': energy_kwh * EMISSION_FACTORS[fuel_type]['nox'] / 1e6,  # tonnes
-        'sox': energy_kwh * EMISSION_FACTORS[fuel_type]['sox'] / 1e6   # tonnes
-    }
-    
-    # Calculate CII parameters
-    cii = calculate_cii(emissions['co2'], power, operating_hours)
-    
+
+    result = calculate_baseline_emissions_array(power, fuel_type, operating_hours, load_factor)
     return {
-        **emissions,
-        'cii_rating': determine_cii_rating(cii),
-        'eexi_compliance': check_eexi_compliance(power, fuel_type)
+        'co2': float(result['co2']),
+        'nox': float(result['nox']),
+        'sox': float(result['sox']),
+        'cii_rating': str(result['cii_rating']),
+        'eexi_compliance': bool(result['eexi_compliance'])
     }
 
 def calculate_cii(co2_emissions, power, hours):
@@ -38,18 +118,8 @@ def calculate_cii(co2_emissions, power, hours):
 
 def determine_cii_rating(cii_value):
     """Determine CII rating based on IMO 2023 thresholds"""
-    if cii_value < 3.5: return 'A'
-    elif 3.5 <= cii_value < 4.5: return 'B'
-    elif 4.5 <= cii_value < 5.5: return 'C'
-    elif 5.5 <= cii_value < 6.5: return 'D'
-    else: return 'E'
+    return str(cii_rating_array(cii_value))
 
 def check_eexi_compliance(power, fuel_type):
     """Check EEXI compliance based on vessel type and power"""
-    # Simplified compliance check
-    ref_lines = {
-        'container': 0.081,
-        'bulk': 0.094,
-        'tanker': 0.119
-    }
-    return power * ref_lines.get(fuel_type, 0.1) < 1.0
\ No newline at end of file
+    return bool(eexi_compliance_array(power, fuel_type))
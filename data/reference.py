@@ -0,0 +1,319 @@
+#data/reference.py
+import csv
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# -------------------------------------------------------------------------------
+# REFERENCE TABLES (fuel properties, price curves, FuelEU targets)
+# -------------------------------------------------------------------------------
+# The CSVs are parsed once into typed arrays (fuel x year prices, fuel x property
+# values) and cached as .npz at config.REFERENCE_CACHE_PATH. The cache key covers
+# the CSVs' mtimes and sizes, so editing a CSV rebuilds it. Fuel codes are
+# positions in config.FUEL_OPTIONS (which also covers FUEL_TYPE_OPTIONS_SHIP), and
+# option_rows maps a code to its table row. The engine resolves each distinct fuel
+# of a batch to its code once; every row is then one array index (fuel_rows_for).
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+FUEL_DATA_CSV = os.path.join(DATA_DIR, "FUEL_DATA.csv")
+PRICES_DATA_CSV = os.path.join(DATA_DIR, "PRICES_DATA.csv")
+FUELEU_CSV = os.path.join(DATA_DIR, "FUELEU.csv")
+
+# FUEL_DATA.csv column -> property name used by the engine
+FUEL_PROPERTIES = {
+    "LCV": "lcv",                      # MJ / g fuel
+    "CO2eq WtT": "co2eq_wtt",          # g CO2eq / MJ
+    "CO2eq TtW": "co2eq_ttw",          # g CO2eq / MJ
+    "CO2eq WtW": "co2eq_wtw",          # g CO2eq / MJ
+    "Cf (CO2eq) TtW": "cf_co2eq_ttw",  # g / g fuel
+    "Cf (CO2)": "cf_co2",
+    "Cf (CH4)": "cf_ch4",
+    "Cf (N2O)": "cf_n2o",
+    "Cf (NOx)": "cf_nox",
+    "Cf (SOx)": "cf_sox",
+    "Cf (PM)": "cf_pm",
+    "Cslip": "cslip",                  # %
+    "Density": "density",              # kg / liter
+}
+# EU ETS emission factors per year (g CO2eq / g fuel); later years use the last column.
+ETS_FACTOR_COLUMNS = {2024: "Cf (CO2eq) 2024", 2025: "Cf (CO2eq) 2025",
+                      2026: "Cf (CO2eq) 2026", 2027: "Cf (CO2eq) 2027"}
+
+# Fuels offered in the UI that have a price row but no FUEL_DATA row.
+PROPERTY_ALIASES = {"Hydrogen": "H2", "Electricity Natpower": "Electricity"}
+
+PRICE_UNITS = {"€ per kg": "kg", "€ per liter": "liter", "€ per kWh": "kWh", "€ per mT": "t"}
+
+EUA_ROW = "EUA"
+
+
+def _to_float(text):
+    """'€ 0.75' / '2.0%' / '0.0427' -> float; 'n.a.', '#VALUE!', '-' and blanks -> nan."""
+    cleaned = str(text).replace("€", "").replace("%", "").replace(",", "").strip()
+    try:
+        return float(cleaned)
+    except ValueError:
+        return float("nan")
+
+
+def _read_rows(path):
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        return list(csv.reader(fh))
+
+
+class ReferenceData:
+    """
+    Reference tables as NumPy arrays, indexed by fuel row:
+      fuel_names[i]           fuel name as used by the API / UI
+      props[name][i]          fuel property (see FUEL_PROPERTIES)
+      ets_factor[i, y]        ETS emission factor for years[y]
+      price[i, y], price_unit price in € per price_unit[i]
+      price_per_kg[i, y]      liquid fuels converted with density (nan for kWh fuels)
+      price_per_kwh[i, y]     electricity-priced fuels (nan otherwise)
+      eua[y]                  EU allowance price (€ / t CO2eq)
+      ghg_target[y]           FuelEU GHG intensity target (g CO2eq / MJ)
+      option_rows[c]          row of FUEL_OPTIONS[c] (-1 without reference data)
+    token identifies the table contents (memo keys stay valid across reloads).
+    """
+
+    def __init__(self, years, fuel_names, fuel_class, props, ets_factor,
+                 price, price_unit, eua, ghg_target, reduction, token=None):
+        self.years = years
+        self.fuel_names = fuel_names
+        self.fuel_class = fuel_class
+        self.props = props
+        self.ets_factor = ets_factor
+        self.price = price
+        self.price_unit = price_unit
+        self.eua = eua
+        self.ghg_target = ghg_target
+        self.reduction = reduction
+        self.token = token
+        self._index = {name.lower(): i for i, name in enumerate(fuel_names)}
+        self.option_rows = _code_rows(self._index)
+
+        density = props["density"]
+        is_liter = np.array([u == "liter" for u in price_unit])
+        is_kwh = np.array([u == "kWh" for u in price_unit])
+        per_kg = np.where(is_liter[:, None], price / density[:, None], price)
+        self.price_per_kg = np.where(is_kwh[:, None], np.nan, per_kg)
+        self.price_per_kwh = np.where(is_kwh[:, None], price, np.nan)
+        self.is_electric = (props["lcv"] == 0) | is_kwh
+
+    # Array attributes (props entries as "props.<name>") for sharing between processes.
+    _ARRAYS = ("years", "ets_factor", "price", "eua", "ghg_target", "reduction",
+               "price_per_kg", "price_per_kwh", "is_electric", "option_rows")
+    _META = ("fuel_names", "fuel_class", "price_unit")
+
+    def arrays(self):
+        out = {name: getattr(self, name) for name in self._ARRAYS}
+        out.update({f"props.{key}": value for key, value in self.props.items()})
+        return out
+
+    def meta(self):
+        meta = {name: list(getattr(self, name)) for name in self._META}
+        meta["token"] = self.token
+        return meta
+
+    @classmethod
+    def from_arrays(cls, meta, arrays):
+        """Rebuild from arrays()/meta() without copying the arrays (e.g. shared-memory views)."""
+        ref = cls.__new__(cls)
+        for name in cls._META:
+            setattr(ref, name, meta[name])
+        for name in cls._ARRAYS:
+            setattr(ref, name, arrays[name])
+        ref.props = {key[len("props."):]: value for key, value in arrays.items() if key.startswith("props.")}
+        ref.token = meta.get("token")
+        ref._index = {name.lower(): i for i, name in enumerate(ref.fuel_names)}
+        return ref
+
+    def fuel_index(self, name):
+        """Row of a fuel name (case-insensitive) or FUEL_OPTIONS code; KeyError for unknown fuels."""
+        if _is_code(name):
+            row = int(self.option_rows[name]) if 0 <= name < len(self.option_rows) else -1
+            if row < 0:
+                raise KeyError(name)
+            return row
+        return self._index[str(name).strip().lower()]
+
+    def fuel_rows(self, codes):
+        """Rows for an array of FUEL_OPTIONS codes (-1 where a code has no reference data)."""
+        return self.option_rows[np.asarray(codes, dtype=np.int64)]
+
+    def fuel_rows_for(self, fuels, missing=None):
+        """
+        Rows for a sequence of fuel names or codes. Each distinct value is turned
+        into its code once and looked up with fuel_rows; fuels outside FUEL_OPTIONS
+        fall back to fuel_index. Unknown fuels raise KeyError, or get `missing`.
+        """
+        fuels = list(fuels)
+        unique = list(dict.fromkeys(fuels))
+        codes = np.array([fuel_code(f) for f in unique], dtype=np.int64)
+        valid = (codes >= 0) & (codes < len(self.option_rows))
+        rows = np.where(valid, self.fuel_rows(np.where(valid, codes, 0)), -1)
+        for i in np.flatnonzero(rows < 0):
+            try:
+                rows[i] = self.fuel_index(unique[i])
+            except KeyError:
+                if missing is None:
+                    raise
+                rows[i] = missing
+        lookup = dict(zip(unique, rows.tolist()))
+        return np.array([lookup[f] for f in fuels], dtype=np.int64)
+
+    def year_index(self, year):
+        return int(np.clip(int(year) - int(self.years[0]), 0, len(self.years) - 1))
+
+
+def _is_code(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def _option_values():
+    import config
+    return [o["value"] for o in config.FUEL_OPTIONS]
+
+
+@lru_cache(maxsize=1)
+def _codes():
+    return {value.strip().lower(): c for c, value in enumerate(_option_values())}
+
+
+def fuel_code(name):
+    """Position of a fuel in FUEL_OPTIONS (case-insensitive); -1 if not offered. Codes pass through."""
+    if _is_code(name):
+        return int(name)
+    return _codes().get(str(name).strip().lower(), -1)
+
+
+def _code_rows(index):
+    return np.array([index.get(v.strip().lower(), -1) for v in _option_values()], dtype=np.int64)
+
+
+def _parse(years=range(2025, 2051)):
+    years = np.array(list(years), dtype=np.int64)
+
+    # --- FUEL_DATA.csv (row 2 holds units) ---
+    fuel_rows = _read_rows(FUEL_DATA_CSV)
+    header = [h.strip() for h in fuel_rows[0]]
+    col = {h: i for i, h in enumerate(header)}
+    data_rows = [r for r in fuel_rows[2:] if r and r[0].strip()]
+    fuel_props = {r[0].strip(): r for r in data_rows}
+
+    # --- PRICES_DATA.csv (wide: one column per year; first duplicate row wins) ---
+    price_rows = _read_rows(PRICES_DATA_CSV)
+    price_header = price_rows[0]
+    year_cols = [price_header.index(str(y)) for y in years]
+    prices = {}
+    for r in price_rows[1:]:
+        if r and r[0].strip() and r[0].strip().lower() not in prices:
+            prices[r[0].strip().lower()] = (PRICE_UNITS.get(r[1].strip(), r[1].strip()),
+                                            [_to_float(r[c]) for c in year_cols])
+
+    # Every fuel that has properties (directly or via alias) and/or a price row.
+    names = [r[0].strip() for r in data_rows]
+    for alias in PROPERTY_ALIASES:
+        if alias not in names:
+            names.append(alias)
+
+    props = {key: np.full(len(names), np.nan) for key in FUEL_PROPERTIES.values()}
+    ets_factor = np.full((len(names), len(years)), np.nan)
+    price = np.full((len(names), len(years)), np.nan)
+    price_unit = []
+    fuel_class = []
+    for i, name in enumerate(names):
+        row = fuel_props.get(name) or fuel_props.get(PROPERTY_ALIASES.get(name, ""))
+        fuel_class.append(row[col["Fuel class"]].strip() if row else "")
+        if row:
+            for csv_name, key in FUEL_PROPERTIES.items():
+                props[key][i] = _to_float(row[col[csv_name]])
+            for y, year in enumerate(years):
+                ets_col = ETS_FACTOR_COLUMNS[min(max(int(year), 2024), 2027)]
+                ets_factor[i, y] = _to_float(row[col[ets_col]])
+        unit, values = prices.get(name.lower(), ("", [np.nan] * len(years)))
+        price_unit.append(unit)
+        price[i] = values
+
+    eua = np.array(prices[EUA_ROW.lower()][1], dtype=float)
+
+    # --- FUELEU.csv ---
+    targets = {int(r[0]): (_to_float(r[1]) / 100.0, _to_float(r[2]))
+               for r in _read_rows(FUELEU_CSV)[1:] if r and r[0].strip().isdigit()}
+    last = max(targets)
+    reduction = np.array([targets.get(int(y), targets[last])[0] for y in years])
+    ghg_target = np.array([targets.get(int(y), targets[last])[1] for y in years])
+
+    for key in ("cf_co2eq_ttw", "cf_co2", "cf_ch4", "cf_n2o", "cf_nox", "cf_sox", "cf_pm",
+                "co2eq_wtt", "co2eq_ttw", "co2eq_wtw", "cslip", "lcv"):
+        props[key] = np.nan_to_num(props[key], nan=0.0)
+    ets_factor = np.nan_to_num(ets_factor, nan=0.0)
+
+    return ReferenceData(years, names, fuel_class, props, ets_factor,
+                         price, price_unit, eua, ghg_target, reduction)
+
+
+_installed = None
+
+
+def install_reference(ref):
+    """Make `ref` what load_reference() returns in this process (shared-memory workers)."""
+    global _installed
+    _installed = ref
+
+
+# Bump when the parsed layout changes so old cache files are ignored.
+_CACHE_FORMAT = 2
+
+
+def _source_key():
+    parts = [_CACHE_FORMAT, _option_values()]
+    for path in (FUEL_DATA_CSV, PRICES_DATA_CSV, FUELEU_CSV):
+        stat = os.stat(path)
+        parts.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return hashlib.blake2b(json.dumps(parts).encode(), digest_size=12).hexdigest()
+
+
+def _load_cache(path, key):
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            meta = json.loads(str(npz["__meta__"]))
+            if meta.get("token") != key:
+                return None
+            return ReferenceData.from_arrays(meta, {name: npz[name] for name in npz.files if name != "__meta__"})
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Reference cache unreadable, re-parsing CSVs: {e}")
+        return None
+
+
+def _save_cache(path, ref):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as fh:
+            np.savez(fh, __meta__=np.array(json.dumps(ref.meta())), **ref.arrays())
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Could not write reference cache {path}: {e}")
+
+
+@lru_cache(maxsize=1)
+def _parsed():
+    import config
+    key = _source_key()
+    path = config.REFERENCE_CACHE_PATH
+    if path and os.path.exists(path):
+        ref = _load_cache(path, key)
+        if ref is not None:
+            return ref
+    ref = _parse()
+    ref.token = key
+    if path:
+        _save_cache(path, ref)
+    return ref
+
+
+def load_reference():
+    """Reference tables: the installed ones, else parsed once per process."""
+    return _installed if _installed is not None else _parsed()
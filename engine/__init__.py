@@ -0,0 +1,16 @@
+# engine/__init__.py
+from engine.financial import (
+    MODES,
+    compare_with_remote,
+    normalize_inputs,
+    run_financial_model,
+    run_model,
+    to_financial_payload,
+)
+from engine.scenarios import SCENARIO_FIELDS, ScenarioGrid, evaluate_scenarios
+from engine.results import ScenarioResults
+from engine.montecarlo import linear_price_model, simulate_price_risk
+from engine.sensitivity import SENSITIVITY_PARAMETERS, build_sweep, run_sensitivity
+from engine.optimizer import optimize_blend
+from engine.graph import StageGraph, default_graph
+from engine.executor import SharedReferenceExecutor, get_executor
@@ -0,0 +1,132 @@
+# engine/executor.py
+import atexit
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from data.reference import ReferenceData, install_reference, load_reference
+
+# -------------------------------------------------------------------------------
+# PROCESS POOL WITH SHARED-MEMORY REFERENCE TABLES
+# -------------------------------------------------------------------------------
+# CPU-heavy local work (fleet runs, Monte Carlo chunks) runs on a process pool.
+# The parent copies the parsed reference arrays once into a single
+# multiprocessing.shared_memory block. Each worker attaches to that block at
+# start-up and installs read-only NumPy views of it as its load_reference(). No
+# worker re-parses the CSVs or holds its own copy of the tables. stream() hands
+# results back chunk by chunk as they finish, with a bounded number of chunks
+# in flight.
+
+_ALIGN = 64
+
+
+class SharedReference:
+    """The arrays of a ReferenceData copied into one shared-memory block."""
+
+    def __init__(self, ref):
+        arrays = {name: np.ascontiguousarray(value) for name, value in ref.arrays().items()}
+        layout, offset = {}, 0
+        for name, value in arrays.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            layout[name] = (offset, value.shape, value.dtype.str)
+            offset += value.nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for name, value in arrays.items():
+            start, shape, dtype = layout[name]
+            np.ndarray(shape, dtype, buffer=self.shm.buf, offset=start)[...] = value
+        self.descriptor = {"name": self.shm.name, "layout": layout, "meta": ref.meta()}
+        self.nbytes = offset
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def attach(descriptor):
+    """(ReferenceData over read-only shared-memory views, SharedMemory handle)."""
+    try:
+        shm = shared_memory.SharedMemory(name=descriptor["name"], track=False)
+    except TypeError:  # Python < 3.13. Pool workers share the parent's resource tracker,
+        shm = shared_memory.SharedMemory(name=descriptor["name"])  # so registering again is a no-op
+    arrays = {}
+    for name, (start, shape, dtype) in descriptor["layout"].items():
+        view = np.ndarray(tuple(shape), dtype, buffer=shm.buf, offset=start)
+        view.flags.writeable = False
+        arrays[name] = view
+    return ReferenceData.from_arrays(descriptor["meta"], arrays), shm
+
+
+_worker_shm = None
+
+
+def _init_worker(descriptor):
+    global _worker_shm
+    ref, _worker_shm = attach(descriptor)  # keep the mapping alive for the worker's lifetime
+    ref.token = ref.token or descriptor["name"]
+    install_reference(ref)
+
+
+class SharedReferenceExecutor:
+    """Process pool whose workers see the parent's reference tables through shared memory."""
+
+    def __init__(self, workers, ref=None):
+        self.workers = workers
+        self.shared = SharedReference(ref or load_reference())
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        initargs=(self.shared.descriptor,))
+
+    def map(self, fn, tasks):
+        """Results of fn(task) in task order."""
+        return list(self.pool.map(fn, tasks))
+
+    def stream(self, fn, tasks, max_pending=None):
+        """Yield (index, fn(task)) as chunks finish, keeping at most `max_pending` in flight."""
+        max_pending = max_pending or 2 * self.workers
+        tasks = iter(enumerate(tasks))
+        pending = {}
+        for i, task in tasks:
+            pending[self.pool.submit(fn, task)] = i
+            if len(pending) >= max_pending:
+                break
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                yield index, future.result()
+                nxt = next(tasks, None)
+                if nxt is not None:
+                    pending[self.pool.submit(fn, nxt[1])] = nxt[0]
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.shared.close()
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(workers):
+    """Process-wide executor with `workers` processes (recreated after a fork or resize)."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid or _executor.workers != workers:
+            if _executor is not None and _executor_pid == pid:
+                _executor.shutdown()
+            _executor = SharedReferenceExecutor(workers)
+            _executor_pid = pid
+    return _executor
+
+
+@atexit.register
+def _shutdown():
+    if _executor is not None and _executor_pid == os.getpid():
+        _executor.shutdown()
@@ -0,0 +1,547 @@
+# engine/financial.py
+import numpy as np
+
+from data.reference import load_reference
+
+# -------------------------------------------------------------------------------
+# LOCAL FINANCIAL MODEL
+# -------------------------------------------------------------------------------
+# Reproduces the financialmodelling response from the local reference tables.
+# Every stage works on a batch axis B (one row per vessel/what-if), the operating
+# modes M and, from the cost stage on, the model years Y:
+#
+#   energy -> fuel consumption -> emissions -> costs -> inflation -> NPV
+#
+# Axis conventions: B batch, M modes (MODES), G engines (main, aux),
+# K fuel components (base fuel, blend fuel), Y years (reference.years).
+MODES = ("sailing", "working", "idle", "shore")
+SAILING, WORKING, IDLE, SHORE = range(4)
+ENGINE_MODES = MODES[:3]  # modes where the ship's own engines run
+
+BLEND_FUEL = "Bio-diesel"                  # what BIOFUELS_BLEND_PERCENTAGE blends in
+SHORE_POWER_FUEL = "Electricity Natpower"  # price/intensity of shore power
+
+MJ_PER_KWH = 3.6
+# Brake thermal efficiency by engine speed (SFC = 3.6 / (LCV * efficiency) g/kWh)
+ENGINE_EFFICIENCY = {"LOW": 0.50, "SLOW": 0.50, "MEDIUM": 0.45, "HIGH": 0.42}
+DEFAULT_ENGINE_EFFICIENCY = 0.45
+
+# EU ETS surrender obligation phase-in
+ETS_PHASE_IN = {2024: 0.40, 2025: 0.70}
+
+# FuelEU Maritime penalty: |CB| / (GHGIE_actual * 41 000 MJ/t) * 2 400 EUR/t VLSFO-eq
+FUELEU_PENALTY_EUR_PER_T = 2400.0
+VLSFO_MJ_PER_T = 41000.0
+
+POLLUTANTS = ("co2", "ch4", "n2o", "nox", "sox", "pm")
+
+
+def ets_phase_in(years):
+    """Share of ETS-liable emissions that must be surrendered, per year."""
+    return np.array([ETS_PHASE_IN.get(int(y), 1.0) for y in years])
+
+
+def _efficiency(speed):
+    return ENGINE_EFFICIENCY.get(str(speed or "").strip().upper(), DEFAULT_ENGINE_EFFICIENCY)
+
+
+def _as_bool(value):
+    return str(value).strip().lower() in ("true", "yes", "1")
+
+
+def normalize_inputs(params_list, ref=None):
+    """
+    Financial-endpoint params (as built by build_financial_params) for B vessels
+    -> dict of NumPy arrays with a leading batch axis.
+    """
+    ref = ref or load_reference()
+    p = params_list
+
+    def col(key, default, dtype=float):
+        return np.array([dtype(d.get(key, default)) for d in p], dtype=float)
+
+    main_kw = col("main_engine_power_kw", 10400)
+    aux_kw = col("aux_engine_power_kw", 2246)
+    sailing_load = col("sailing_engine_load", 0.5)
+    working_load = col("working_engine_load", 0.3)
+    aux_load = col("shore_engine_load", 0.4)
+
+    B = len(p)
+    load = np.zeros((B, len(MODES), 2))
+    load[:, SAILING, 0] = sailing_load
+    load[:, WORKING, 0] = working_load
+    load[:, SAILING:IDLE + 1, 1] = aux_load[:, None]
+
+    sailing = col("sailing_days", 199)
+    working = col("working_days", 40)
+    idle = col("idle_days", 126)
+    shore_enable = np.array([_as_bool(d.get("shore_enable", False)) for d in p])
+    shore = np.where(shore_enable, np.minimum(col("shore_days", 0), idle), 0.0)
+
+    days_current = np.stack([sailing, working, idle, np.zeros(B)], axis=1)
+    days_future = np.stack([sailing, working, idle - shore, shore], axis=1)
+
+    blend = col("BIOFUELS_BLEND_PERCENTAGE", 0.0)
+    blend = np.where(blend > 1, blend / 100.0, blend)
+
+    def fuels(main_key, aux_key, default):
+        names = [d.get(key, default) for d in p for key in (main_key, aux_key)]
+        return ref.fuel_rows_for(names).reshape(B, 2)
+
+    return {
+        "main_kw": main_kw,
+        "aux_kw": aux_kw,
+        "power_kw": load * np.stack([main_kw, aux_kw], axis=1)[:, None, :],  # (B, M, G)
+        "shore_kw": aux_kw * aux_load,
+        "days_current": days_current,
+        "days_future": days_future,
+        "efficiency": np.array([[_efficiency(d.get("MAIN_ENGINE_SPEED")),
+                                 _efficiency(d.get("AUX_ENGINE_SPEED"))] for d in p]),
+        "fuel_current": fuels("main_fuel_type", "aux_fuel_type", "MDO"),
+        "fuel_future": fuels("future_main_fuel_type", "future_aux_fuel_type", "Diesel-Bio-diesel"),
+        "blend_future": blend,
+        "parasitic": np.clip(col("PARASITIC_LOAD_ENGINE", 0.95), 0.05, 1.0),
+        "maint_rate": col("ENGINE_MAINTENANCE_COSTS_PER_HOUR", 20),
+        "spares_rate": col("SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR", 2),
+        "bio_spares_rate": col("BIOFUELS_SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR", 3),
+        "shore_maint_day": col("SHORE_POWER_MAINTENANCE_PER_DAY", 480),
+        "shore_spares_day": col("SHORE_POWER_SPARES_PER_DAY", 480),
+        "inflation_rate": col("inflation_rate", 0.02),
+        "npv_rate": col("npv_rate", 0.0),
+        "capex": col("CAPEX", 0.0),
+        "report_index": np.array([ref.year_index(d.get("reporting_year", 2030)) for d in p], dtype=np.int64),
+    }
+
+
+# -------------------------------------------------------------------------------
+# STAGES
+# -------------------------------------------------------------------------------
+def energy_stage(power_kw, days):
+    """Engine energy per mode and engine (kWh/year), shape (B, M, G)."""
+    return {"power_kw": power_kw, "days": days, "energy_kwh": power_kw * 24.0 * days[:, :, None]}
+
+
+def fuel_stage(ref, energy_kwh, fuel, blend, efficiency, parasitic, shore_kw=None, days=None):
+    """
+    Split engine energy over the base fuel and the blend fuel and turn it into
+    fuel mass (combustion fuels) or electricity (electric fuels).
+    """
+    B = fuel.shape[0]
+    blend_idx = ref.fuel_index(BLEND_FUEL)
+    comp = np.stack([fuel, np.full_like(fuel, blend_idx)], axis=-1)         # (B, G, K)
+    electric = ref.is_electric[comp]                                          # (B, G, K)
+    b = np.where(ref.is_electric[fuel], 0.0, np.broadcast_to(blend[:, None], fuel.shape))
+    share = np.stack([1.0 - b, b], axis=-1)                                   # (B, G, K)
+
+    lcv = ref.props["lcv"][comp]
+    e_kwh = energy_kwh[..., None] * share[:, None]                            # (B, M, G, K)
+    denom = (lcv * efficiency[:, :, None])[:, None]
+    mass_g = np.divide(e_kwh * MJ_PER_KWH, denom, out=np.zeros_like(e_kwh),
+                       where=~electric[:, None] & (denom > 0))
+    elec_kwh = np.where(electric[:, None], e_kwh / parasitic[:, None, None, None], 0.0)
+    density = np.nan_to_num(ref.props["density"][comp], nan=1.0)
+    liters = mass_g / 1000.0 / density[:, None]
+
+    shore_idx = ref.fuel_index(SHORE_POWER_FUEL)
+    shore_kwh = np.zeros((B, len(MODES)))
+    if shore_kw is not None and days is not None:
+        shore_kwh[:, SHORE] = shore_kw * 24.0 * days[:, SHORE] / parasitic
+    fuel_mj = mass_g * lcv[:, None] + elec_kwh * MJ_PER_KWH
+    return {
+        "comp": comp, "share": share, "mass_g": mass_g, "elec_kwh": elec_kwh, "liters": liters,
+        "fuel_mj": fuel_mj, "shore_kwh": shore_kwh, "shore_idx": shore_idx,
+        "total_mj": fuel_mj.sum(axis=(2, 3)) + shore_kwh * MJ_PER_KWH,       # (B, M)
+    }
+
+
+def emissions_stage(ref, fuel):
+    """Emissions per mode in grams/year, GHG intensity and yearly ETS-liable CO2eq."""
+    comp, mass_g, fuel_mj = fuel["comp"], fuel["mass_g"], fuel["fuel_mj"]
+    out = {p: np.einsum("bmgk,bgk->bm", mass_g, ref.props[f"cf_{p}"][comp]) for p in POLLUTANTS}
+    out["co2eq_ttw"] = np.einsum("bmgk,bgk->bm", mass_g, ref.props["cf_co2eq_ttw"][comp])
+
+    shore_mj = fuel["shore_kwh"] * MJ_PER_KWH
+    shore = fuel["shore_idx"]
+    out["co2eq_wtw"] = (np.einsum("bmgk,bgk->bm", fuel_mj, ref.props["co2eq_wtw"][comp])
+                        + shore_mj * ref.props["co2eq_wtw"][shore])
+    out["co2eq_wtt"] = (np.einsum("bmgk,bgk->bm", fuel_mj, ref.props["co2eq_wtt"][comp])
+                        + shore_mj * ref.props["co2eq_wtt"][shore])
+    out["scope_2"] = shore_mj * ref.props["co2eq_ttw"][shore] + np.einsum(
+        "bmgk,bgk->bm", fuel["elec_kwh"] * MJ_PER_KWH, ref.props["co2eq_ttw"][comp])
+
+    total_mj = fuel["total_mj"].sum(axis=1)
+    out["total_mj"] = total_mj
+    out["ghg_intensity"] = np.divide(out["co2eq_wtw"].sum(axis=1), total_mj,
+                                     out=np.zeros_like(total_mj), where=total_mj > 0)
+    out["ets_g"] = np.einsum("bmgk,bgky->bym", mass_g, ref.ets_factor[comp])
+    return out
+
+
+def cost_stage(ref, fuel, emissions, days, maint_rate, spares_rate, shore_maint_day, shore_spares_day):
+    """Base-year (uninflated) yearly costs per mode; fuel and carbon costs follow the price curves."""
+    comp = fuel["comp"]
+    price_kg = np.nan_to_num(ref.price_per_kg[comp])                          # (B, G, K, Y)
+    price_kwh = np.nan_to_num(ref.price_per_kwh[comp])
+    fuel_cost = (np.einsum("bmgk,bgky->bym", fuel["mass_g"] / 1000.0, price_kg)
+                 + np.einsum("bmgk,bgky->bym", fuel["elec_kwh"], price_kwh)
+                 + fuel["shore_kwh"][:, None, :]
+                 * np.nan_to_num(ref.price_per_kwh[fuel["shore_idx"]])[None, :, None])
+
+    hours = days * 24.0
+    hours[:, SHORE] = 0.0
+    maintenance = hours * maint_rate[:, None]
+    spares = hours * spares_rate[:, None]
+    maintenance[:, SHORE] += days[:, SHORE] * shore_maint_day
+    spares[:, SHORE] += days[:, SHORE] * shore_spares_day
+
+    eu_ets = emissions["ets_g"] / 1e6 * (ref.eua * ets_phase_in(ref.years))[None, :, None]
+
+    intensity = emissions["ghg_intensity"]
+    total_mj = emissions["total_mj"]
+    balance = (ref.ghg_target[None, :] - intensity[:, None]) * total_mj[:, None]  # g CO2eq, (B, Y)
+    denom = intensity[:, None] * VLSFO_MJ_PER_T
+    penalty = np.divide(-balance, denom, out=np.zeros_like(balance),
+                        where=(balance < 0) & (denom > 0)) * FUELEU_PENALTY_EUR_PER_T
+    mj_share = np.divide(fuel["total_mj"], total_mj[:, None],
+                         out=np.zeros_like(fuel["total_mj"]), where=total_mj[:, None] > 0)
+
+    return {
+        "fuel": fuel_cost,                                    # (B, Y, M)
+        "maintenance": maintenance,                           # (B, M), base-year
+        "spares": spares,                                     # (B, M), base-year
+        "eu_ets": eu_ets,                                     # (B, Y, M)
+        "penalty": penalty[:, :, None] * mj_share[:, None],   # (B, Y, M)
+        "compliance_balance": balance,                        # (B, Y)
+    }
+
+
+def inflation_stage(ref, costs, inflation_rate):
+    """Inflate running costs (maintenance, spares) and total the yearly OPEX."""
+    t = (ref.years - ref.years[0]).astype(float)
+    factor = (1.0 + inflation_rate[:, None]) ** t[None, :]                   # (B, Y)
+    maintenance = costs["maintenance"][:, None, :] * factor[:, :, None]
+    spares = costs["spares"][:, None, :] * factor[:, :, None]
+    opex = costs["fuel"] + maintenance + spares + costs["eu_ets"] + costs["penalty"]
+    return {"factor": factor, "maintenance": maintenance, "spares": spares, "opex": opex}
+
+
+def npv_stage(current_opex, future_opex, capex, npv_rate):
+    """Yearly savings of the future configuration, CAPEX in the first year, discounted."""
+    cash = current_opex.sum(axis=2) - future_opex.sum(axis=2)                 # (B, Y)
+    cash[:, 0] -= capex
+    t = np.arange(cash.shape[1], dtype=float)
+    discount = (1.0 + npv_rate[:, None]) ** t[None, :]
+    return {"result": cash, "cumulative": np.cumsum(cash, axis=1),
+            "npv": np.cumsum(cash / discount, axis=1)}
+
+
+def side_inputs(ref, inputs, side):
+    """The per-side inputs of the stages: days, fuels, blend, shore power and cost rates."""
+    future = side == "future"
+    days = inputs["days_future"] if future else inputs["days_current"]
+    fuel_idx = inputs["fuel_future"] if future else inputs["fuel_current"]
+    blend = inputs["blend_future"] if future else np.zeros_like(inputs["blend_future"])
+    if future:
+        bio = (blend > 0) | np.array([ref.fuel_class[f] == "Biofuels" for f in fuel_idx[:, 0]], dtype=bool)
+        spares_rate = np.where(bio, inputs["bio_spares_rate"], inputs["spares_rate"])
+        shore_maint, shore_spares = inputs["shore_maint_day"], inputs["shore_spares_day"]
+    else:
+        spares_rate = inputs["spares_rate"]
+        shore_maint = shore_spares = np.zeros_like(inputs["spares_rate"])
+    return {
+        "days": days, "fuel_idx": fuel_idx, "blend": blend,
+        "shore_kw": inputs["shore_kw"] if future else None,
+        "spares_rate": spares_rate, "shore_maint": shore_maint, "shore_spares": shore_spares,
+    }
+
+
+def evaluate_side(ref, inputs, side):
+    """energy -> fuel -> emissions -> costs -> inflation for 'current' or 'future'."""
+    si = side_inputs(ref, inputs, side)
+    energy = energy_stage(inputs["power_kw"], si["days"])
+    fuel = fuel_stage(ref, energy["energy_kwh"], si["fuel_idx"], si["blend"], inputs["efficiency"],
+                      inputs["parasitic"], si["shore_kw"], si["days"])
+    emissions = emissions_stage(ref, fuel)
+    costs = cost_stage(ref, fuel, emissions, si["days"], inputs["maint_rate"], si["spares_rate"],
+                       si["shore_maint"], si["shore_spares"])
+    inflated = inflation_stage(ref, costs, inputs["inflation_rate"])
+    return {"energy": energy, "fuel": fuel, "emissions": emissions, "costs": costs,
+            "inflated": inflated, "spares_rate": si["spares_rate"]}
+
+
+def run_model(params_list, ref=None, graph=None):
+    """
+    Evaluate B parameter sets in one pass. Returns the stage arrays for both sides.
+    With a StageGraph (engine/graph.py), stages whose inputs did not change since
+    an earlier run are reused instead of recomputed.
+    """
+    ref = ref or load_reference()
+    inputs = normalize_inputs(params_list, ref)
+    if graph is not None:
+        return graph.evaluate(ref, inputs)
+    current = evaluate_side(ref, inputs, "current")
+    future = evaluate_side(ref, inputs, "future")
+    cash = npv_stage(current["inflated"]["opex"], future["inflated"]["opex"],
+                     inputs["capex"], inputs["npv_rate"])
+    return {"ref": ref, "inputs": inputs, "current": current, "future": future, "cash": cash}
+
+
+# -------------------------------------------------------------------------------
+# RESPONSE SHAPE
+# -------------------------------------------------------------------------------
+def _per_day(total, days):
+    return float(total / days) if days else 0.0
+
+
+def _mode_record(values, days, fmt, avg_key, modes, prefixes=("",), per_day=True, avg=None):
+    """{fmt.format(mode): value} for each mode (optionally per day in that mode), plus an average."""
+    record = {}
+    for m in modes:
+        i = MODES.index(m)
+        value = _per_day(values[i], days[i]) if per_day else float(values[i])
+        for prefix in prefixes:
+            record[f"{prefix}{fmt.format(mode=m)}"] = value
+    if avg_key:
+        total_days = days.sum()
+        for prefix in prefixes:
+            record[f"{prefix}{avg_key}"] = float(avg) if avg is not None else _per_day(values.sum(), total_days)
+    return [record]
+
+
+def _side_table(model, side, b):
+    ref = model["ref"]
+    res = model[side]
+    inputs = model["inputs"]
+    y = int(inputs["report_index"][b])
+    future = side == "future"
+    modes = MODES if future else ENGINE_MODES
+    pre = ("", "future_") if future else ("",)
+
+    days = res["energy"]["days"][b]
+    total_days = days.sum()
+    power = res["energy"]["power_kw"][b].sum(axis=1)
+    energy_kwh = res["energy"]["energy_kwh"][b].sum(axis=1) + res["fuel"]["shore_kwh"][b]
+    mass_kg = res["fuel"]["mass_g"][b].sum(axis=(1, 2)) / 1000.0
+    liters = res["fuel"]["liters"][b].sum(axis=(1, 2))
+    em = res["emissions"]
+    costs = res["costs"]
+    inflated = res["inflated"]
+    fuel_cost = costs["fuel"][b, y]
+    maintenance = inflated["maintenance"][b, y]
+    spares = inflated["spares"][b, y]
+    eu_ets = costs["eu_ets"][b, y]
+    penalty = costs["penalty"][b, y]
+    opex = inflated["opex"][b, y]
+    engine_kwh = res["energy"]["energy_kwh"][b].sum(axis=1)
+    sfc = np.divide(mass_kg * 1000.0, engine_kwh, out=np.zeros_like(mass_kg), where=engine_kwh > 0)
+    avg_sfc = float(mass_kg.sum() * 1000.0 / engine_kwh.sum()) if engine_kwh.sum() else 0.0
+
+    days_record = {"sailing_days": float(days[SAILING]), "working_days": float(days[WORKING]),
+                   "idle_days": float(days[IDLE]), "current_idle_days": float(days[IDLE])}
+    if future:
+        days_record.update({"shore_days": float(days[SHORE]), "adjusted_shore_days": float(days[SHORE])})
+
+    table = {
+        "working_days": [days_record],
+        "enginge_power": [{
+            **{f"{m}_power": float(power[MODES.index(m)]) for m in modes},
+            "max_power_day": float(power.max()),
+            "avg_power_req_day": _per_day(energy_kwh.sum(), total_days) / 24.0,
+            "avg_shore_power_req_day": float(power[SHORE]) if future else 0.0,
+        }],
+        "power_calc_day": _mode_record(energy_kwh, days, "{mode}_energy_req_kwh_day", "power_req_day", modes),
+        "power_calc_year": [{**{f"{m}_energy_req_mwh_year": float(energy_kwh[MODES.index(m)] / 1000.0)
+                                for m in modes},
+                             "power_req_year": float(energy_kwh.sum() / 1000.0)}],
+        "average_sfc": [{**{f"{m}_avg_sfc": float(sfc[MODES.index(m)]) for m in modes},
+                         "avg_sfc_day": avg_sfc}],
+        "fuel_consumption_kg": _mode_record(mass_kg, days, "{mode}_fuel_consumption_kg",
+                                            "avg_fuel_consumption_day", modes),
+        "fuel_consumption_liters": _mode_record(liters, days, "{mode}_fuel_consumption_liter",
+                                                "avg_fuel_consumption_liter_day", modes, pre),
+        "fuel_consumption_kiloliters_year": [{
+            **{f"{m}_fuel_consumption_kiloliter_year": float(liters[MODES.index(m)] / 1000.0) for m in modes},
+            "avg_fuel_consumption_kiloliter_day_year": float(liters.sum() / 1000.0),
+        }],
+        "fuel_price": _mode_record(fuel_cost, days, "{mode}_fuel_price", "avg_fuel_price_day", modes, pre),
+        "opex_day": _mode_record(opex, days, "{mode}_opex_day", "avg_opex_day", modes, pre),
+        "opex_year": _mode_record(opex, days, "{mode}_opex_year", "total_opex_year", modes, pre,
+                                  per_day=False, avg=opex.sum()),
+    }
+    if future:
+        table["power_calc_day"][0]["shore_power_req_day"] = _per_day(energy_kwh[SHORE], days[SHORE])
+        table["fuel_consumption_kg"][0]["avg_shore_fuel_consumption_day"] = _per_day(
+            res["fuel"]["shore_kwh"][b, SHORE], days[SHORE])
+
+    for name, key in (("co2", "co2"), ("nox", "nox"), ("sox", "sox"), ("pm", "pm"), ("ch4", "ch4"), ("n2o", "n2o")):
+        table[f"{name}_emission_ttw"] = _mode_record(em[key][b] / 1000.0, days, f"{{mode}}_{name}_emission_ttw",
+                                                     f"avg_{name}_ttw_day", modes, pre)
+    table["co2_emission_wtw"] = _mode_record(em["co2eq_wtw"][b] / 1000.0, days, "{mode}_co2_emission_wtw",
+                                             "avg_co2_wtw_day", modes, pre)
+
+    p = "future_" if future else ""
+    table["fuel_price_year"] = [{
+        **{f"{m}_fuel_price_year": float(fuel_cost[MODES.index(m)]) for m in modes},
+        "fuel_price_year": float(fuel_cost.sum()),
+        f"{p}avg_fuel_price_year": float(fuel_cost.sum()),
+        f"{p}avg_engine_maintenance_costs_year": float(maintenance.sum()),
+        f"{p}spares_consumables_costs_year": float(spares.sum()),
+    }]
+    table["ets_penalty"] = [{
+        f"{side}_eu_ets_year": float(eu_ets.sum()),
+        **{f"{side}_{m}_eu_ets_year": float(eu_ets[MODES.index(m)]) for m in modes},
+    }]
+    table["fueleu_penalty"] = [{
+        f"{p}total_fueleu_year": float(penalty.sum()),
+        "compliance_balance": float(costs["compliance_balance"][b, y]),
+        "ghg_intensity": float(em["ghg_intensity"][b]),
+    }]
+
+    engine_days = days[:SHORE].sum()
+    if future:
+        table["costs"] = [{
+            "engine_maintenance_costs": float(inputs["maint_rate"][b] * 24.0),
+            "future_spares_consumables_costs": float(res["spares_rate"][b] * 24.0),
+            "shore_power_maintenance_per_day": float(inputs["shore_maint_day"][b]),
+            "shore_power_spares_per_day": float(inputs["shore_spares_day"][b]),
+            "future_avg_engine_maintenance_costs_day": _per_day(maintenance.sum(), total_days),
+            "future_avg_spares_consumables_costs_day": _per_day(spares.sum(), total_days),
+            "future_eu_ets": _per_day(eu_ets.sum(), total_days),
+            "future_avg_fueleu_day": _per_day(penalty.sum(), total_days),
+            "future_avg_financing_day": 0.0,
+        }]
+    else:
+        table["costs"] = [{
+            "engine_maintenance_costs": float(inputs["maint_rate"][b] * 24.0),
+            "spares_consumables_costs": float(res["spares_rate"][b] * 24.0),
+            "fueleu_current_penalty": float(penalty.sum()),
+            "avg_eu_ets": _per_day(eu_ets.sum(), total_days),
+            "avg_engine_maintenance_costs_day": _per_day(maintenance.sum(), engine_days),
+            "avg_spares_consumables_costs_day": _per_day(spares.sum(), engine_days),
+            "avg_fueleu_day": _per_day(penalty.sum(), total_days),
+            "avg_financing_day": 0.0,
+        }]
+        co2_t = em["co2"][b] / 1000.0
+        table["carbon_footprint"] = {
+            "scope_1_co2": [{f"{m}_co2_emission_ttw_year": float(co2_t[MODES.index(m)]) for m in modes}],
+            "scope_2_co2": [{f"{m}_scope_2_co2_emission_ttw_year": float(em["scope_2"][b, MODES.index(m)] / 1000.0)
+                             for m in modes}],
+            "scope_3_co2": [{f"{m}_scope_3_co2_emission_ttw_year": float(em["co2eq_wtt"][b, MODES.index(m)] / 1000.0)
+                             for m in modes}],
+        }
+        table["country_vist"] = []  # port-call breakdown only exists in the remote model
+    return table
+
+
+def _savings(current, future, suffix=""):
+    savings, perc = {}, {}
+    for name in current:
+        cur, fut = float(current[name]), float(future[name])
+        savings[f"savings_{name}{suffix}"] = cur - fut
+        perc[f"perc_savings_{name}{suffix}"] = (cur - fut) / cur * 100.0 if cur else 0.0
+    return {"Savings": [savings], "Savings_perc": [perc]}
+
+
+def _summary_lines(model, side, b, per_day):
+    res = model[side]
+    y = int(model["inputs"]["report_index"][b])
+    days = res["energy"]["days"][b].sum() if per_day else 1.0
+    inflated = res["inflated"]
+    costs = res["costs"]
+    em = res["emissions"]
+    money = {
+        "fuel_price": costs["fuel"][b, y].sum(),
+        "maintenance_cost": inflated["maintenance"][b, y].sum(),
+        "spare_cost": inflated["spares"][b, y].sum(),
+        "eu_ets": costs["eu_ets"][b, y].sum(),
+        "fuel_eu": costs["penalty"][b, y].sum(),
+    }
+    if not per_day:
+        money["total_opex"] = inflated["opex"][b, y].sum()
+    emissions = {f"avg_{p}_ttw": em[p][b].sum() / 1000.0 for p in ("co2", "nox", "sox", "pm", "ch4")}
+    emissions["avg_co2_wtw"] = em["co2eq_wtw"][b].sum() / 1000.0
+    return ({k: v / days for k, v in money.items()}, {k: v / days for k, v in emissions.items()})
+
+
+def _timeseries(model, side, b):
+    ref = model["ref"]
+    res = model[side]
+    inflated = res["inflated"]
+    costs = res["costs"]
+    rows = []
+    for y, year in enumerate(ref.years):
+        rows.append({
+            "year": int(year),
+            f"total_fuel_{side}_inflated": float(costs["fuel"][b, y].sum()),
+            f"total_maintenance_{side}_inflated": float(inflated["maintenance"][b, y].sum()),
+            f"total_spare_{side}_inflated": float(inflated["spares"][b, y].sum()),
+            f"{side}_eu_ets": float(costs["eu_ets"][b, y].sum()),
+            f"{side}_penalty": float(costs["penalty"][b, y].sum()),
+            f"{side}_opex": float(inflated["opex"][b, y].sum()),
+            f"{side}_compliance_balance": float(costs["compliance_balance"][b, y]),
+        })
+    return rows
+
+
+def to_financial_payload(model, b=0):
+    """One batch row of a run_model() result in the financialmodelling response shape."""
+    ref = model["ref"]
+    cash = model["cash"]
+    cur_day, cur_em_day = _summary_lines(model, "current", b, per_day=True)
+    fut_day, fut_em_day = _summary_lines(model, "future", b, per_day=True)
+    cur_year, cur_em_year = _summary_lines(model, "current", b, per_day=False)
+    fut_year, fut_em_year = _summary_lines(model, "future", b, per_day=False)
+
+    emissions_year = _savings(cur_em_year, fut_em_year, "_year")
+    emissions_year["Savings"][0]["savings_avg_co2_ttw_year"] = cur_em_year["avg_co2_ttw"] - fut_em_year["avg_co2_ttw"]
+
+    return {
+        "current_table": _side_table(model, "current", b),
+        "future_output_table": _side_table(model, "future", b),
+        "opex_table": _savings(cur_day, fut_day),
+        "opex_table_year": _savings(cur_year, fut_year, "_year"),
+        "emissions_table": _savings(cur_em_day, fut_em_day),
+        "emissions_table_year": emissions_year,
+        "current_timeseries": _timeseries(model, "current", b),
+        "future_timeseries": _timeseries(model, "future", b),
+        "result": [{"year": int(year), "result": float(cash["result"][b, y]),
+                    "cumulative": float(cash["cumulative"][b, y]), "npv": float(cash["npv"][b, y])}
+                   for y, year in enumerate(ref.years)],
+        "source": "local",
+    }
+
+
+def run_financial_model(params):
+    """
+    Local equivalent of GET financialmodelling for one parameter set. Runs through
+    the process-wide stage graph, so what-if edits only recompute affected stages.
+    """
+    from engine.graph import default_graph
+
+    return to_financial_payload(run_model([params], graph=default_graph()))
+
+
+def compare_with_remote(params, timeout=15):
+    """
+    Cross-check the local model against the remote API for one parameter set.
+    Returns {series: max relative difference} over the yearly timeseries.
+    """
+    import config
+    from services.cache import cached_get, financial_cache
+
+    local = run_financial_model(params)
+    remote = cached_get(financial_cache, config.FINANCIAL_ENDPOINT, params, timeout=timeout)
+    report = {}
+    for section in ("current_timeseries", "future_timeseries"):
+        remote_rows = {r.get("year"): r for r in remote.get(section, [])}
+        for key in (local[section][0] if local[section] else {}):
+            if key == "year":
+                continue
+            diffs = []
+            for row in local[section]:
+                other = remote_rows.get(row["year"], {}).get(key)
+                if isinstance(other, (int, float)) and other:
+                    diffs.append(abs(row[key] - other) / abs(other))
+            if diffs:
+                report[key] = max(diffs)
+    return report
@@ -0,0 +1,146 @@
+# engine/graph.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from engine.financial import (
+    cost_stage,
+    emissions_stage,
+    energy_stage,
+    fuel_stage,
+    inflation_stage,
+    npv_stage,
+    side_inputs,
+)
+
+# -------------------------------------------------------------------------------
+# INCREMENTAL STAGE GRAPH
+# -------------------------------------------------------------------------------
+# The local model as a dependency graph, per side (current / future):
+#
+#   energy -> fuel -> emissions -> costs -> inflation ─┐
+#                                                      ├─> npv
+#   (same chain for the other side) ──────────────────-┘
+#
+# Each stage output is memoized under a key hashed from the stage's own inputs
+# and the keys of the stages it depends on. An edit therefore only recomputes the
+# stages downstream of what changed: a new npv_rate reruns npv only, and a new
+# inflation_rate reruns inflation and npv.
+
+STAGES = ("energy", "fuel", "emissions", "costs", "inflation", "npv")
+
+
+def _digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(str((part.dtype, part.shape)).encode())
+            h.update(np.ascontiguousarray(part).tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    return 0
+
+
+class StageGraph:
+    """Memoized stage evaluation with an LRU bounded by entries and bytes."""
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memo = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = dict.fromkeys(STAGES, 0)
+        self.misses = dict.fromkeys(STAGES, 0)
+
+    def _stage(self, stage, key, compute):
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.hits[stage] += 1
+                return self._memo[key][0]
+        value = compute()
+        size = _nbytes(value)
+        with self._lock:
+            self.misses[stage] += 1
+            if key not in self._memo and size <= self.max_bytes:
+                self._memo[key] = (value, size)
+                self._bytes += size
+                while self._memo and (len(self._memo) > self.max_entries or self._bytes > self.max_bytes):
+                    _, (_, evicted) = self._memo.popitem(last=False)
+                    self._bytes -= evicted
+        return value
+
+    def _side(self, ref, inputs, side):
+        si = side_inputs(ref, inputs, side)
+        k_energy = _digest("energy", inputs["power_kw"], si["days"])
+        energy = self._stage("energy", k_energy, lambda: energy_stage(inputs["power_kw"], si["days"]))
+
+        # Reference tables enter at the fuel stage; everything downstream inherits the key.
+        k_fuel = _digest("fuel", k_energy, getattr(ref, "token", None) or id(ref), si["fuel_idx"], si["blend"],
+                         inputs["efficiency"], inputs["parasitic"], si["shore_kw"])
+        fuel = self._stage("fuel", k_fuel, lambda: fuel_stage(
+            ref, energy["energy_kwh"], si["fuel_idx"], si["blend"], inputs["efficiency"],
+            inputs["parasitic"], si["shore_kw"], si["days"]))
+
+        k_emissions = _digest("emissions", k_fuel)
+        emissions = self._stage("emissions", k_emissions, lambda: emissions_stage(ref, fuel))
+
+        k_costs = _digest("costs", k_emissions, inputs["maint_rate"], si["spares_rate"],
+                          si["shore_maint"], si["shore_spares"])
+        costs = self._stage("costs", k_costs, lambda: cost_stage(
+            ref, fuel, emissions, si["days"], inputs["maint_rate"], si["spares_rate"],
+            si["shore_maint"], si["shore_spares"]))
+
+        k_inflation = _digest("inflation", k_costs, inputs["inflation_rate"])
+        inflated = self._stage("inflation", k_inflation,
+                               lambda: inflation_stage(ref, costs, inputs["inflation_rate"]))
+        result = {"energy": energy, "fuel": fuel, "emissions": emissions, "costs": costs,
+                  "inflated": inflated, "spares_rate": si["spares_rate"]}
+        return result, k_inflation
+
+    def evaluate(self, ref, inputs):
+        """Same result as financial.run_model, reusing every stage whose inputs are unchanged."""
+        current, k_current = self._side(ref, inputs, "current")
+        future, k_future = self._side(ref, inputs, "future")
+        k_npv = _digest("npv", k_current, k_future, inputs["capex"], inputs["npv_rate"])
+        cash = self._stage("npv", k_npv, lambda: npv_stage(
+            current["inflated"]["opex"], future["inflated"]["opex"], inputs["capex"], inputs["npv_rate"]))
+        return {"ref": ref, "inputs": inputs, "current": current, "future": future, "cash": cash}
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._memo), "bytes": self._bytes,
+                    "hits": dict(self.hits), "misses": dict(self.misses)}
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+            self._bytes = 0
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def default_graph():
+    """Process-wide stage graph configured from config (created on first use)."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                import config
+                _graph = StageGraph(max_entries=config.MODEL_STAGE_CACHE_ENTRIES,
+                                    max_bytes=config.MODEL_STAGE_CACHE_MB * 1024 * 1024)
+    return _graph
@@ -0,0 +1,220 @@
+# engine/montecarlo.py
+import numpy as np
+
+from data.reference import load_reference
+from engine.executor import get_executor
+from engine.financial import ets_phase_in, evaluate_side, normalize_inputs
+from engine.scenarios import broadcast_inputs, resolve_fuels
+
+# -------------------------------------------------------------------------------
+# MONTE CARLO PRICE RISK
+# -------------------------------------------------------------------------------
+# PRICES_DATA.csv gives one deterministic path per fuel. Here every price series a
+# scenario touches (its fuels, shore power and the EUA price) gets correlated
+# log-normal shocks around that path:
+#
+#   price[s, y] = base[s, y] * exp(sum_{t<=y} (vol_s * z[t, s] - vol_s^2 / 2)),  z ~ N(0, C)
+#
+# With quantities fixed, fuel cost is linear in prices and the ETS cost is linear
+# in the EUA price, so the scenario model is evaluated once. Each path then only
+# costs a small matrix product. Paths are generated in chunks, and the chunks can
+# be spread over the shared-reference process pool (engine/executor.py). Every
+# chunk has its own seed.
+#
+# Chunks are never kept. Each one is folded into a fixed-size histogram per
+# (fuel, year) as it arrives, and the percentiles are read from the histograms.
+# Peak memory is therefore O(chunk_size + N*Y*bins), whatever n_paths is. The
+# first chunk runs in the calling process and fixes each cell's histogram range.
+# Bin counts do not depend on arrival order, so a run is reproducible whatever
+# the number of workers.
+# FuelEU penalties do not depend on prices, so their bands collapse to the
+# deterministic value.
+
+DEFAULT_VOLATILITY = {"fuel": 0.20, "electric": 0.15, "eua": 0.25}
+DEFAULT_CORRELATION = {"same_class": 0.8, "fuel": 0.5, "eua": 0.3}
+EUA_SERIES = "EUA"
+HISTOGRAM_BINS = 2048
+
+
+def linear_price_model(base_params, fuels, ref=None):
+    """
+    Decompose each fuel scenario into price-independent and price-linear parts:
+      opex[n, y] = fixed[n, y] + qty[n, s] @ base_price[s, y] + ets_t[n, y] * eua[y]
+    `series` lists the reference rows of the priced quantities.
+    """
+    ref = ref or load_reference()
+    fuels, fuel_idx = resolve_fuels(fuels, ref)
+    N = len(fuels)
+    batch = broadcast_inputs(normalize_inputs([base_params], ref), N)
+    batch["fuel_future"] = np.repeat(fuel_idx[:, None], 2, axis=1)
+
+    side = evaluate_side(ref, batch, "future")
+    fuel, costs, inflated = side["fuel"], side["costs"], side["inflated"]
+    comp, shore = fuel["comp"], fuel["shore_idx"]
+
+    series = np.unique(np.append(comp.ravel(), shore))
+    pos = np.searchsorted(series, comp)                                       # (N, G, K)
+    qty_comp = np.where(ref.is_electric[comp], fuel["elec_kwh"].sum(axis=1),
+                        fuel["mass_g"].sum(axis=1) / 1000.0)                  # kWh or kg
+    qty = np.zeros((N, len(series)))
+    np.add.at(qty, (np.arange(N)[:, None, None], pos), qty_comp)
+    qty[:, np.searchsorted(series, shore)] += fuel["shore_kwh"].sum(axis=1)
+
+    electric = ref.is_electric[series]
+    base_price = np.nan_to_num(np.where(electric[:, None], ref.price_per_kwh[series],
+                                        ref.price_per_kg[series]))            # (S, Y)
+    eua = ref.eua * ets_phase_in(ref.years)
+    ets_t = side["emissions"]["ets_g"].sum(axis=2) / 1e6                      # (N, Y)
+    opex = inflated["opex"].sum(axis=2)
+    return {
+        "fuels": fuels,
+        "years": ref.years,
+        "series": [ref.fuel_names[i] for i in series],
+        "series_class": [ref.fuel_class[i] for i in series],
+        "electric": electric,
+        "qty": qty,
+        "base_price": base_price,
+        "eua": eua,
+        "ets_t": ets_t,
+        "fixed": opex - qty @ base_price - ets_t * eua[None, :],
+        "penalty": costs["penalty"].sum(axis=2),
+        "opex": opex,
+    }
+
+
+def default_correlation(series_class):
+    """Fuel series: same class 0.8, otherwise 0.5; the EUA series (last) 0.3 to every fuel."""
+    S = len(series_class)
+    cls = np.array(series_class, dtype=object)
+    corr = np.where(cls[:, None] == cls[None, :], DEFAULT_CORRELATION["same_class"], DEFAULT_CORRELATION["fuel"])
+    full = np.full((S + 1, S + 1), DEFAULT_CORRELATION["eua"])
+    full[:S, :S] = corr
+    np.fill_diagonal(full, 1.0)
+    return full
+
+
+def _simulate_chunk(task):
+    """Price paths for one chunk -> (opex, eu_ets) arrays of shape (paths, N, Y), float32."""
+    seed, size, qty, base_price, eua, ets_t, fixed, vol, chol = task
+    rng = np.random.default_rng(seed)
+    Y = base_price.shape[1]
+    z = rng.standard_normal((size, Y - 1, chol.shape[0])) @ chol.T
+    log_growth = np.cumsum(vol * z - 0.5 * vol ** 2, axis=1)
+    factor = np.exp(np.concatenate([np.zeros((size, 1, chol.shape[0])), log_growth], axis=1))  # (P, Y, S+1)
+
+    fuel_cost = np.einsum("ns,sy,pys->pny", qty, base_price, factor[:, :, :-1], optimize=True)
+    eu_ets = ets_t[None] * (eua[None, :] * factor[:, :, -1])[:, None, :]
+    opex = fixed[None] + fuel_cost + eu_ets
+    return opex.astype(np.float32), eu_ets.astype(np.float32)
+
+
+class QuantileHistogram:
+    """
+    Streaming percentiles of (paths, N, Y) samples: one histogram of `bins` bins
+    per (n, y) cell plus under/overflow bins and the running min/max. The range
+    is the first chunk's min..max widened by half its span on each side.
+    """
+
+    def __init__(self, first, bins=HISTOGRAM_BINS):
+        self.shape = first.shape[1:]
+        first = first.reshape(len(first), -1).astype(np.float64)
+        lo, hi = first.min(axis=0), first.max(axis=0)
+        pad = np.maximum(0.5 * (hi - lo), np.abs(lo) * 1e-9 + 1e-12)
+        self.bins = bins
+        self.lo = lo - pad
+        self.width = (hi - lo + 2 * pad) / bins
+        self.counts = np.zeros((first.shape[1], bins + 2), dtype=np.int64)
+        self.min = lo
+        self.max = hi
+        self.n = 0
+        self._offsets = np.arange(first.shape[1]) * (bins + 2)
+
+    def add(self, values):
+        values = values.reshape(len(values), -1).astype(np.float64)
+        idx = np.clip(np.floor((values - self.lo) / self.width).astype(np.int64) + 1, 0, self.bins + 1)
+        self.counts += np.bincount((idx + self._offsets).ravel(),
+                                   minlength=self.counts.size).reshape(self.counts.shape)
+        self.min = np.minimum(self.min, values.min(axis=0))
+        self.max = np.maximum(self.max, values.max(axis=0))
+        self.n += len(values)
+
+    def percentile(self, p):
+        """Linearly interpolated within the bin (np.percentile's rank convention)."""
+        rank = p / 100.0 * (self.n - 1)
+        cum = np.cumsum(self.counts, axis=1)
+        b = np.argmax(cum > rank, axis=1)
+        cells = np.arange(len(b))
+        count = self.counts[cells, b]
+        frac = (rank - (cum[cells, b] - count) + 0.5) / count
+        value = self.lo + (b - 1 + frac) * self.width
+        return np.clip(value, self.min, self.max).reshape(self.shape)
+
+
+def _bands(histogram, percentiles):
+    return {f"p{p:g}": histogram.percentile(p) for p in percentiles}
+
+
+def simulate_price_risk(base_params, fuels, n_paths=10000, volatility=None, correlation=None,
+                        chunk_size=None, workers=None, seed=0, percentiles=(10, 50, 90)):
+    """
+    P10/P50/P90 (or `percentiles`) bands of opex, eu_ets and penalty per fuel scenario
+    and year under correlated log-normal price shocks.
+
+    volatility: {"fuel", "electric", "eua"} annual log-volatilities (defaults above), or
+                an array with one value per price series plus the EUA last.
+    correlation: (S+1, S+1) matrix over model["series"] + EUA; default_correlation() if None.
+    Returns {"years", "series", "paths", "scenarios": {fuel: {metric: {"p10": [...], ...}}}}.
+    """
+    import config
+
+    chunk_size = chunk_size or config.MONTE_CARLO_CHUNK
+    workers = config.MONTE_CARLO_WORKERS if workers is None else workers
+    model = linear_price_model(base_params, fuels)
+    S = len(model["series"])
+
+    if volatility is None or isinstance(volatility, dict):
+        v = {**DEFAULT_VOLATILITY, **(volatility or {})}
+        vol = np.append(np.where(model["electric"], v["electric"], v["fuel"]), v["eua"])
+    else:
+        vol = np.asarray(volatility, dtype=float)
+    corr = default_correlation(model["series_class"]) if correlation is None else np.asarray(correlation, dtype=float)
+    if corr.shape != (S + 1, S + 1) or vol.shape != (S + 1,):
+        raise ValueError(f"Expected {S + 1} price series ({', '.join(model['series'])}, {EUA_SERIES})")
+    try:
+        chol = np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix is not positive definite")
+
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    shared = (model["qty"], model["base_price"], model["eua"], model["ets_t"], model["fixed"], vol, chol)
+    tasks = [(s, size, *shared) for s, size in zip(seeds, sizes)]
+
+    first = _simulate_chunk(tasks[0])
+    histograms = [QuantileHistogram(values) for values in first]
+    rest = tasks[1:]
+    if workers and workers > 1 and len(rest) > 1:
+        chunks = (chunk for _, chunk in get_executor(workers).stream(_simulate_chunk, rest))
+    else:
+        chunks = map(_simulate_chunk, rest)
+    for histogram, values in zip(histograms, first):
+        histogram.add(values)
+    del first
+    for chunk in chunks:
+        for histogram, values in zip(histograms, chunk):
+            histogram.add(values)
+
+    bands = {"opex": _bands(histograms[0], percentiles), "eu_ets": _bands(histograms[1], percentiles)}
+    penalty = model["penalty"]
+    bands["penalty"] = {f"p{p:g}": penalty for p in percentiles}
+
+    return {
+        "years": model["years"].tolist(),
+        "series": model["series"] + [EUA_SERIES],
+        "paths": int(n_paths),
+        "scenarios": {
+            fuel: {metric: {name: values[n].tolist() for name, values in per_metric.items()}
+                   for metric, per_metric in bands.items()}
+            for n, fuel in enumerate(model["fuels"])
+        },
+    }
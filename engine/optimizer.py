@@ -0,0 +1,90 @@
+# engine/optimizer.py
+import numpy as np
+
+from data.reference import load_reference
+from engine.financial import evaluate_side, normalize_inputs
+from engine.scenarios import broadcast_inputs
+
+# -------------------------------------------------------------------------------
+# LEAST-COST FUELEU BLEND TRAJECTORY
+# -------------------------------------------------------------------------------
+# For the future configuration, find the biofuel blend per year that minimises
+# that year's OPEX (fuel + maintenance + spares + EU ETS + FuelEU penalty).
+# The optimizer can also require the year's GHG intensity to meet the FUELEU.csv
+# target. Without banking or borrowing of compliance balance, the years are
+# independent, so the whole trajectory comes from one vectorized grid search over
+# blend x year. A second, finer grid is then searched around each year's optimum.
+
+
+def _evaluate(ref, inputs, blends):
+    batch = broadcast_inputs(inputs, len(blends))
+    batch["blend_future"] = blends
+    side = evaluate_side(ref, batch, "future")
+    return {
+        "opex": side["inflated"]["opex"].sum(axis=2),                 # (grid, Y)
+        "penalty": side["costs"]["penalty"].sum(axis=2),
+        "compliance_balance": side["costs"]["compliance_balance"],
+        "ghg_intensity": side["emissions"]["ghg_intensity"],          # (grid,)
+    }
+
+
+def _pick(values, blends, require_compliance):
+    """Cheapest blend per year; among compliant blends if required and any exist."""
+    cost = values["opex"]
+    if require_compliance:
+        compliant = values["compliance_balance"] >= 0
+        cost = np.where(compliant, cost, np.inf)
+        # Years where no blend complies: take the lowest-intensity blend.
+        intensity = values["ghg_intensity"]
+        if intensity.ndim == 1:
+            intensity = np.broadcast_to(intensity[:, None], cost.shape)
+        best_effort = np.argmin(intensity, axis=0)
+        best = np.where(compliant.any(axis=0), np.argmin(cost, axis=0), best_effort)
+    else:
+        best = np.argmin(cost, axis=0)
+    return blends[best]
+
+
+def optimize_blend(params, require_compliance=True, max_blend=1.0, steps=101, refine=21, ref=None):
+    """
+    Least-cost blend trajectory for one financial parameter set.
+    Returns per-year lists: blend, opex, penalty, compliance_balance, ghg_intensity,
+    target, compliant, plus the same figures for the entered blend under "baseline".
+    """
+    ref = ref or load_reference()
+    inputs = normalize_inputs([params], ref)
+    Y = len(ref.years)
+
+    coarse = np.linspace(0.0, max_blend, steps)
+    best = _pick(_evaluate(ref, inputs, coarse), coarse, require_compliance)
+
+    # Refine: one fine grid around each year's coarse optimum, all years in one batch.
+    step = max_blend / (steps - 1)
+    offsets = np.linspace(-step, step, refine)
+    fine = np.clip(best[None, :] + offsets[:, None], 0.0, max_blend)          # (refine, Y)
+    values = _evaluate(ref, inputs, fine.ravel())
+    cols = np.arange(Y)
+    rows = np.arange(refine)[:, None] * Y + cols[None, :]                      # row of (offset, year)
+    per_year = {key: values[key][rows, cols] for key in ("opex", "penalty", "compliance_balance")}
+    per_year["ghg_intensity"] = values["ghg_intensity"][rows]
+    chosen = _pick(per_year, np.arange(refine), require_compliance)
+    idx = (chosen, cols)
+
+    baseline = _evaluate(ref, inputs, inputs["blend_future"])
+    blend = fine[idx]
+    return {
+        "years": ref.years.tolist(),
+        "blend": blend.tolist(),
+        "opex": per_year["opex"][idx].tolist(),
+        "penalty": per_year["penalty"][idx].tolist(),
+        "compliance_balance": per_year["compliance_balance"][idx].tolist(),
+        "ghg_intensity": per_year["ghg_intensity"][idx].tolist(),
+        "target": ref.ghg_target.tolist(),
+        "compliant": (per_year["compliance_balance"][idx] >= 0).tolist(),
+        "baseline": {
+            "blend": float(inputs["blend_future"][0]),
+            "opex": baseline["opex"][0].tolist(),
+            "penalty": baseline["penalty"][0].tolist(),
+            "ghg_intensity": float(baseline["ghg_intensity"][0]),
+        },
+    }
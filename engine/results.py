@@ -0,0 +1,232 @@
+# engine/results.py
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# -------------------------------------------------------------------------------
+# COLUMNAR SCENARIO RESULTS (scenario x year x metric)
+# -------------------------------------------------------------------------------
+# The dashboard-scenarios-store shape, {scenario: [{"year", <metric>: value}]},
+# is converted once into one float array values[s, y, k] with index maps for
+# scenarios, years and metrics. Metrics missing from a record are nan. Year-range
+# and scenario filters are boolean masks over the array, and sums are taken
+# along an axis, so the dashboard figures and tables do no per-record Python work.
+#
+# Results built from a stored result (services.result_store) carry its key and
+# an AggregateCache. Subsets, totals and last values are then memoized under
+# (result key, scenario subset, year range, aggregate). A change to the scenario
+# filter or year slider therefore filters and sums once, and every callback
+# listening to it reuses that work. Cached arrays are read-only.
+
+
+class AggregateCache:
+    """LRU of derived aggregates bounded by entries and bytes, with per-kind hit/miss counts."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memo = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        kind = key[0]
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.hits[kind] = self.hits.get(kind, 0) + 1
+                return self._memo[key][0]
+        value = compute()
+        if value is None:
+            return None
+        size = value.values.nbytes if isinstance(value, ScenarioResults) else getattr(value, "nbytes", 0)
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        with self._lock:
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+            if key not in self._memo and size <= self.max_bytes:
+                self._memo[key] = (value, size)
+                self._bytes += size
+                while self._memo and (len(self._memo) > self.max_entries or self._bytes > self.max_bytes):
+                    _, (_, evicted) = self._memo.popitem(last=False)
+                    self._bytes -= evicted
+                    self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._memo), "bytes": self._bytes, "evictions": self.evictions,
+                    "hits": dict(self.hits), "misses": dict(self.misses)}
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+            self._bytes = 0
+
+
+class ScenarioResults:
+    """values[s, y, k] for scenarios[s], years[y], metrics[k] (nan where a record has no value)."""
+
+    def __init__(self, scenarios, years, metrics, values, key=None, cache=None):
+        self.scenarios = list(scenarios)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.metrics = list(metrics)
+        self.values = values
+        self.key = key
+        self.cache = cache
+        self._scenario_index = {name: s for s, name in enumerate(self.scenarios)}
+        self._metric_index = {name: k for k, name in enumerate(self.metrics)}
+
+    @classmethod
+    def from_store(cls, data):
+        """Build from {scenario: [records]} (records without a year are ignored)."""
+        data = data or {}
+        years, metrics = set(), {}
+        for records in data.values():
+            for rec in records or []:
+                if rec.get("year") is None:
+                    continue
+                years.add(int(rec["year"]))
+                for key, value in rec.items():
+                    if key != "year" and (value is None or isinstance(value, (int, float))):
+                        metrics.setdefault(key, None)
+        years = np.array(sorted(years), dtype=np.int64)
+        metrics = list(metrics)
+        values = np.full((len(data), len(years), len(metrics)), np.nan)
+        year_pos = {int(y): i for i, y in enumerate(years)}
+        for s, records in enumerate(data.values()):
+            for rec in records or []:
+                if rec.get("year") is None:
+                    continue
+                row = values[s, year_pos[int(rec["year"])]]
+                for k, key in enumerate(metrics):
+                    value = rec.get(key)
+                    if isinstance(value, (int, float)):
+                        row[k] = value
+        return cls(list(data), years, metrics, values)
+
+    @classmethod
+    def of(cls, data):
+        """`data` itself if it already is a ScenarioResults, else from_store(data)."""
+        return data if isinstance(data, cls) else cls.from_store(data)
+
+    def __len__(self):
+        return len(self.scenarios)
+
+    def __contains__(self, scenario):
+        return scenario in self._scenario_index
+
+    def has_metric(self, metric):
+        return metric in self._metric_index
+
+    def _memo(self, kind, args, compute):
+        if self.key is None or self.cache is None:
+            return compute()
+        return self.cache.get_or_compute((kind, self.key) + args, compute)
+
+    # --- selection ---------------------------------------------------------------
+    def subset(self, scenarios=None, year_range=None):
+        """
+        Same results restricted to `scenarios` (kept in this object's order; unknown
+        names are ignored) and to start <= year <= end.
+        """
+        rows = np.arange(len(self.scenarios))
+        if scenarios is not None:
+            wanted = set(scenarios)
+            rows = np.array([s for s, name in enumerate(self.scenarios) if name in wanted], dtype=np.int64)
+        cols = np.ones(len(self.years), dtype=bool)
+        if year_range is not None:
+            start, end = year_range
+            cols = (self.years >= int(start)) & (self.years <= int(end))
+        child_key = None if self.key is None else (
+            self.key, tuple(rows.tolist()), tuple(np.flatnonzero(cols).tolist()))
+
+        def compute():
+            values = self.values[rows][:, cols]
+            values.flags.writeable = False
+            return ScenarioResults([self.scenarios[s] for s in rows], self.years[cols], self.metrics,
+                                   values, key=child_key, cache=self.cache)
+
+        return self._memo("subset", child_key[1:] if child_key else (), compute)
+
+    def metric(self, metric):
+        """(S, Y) array of one metric (all nan if no record has it)."""
+        k = self._metric_index.get(metric)
+        if k is None:
+            return np.full(self.values.shape[:2], np.nan)
+        return self.values[:, :, k]
+
+    def series(self, scenario, metric):
+        """(years, values) of one scenario's metric, skipping years without a value."""
+        s = self._scenario_index.get(scenario)
+        if s is None:
+            return self.years[:0], np.empty(0)
+        values = self.metric(metric)[s]
+        present = ~np.isnan(values)
+        return self.years[present], values[present]
+
+    def present(self):
+        """(S, Y) mask of the (scenario, year) cells that have a record."""
+        return self._memo("present", (), lambda: ~np.isnan(self.values).all(axis=2))
+
+    def to_columnar(self, decimals=2):
+        """
+        Compact JSON form for clientside callbacks: columns[metric][s][y], null
+        where a record has no value.
+        """
+        def column(values):
+            rounded = np.round(values, decimals)
+            return [[None if np.isnan(v) else v for v in row] for row in rounded.tolist()]
+
+        return {
+            "scenarios": self.scenarios,
+            "years": self.years.tolist(),
+            "columns": {metric: column(self.metric(metric)) for metric in self.metrics},
+        }
+
+    # --- aggregates --------------------------------------------------------------
+    def totals(self, metric):
+        """Per-scenario sum over the years (missing values count as 0)."""
+        return self._memo("totals", (metric,), lambda: np.nansum(self.metric(metric), axis=1))
+
+    def component_totals(self, components):
+        """(S, C) per-scenario sums of each metric in `components`."""
+        if not components:
+            return np.zeros((len(self.scenarios), 0))
+        return self._memo("component_totals", tuple(components),
+                          lambda: np.stack([self.totals(c) for c in components], axis=1))
+
+    def last(self, metric):
+        """Per-scenario value of the latest year that has one (nan if none)."""
+        return self._memo("last", (metric,), lambda: self._last(metric))
+
+    def _last(self, metric):
+        values = self.metric(metric)
+        out = np.full(len(values), np.nan)
+        if values.shape[1] == 0:
+            return out
+        present = ~np.isnan(values)
+        idx = values.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+        found = present.any(axis=1)
+        out[found] = values[np.arange(len(values)), idx][found]
+        return out
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def default_aggregate_cache():
+    """Process-wide aggregate cache configured from config (created on first use)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                import config
+                _cache = AggregateCache(max_entries=config.AGGREGATE_CACHE_ENTRIES,
+                                        max_bytes=config.AGGREGATE_CACHE_MB * 1024 * 1024)
+    return _cache
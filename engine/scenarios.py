@@ -0,0 +1,121 @@
+# engine/scenarios.py
+import numpy as np
+
+from data.reference import load_reference
+from engine.financial import evaluate_side, normalize_inputs
+
+# -------------------------------------------------------------------------------
+# BATCHED FUEL SCENARIOS (fuel x blend x year)
+# -------------------------------------------------------------------------------
+# Local counterpart of the financialmodellingscenarios endpoint. Instead of one
+# call per fuel, the base vessel is broadcast over every (fuel, blend) pair and
+# the future side of the model is evaluated for all of them in a single pass.
+# A scenario fuel replaces the future fuel of both the main and the aux engines.
+
+SCENARIO_FIELDS = ("opex", "fuel_price", "maintenance", "spare", "eu_ets", "penalty",
+                   "compliance_balance", "blend_percentage")
+
+
+class ScenarioGrid:
+    """
+    Columnar scenario results: columns[field][n, m, y] for fuels[n], blends[m],
+    years[y]. to_store() gives the dashboard-scenarios-store shape.
+    """
+
+    def __init__(self, fuels, blends, years, columns):
+        self.fuels = list(fuels)
+        self.blends = np.asarray(blends, dtype=float)
+        self.years = np.asarray(years)
+        self.columns = columns
+
+    @property
+    def shape(self):
+        return len(self.fuels), len(self.blends), len(self.years)
+
+    def scenario_name(self, n, m):
+        if len(self.blends) == 1:
+            return self.fuels[n]
+        return f"{self.fuels[n]} @ {self.blends[m]:.0%}"
+
+    def to_columnar(self):
+        """JSON-friendly compact form: one nested list per field instead of one dict per year."""
+        return {
+            "fuels": self.fuels,
+            "blends": self.blends.tolist(),
+            "years": self.years.tolist(),
+            "columns": {field: np.round(values, 4).tolist() for field, values in self.columns.items()},
+        }
+
+    def to_results(self):
+        """The grid as ScenarioResults (same scenario names and order as to_store())."""
+        from engine.results import ScenarioResults
+
+        N, M, Y = self.shape
+        names = [self.scenario_name(n, m) for n in range(N) for m in range(M)]
+        values = np.stack([self.columns[field].reshape(N * M, Y) for field in SCENARIO_FIELDS], axis=2)
+        return ScenarioResults(names, self.years, SCENARIO_FIELDS, values.astype(float))
+
+    def to_store(self):
+        """{scenario_name: [{"year", <SCENARIO_FIELDS>}]} as returned by the scenarios endpoint."""
+        years = self.years.tolist()
+        cols = {field: values.tolist() for field, values in self.columns.items()}
+        store = {}
+        for n in range(len(self.fuels)):
+            for m in range(len(self.blends)):
+                store[self.scenario_name(n, m)] = [
+                    {"year": year, **{field: cols[field][n][m][y] for field in SCENARIO_FIELDS}}
+                    for y, year in enumerate(years)
+                ]
+        return store
+
+
+def resolve_fuels(fuels, ref):
+    """Unique scenario fuels with their reference rows; unknown fuels are logged and dropped."""
+    fuels = list(dict.fromkeys(f for f in fuels if f))
+    rows = ref.fuel_rows_for(fuels, missing=-1)
+    for fuel in np.array(fuels, dtype=object)[rows < 0]:
+        print(f"Scenario skipped: no reference data for fuel '{fuel}'")
+    return [fuel for fuel, row in zip(fuels, rows) if row >= 0], rows[rows >= 0]
+
+
+def broadcast_inputs(inputs, size):
+    """Repeat every row of normalize_inputs() output `size` times along the batch axis."""
+    return {key: np.repeat(value, size, axis=0) for key, value in inputs.items()}
+
+
+def evaluate_scenarios(base_params, fuels, blends=None, ref=None):
+    """
+    Evaluate `fuels` x `blends` (fractions, default: the base blend) on top of
+    one vessel's parameters. Fuels without reference data are skipped.
+    Returns a ScenarioGrid.
+    """
+    ref = ref or load_reference()
+    fuels, fuel_idx = resolve_fuels(fuels, ref)
+
+    inputs = normalize_inputs([base_params], ref)
+    if blends is None:
+        blends = inputs["blend_future"]
+    blends = np.asarray(blends, dtype=float).ravel()
+    blends = np.where(blends > 1, blends / 100.0, blends)
+    N, M = len(fuels), len(blends)
+
+    batch = broadcast_inputs(inputs, N * M)
+    batch["fuel_future"] = np.repeat(np.repeat(fuel_idx, M)[:, None], 2, axis=1)
+    batch["blend_future"] = np.tile(blends, N)
+
+    side = evaluate_side(ref, batch, "future")
+    costs, inflated = side["costs"], side["inflated"]
+    effective_blend = np.where(ref.is_electric[batch["fuel_future"][:, 0]], 0.0, batch["blend_future"])
+    Y = len(ref.years)
+    columns = {
+        "opex": inflated["opex"].sum(axis=2),
+        "fuel_price": costs["fuel"].sum(axis=2),
+        "maintenance": inflated["maintenance"].sum(axis=2),
+        "spare": inflated["spares"].sum(axis=2),
+        "eu_ets": costs["eu_ets"].sum(axis=2),
+        "penalty": costs["penalty"].sum(axis=2),
+        "compliance_balance": costs["compliance_balance"],
+        "blend_percentage": np.repeat(effective_blend[:, None], Y, axis=1),
+    }
+    columns = {field: values.reshape(N, M, Y) for field, values in columns.items()}
+    return ScenarioGrid(fuels, blends, ref.years, columns)
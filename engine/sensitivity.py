@@ -0,0 +1,121 @@
+# engine/sensitivity.py
+import numpy as np
+
+from engine.financial import run_model
+
+# -------------------------------------------------------------------------------
+# SENSITIVITY / TORNADO SWEEPS
+# -------------------------------------------------------------------------------
+# Every parameter of a financial parameter set (build_financial_params) is moved
+# down and up around its base value, one at a time. With the local engine all
+# perturbations are a single batch for run_model. With the API they are fetched
+# concurrently through the async client, because those calls wait on I/O rather
+# than CPU.
+
+# parameter -> (kind, step, lower bound, upper bound); kind is "relative" (x(1 -/+ step))
+# or "absolute" (-/+ step). Bounds clip the perturbed value (None = unbounded).
+SENSITIVITY_PARAMETERS = {
+    "sailing_engine_load": ("relative", 0.2, 0.0, 1.0),
+    "working_engine_load": ("relative", 0.2, 0.0, 1.0),
+    "shore_engine_load": ("relative", 0.2, 0.0, 1.0),
+    "sailing_days": ("relative", 0.2, 0.0, 365.0),
+    "working_days": ("relative", 0.2, 0.0, 365.0),
+    "BIOFUELS_BLEND_PERCENTAGE": ("absolute", 0.1, 0.0, 1.0),
+    "PARASITIC_LOAD_ENGINE": ("absolute", 0.03, 0.05, 1.0),
+    "inflation_rate": ("absolute", 0.01, None, None),
+    "npv_rate": ("absolute", 0.02, 0.0, None),
+    "CAPEX": ("relative", 0.2, 0.0, None),
+    "ENGINE_MAINTENANCE_COSTS_PER_HOUR": ("relative", 0.2, 0.0, None),
+    "SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": ("relative", 0.2, 0.0, None),
+    "BIOFUELS_SPARES_CONSUMABLES_COSTS_PER_ENGINE_HOUR": ("relative", 0.2, 0.0, None),
+    "SHORE_POWER_MAINTENANCE_PER_DAY": ("relative", 0.2, 0.0, None),
+    "SHORE_POWER_SPARES_PER_DAY": ("relative", 0.2, 0.0, None),
+}
+
+METRICS = ("total_opex", "npv")
+
+
+def _perturb(value, kind, step, lower, upper, direction):
+    value = float(value)
+    new = value * (1 + direction * step) if kind == "relative" else value + direction * step
+    if lower is not None:
+        new = max(new, lower)
+    if upper is not None:
+        new = min(new, upper)
+    return new
+
+
+def build_sweep(base_params, parameters=None):
+    """
+    [(parameter, value, params)] for the base case (parameter None) and a low and a
+    high perturbation of every parameter present in `base_params`.
+    """
+    parameters = parameters or SENSITIVITY_PARAMETERS
+    runs = [(None, None, dict(base_params))]
+    for name, (kind, step, lower, upper) in parameters.items():
+        if name not in base_params:
+            continue
+        for direction in (-1, 1):
+            value = _perturb(base_params[name], kind, step, lower, upper, direction)
+            runs.append((name, value, {**base_params, name: value}))
+    return runs
+
+
+def _metrics_local(param_sets):
+    model = run_model(param_sets)
+    return {
+        "total_opex": model["future"]["inflated"]["opex"].sum(axis=(1, 2)),
+        "npv": model["cash"]["npv"][:, -1],
+    }
+
+
+def _metrics_from_payload(payload):
+    future = (payload or {}).get("future_timeseries") or []
+    result = (payload or {}).get("result") or []
+    return (sum(float(r.get("future_opex", 0) or 0) for r in future),
+            float(result[-1].get("npv", 0) or 0) if result else np.nan)
+
+
+def _metrics_remote(param_sets, timeout=15):
+    import config
+    from services import async_client
+    from services.cache import financial_cache
+
+    payloads = async_client.run_sync(async_client.gather(*[
+        async_client.fetch_json(config.FINANCIAL_ENDPOINT, params, timeout=timeout, cache=financial_cache)
+        for params in param_sets
+    ]))
+    values = np.array([_metrics_from_payload(p) if isinstance(p, dict) else (np.nan, np.nan)
+                       for p in payloads])
+    return {"total_opex": values[:, 0], "npv": values[:, 1]}
+
+
+def run_sensitivity(base_params, parameters=None, source="local"):
+    """
+    Tornado data for total OPEX (future configuration, all model years) and final NPV.
+    Returns {"base": {metric: value}, "tornado": {metric: [bar, ...]}}, bars sorted by
+    swing (largest first), each {"parameter", "base_value", "low_value", "high_value",
+    "low", "high", "swing"}.
+    """
+    runs = build_sweep(base_params, parameters)
+    param_sets = [params for _, _, params in runs]
+    values = _metrics_remote(param_sets) if source == "api" else _metrics_local(param_sets)
+
+    base = {metric: float(values[metric][0]) for metric in METRICS}
+    tornado = {}
+    for metric in METRICS:
+        bars = []
+        for i in range(1, len(runs), 2):
+            name = runs[i][0]
+            low, high = float(values[metric][i]), float(values[metric][i + 1])
+            bars.append({
+                "parameter": name,
+                "base_value": float(base_params[name]),
+                "low_value": runs[i][1],
+                "high_value": runs[i + 1][1],
+                "low": low,
+                "high": high,
+                "swing": abs(high - low),
+            })
+        tornado[metric] = sorted(bars, key=lambda b: -np.nan_to_num(b["swing"]))
+    return {"base": base, "tornado": tornado}
@@ -0,0 +1,58 @@
+# mock_api/__main__.py
+#
+#   python -m mock_api --port 8060 --latency 0.2 --jitter 0.3 --error-rate 0.05
+#   API_BASE=http://127.0.0.1:8060/marinedata python app.py
+#
+# Record real responses once, then replay them offline:
+#   python -m mock_api --upstream https://natpower-marine-api-prod.azurewebsites.net/marinedata
+import argparse
+
+from mock_api.server import FIXTURES_DIR, MockServer, MockSettings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mock_api", description="Local stand-in for the marine API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8060)
+    parser.add_argument("--latency", type=float, default=0.0, help="fixed delay per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--ports", type=int, default=5, help="port calls per synthesized vessel")
+    parser.add_argument("--scenarios", type=int, default=0, help="synthetic scenarios added to each scenarios response")
+    parser.add_argument("--first-year", type=int, default=2025)
+    parser.add_argument("--last-year", type=int, default=2050)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="recorded responses directory")
+    parser.add_argument("--upstream", help="real API base; fixture misses are fetched and recorded")
+    parser.add_argument("--replay-only", action="store_true", help="404 on fixture misses instead of synthesizing")
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    settings = MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        ports=args.ports,
+        extra_scenarios=args.scenarios,
+        years=list(range(args.first_year, args.last_year + 1)),
+        fixtures_dir=args.fixtures,
+        upstream=args.upstream,
+        replay_only=args.replay_only,
+        compress=not args.no_gzip,
+        seed=args.seed,
+    )
+    server = MockServer((args.host, args.port), settings=settings, verbose=args.verbose)
+    print(f"Marine API mock on {server.base_url} (fixtures: {settings.fixtures_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# mock_api/server.py
+import gzip
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from mock_api import synth
+from services.api_client import canonical_key
+
+# -------------------------------------------------------------------------------
+# LOCAL STAND-IN FOR THE MARINE API
+# -------------------------------------------------------------------------------
+# Serves the three endpoints the app calls, under any path prefix, so that
+#   API_BASE=http://127.0.0.1:8060/marinedata python app.py
+# runs the whole app offline. Responses come from recorded fixtures first and are
+# synthesized otherwise; latency and failures can be injected for load tests.
+ENDPOINTS = ("getvesseldetails_engine_places", "financialmodelling", "financialmodellingscenarios")
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class MockSettings:
+    """Runtime knobs for the mock server (all can be changed while it is running)."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 ports=5, extra_scenarios=0, years=None, fixtures_dir=FIXTURES_DIR,
+                 upstream=None, replay_only=False, compress=True, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.ports = ports
+        self.extra_scenarios = extra_scenarios
+        self.years = years or synth.YEARS
+        self.fixtures_dir = fixtures_dir
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.replay_only = replay_only
+        self.compress = compress
+        self.rng = random.Random(seed)
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per endpoint + canonical params."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, endpoint, key):
+        return os.path.join(self.root, endpoint, f"{key}.json")
+
+    def get(self, endpoint, key):
+        try:
+            with open(self._path(endpoint, key), "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def put(self, endpoint, key, body):
+        path = self._path(endpoint, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(body)
+        os.replace(tmp, path)
+
+
+def _coerce(value):
+    """Query strings arrive as text; hash "10400" and 10400.0 the same way the client does."""
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def request_key(endpoint, params):
+    return canonical_key(endpoint, {k: _coerce(v) for k, v in params.items()})
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "MarineMock/1.0"
+    protocol_version = "HTTP/1.1"
+
+    # --- plumbing ----------------------------------------------------------------
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type="application/json"):
+        headers = {"Content-Type": content_type}
+        if (self.server.settings.compress and len(body) > 1024
+                and "gzip" in self.headers.get("Accept-Encoding", "")):
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode("utf-8"))
+
+    # --- request handling --------------------------------------------------------
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        if url.path.rstrip("/").endswith("/__mock__/stats"):
+            return self._send_json(200, self.server.stats())
+        if endpoint not in ENDPOINTS:
+            return self._send_json(404, {"detail": f"Unknown endpoint: {endpoint}"})
+
+        settings = self.server.settings
+        self.server.count(endpoint, "requests")
+
+        delay = settings.latency + (settings.rng.uniform(0, settings.jitter) if settings.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        if settings.error_rate and settings.rng.random() < settings.error_rate:
+            self.server.count(endpoint, "injected_errors")
+            return self._send_json(settings.error_status, {"detail": "Injected failure"})
+
+        params = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        key = request_key(endpoint, params)
+
+        body = self.server.fixtures.get(endpoint, key)
+        if body is not None:
+            self.server.count(endpoint, "replayed")
+            return self._send(200, body)
+
+        if settings.upstream:
+            try:
+                body = self._record(endpoint, url.query, key)
+            except requests.RequestException as e:
+                return self._send_json(502, {"detail": f"Upstream error: {e}"})
+            if body is not None:
+                return self._send(200, body)
+
+        if settings.replay_only:
+            self.server.count(endpoint, "missing")
+            return self._send_json(404, {"detail": f"No fixture for {endpoint} ({key[:12]})"})
+
+        self.server.count(endpoint, "synthesized")
+        self._send_json(200, self._synthesize(endpoint, params, key))
+
+    def _record(self, endpoint, query, key):
+        settings = self.server.settings
+        response = requests.get(f"{settings.upstream}/{endpoint}", params=query, timeout=120)
+        if response.status_code != 200:
+            return None
+        body = response.content
+        json.loads(body)  # only well-formed JSON is worth replaying
+        self.server.fixtures.put(endpoint, key, body)
+        self.server.count(endpoint, "recorded")
+        return body
+
+    def _synthesize(self, endpoint, params, key):
+        settings = self.server.settings
+        if endpoint == "getvesseldetails_engine_places":
+            import config
+            return synth.vessel_payload(params, key, config.DEFAULT_VESSEL, ports=settings.ports)
+        if endpoint == "financialmodelling":
+            return synth.financial_payload(params, key, years=settings.years)
+        return synth.scenario_payload(params, key, years=settings.years,
+                                      extra_scenarios=settings.extra_scenarios)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, settings=None, verbose=False):
+        super().__init__(address, MockHandler)
+        self.settings = settings or MockSettings()
+        self.fixtures = FixtureStore(self.settings.fixtures_dir)
+        self.verbose = verbose
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def count(self, endpoint, what):
+        with self._lock:
+            per_endpoint = self._counts.setdefault(endpoint, {})
+            per_endpoint[what] = per_endpoint.get(what, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._counts.items()}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/marinedata"
+
+
+def start_in_thread(host="127.0.0.1", port=0, settings=None, verbose=False):
+    """Start a mock server on a background thread (port 0 picks a free port)."""
+    server = MockServer((host, port), settings=settings, verbose=verbose)
+    thread = threading.Thread(target=server.serve_forever, name="marine-mock", daemon=True)
+    thread.start()
+    return server
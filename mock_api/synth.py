@@ -0,0 +1,211 @@
+# mock_api/synth.py
+import hashlib
+import random
+
+# -------------------------------------------------------------------------------
+# SYNTHETIC PAYLOADS
+# -------------------------------------------------------------------------------
+# Deterministic stand-ins for the marine API responses. Every generator seeds its
+# RNG from the request key, so the same query always produces the same payload
+# and cache behaviour on the client side is reproducible run to run.
+YEARS = list(range(2025, 2051))
+
+PORT_NAMES = [
+    "SINGAPORE", "ROTTERDAM", "ANTWERP", "HAMBURG", "BARCELONA", "GENOA",
+    "PIRAEUS", "MARSEILLE", "SOUTHAMPTON", "VALENCIA", "LISBON", "COPENHAGEN",
+]
+
+
+def _rng(key):
+    seed = int(hashlib.sha256(str(key).encode("utf-8")).hexdigest()[:16], 16)
+    return random.Random(seed)
+
+
+def _num(params, name, default):
+    try:
+        return float(params.get(name, default))
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def _fuels(params):
+    raw = params.get("scenario_future_aux_fuel") or "Diesel-Bio-diesel"
+    return [f.strip() for f in str(raw).split(",") if f.strip()]
+
+
+def vessel_payload(params, key, default_vessel, ports=5):
+    """Vessel summary for the searched IMO/name plus `ports` synthetic port calls."""
+    rng = _rng(key)
+    vessel = dict(default_vessel)
+    if params.get("imo"):
+        try:
+            vessel["imo"] = int(params["imo"])
+        except ValueError:
+            pass
+    if params.get("vesselname"):
+        vessel["vessel_name"] = str(params["vesselname"]).upper()
+    vessel["vessel_id"] = rng.randint(10000, 99999)
+
+    places = []
+    for i in range(ports):
+        base = PORT_NAMES[i % len(PORT_NAMES)]
+        places.append({
+            "port_id": 1000 + i,
+            "port_name": base if i < len(PORT_NAMES) else f"{base} {i // len(PORT_NAMES)}",
+            "idle_days": rng.randint(0, 12),
+            "working_days": rng.randint(0, 6),
+            "total_ci_mwh": round(rng.uniform(10, 2000), 4),
+        })
+    return {"vessel_summary": [vessel], "places_summary": places}
+
+
+def _yearly_costs(params, rng):
+    """Base-year current/future cost lines derived loosely from the request."""
+    power = _num(params, "main_engine_power_kw", 10400) + _num(params, "aux_engine_power_kw", 2246)
+    days = _num(params, "sailing_days", 199) + _num(params, "working_days", 40)
+    fx = _num(params, "price_conversion", 1) or 1
+    scale = power * days * fx
+
+    current = {
+        "fuel": scale * rng.uniform(4.0, 6.0),
+        "maintenance": scale * rng.uniform(0.08, 0.12),
+        "spare": scale * rng.uniform(0.01, 0.02),
+        "eu_ets": scale * rng.uniform(0.5, 0.9),
+        "penalty": scale * rng.uniform(0.2, 0.4),
+    }
+    future = {
+        "fuel": current["fuel"] * rng.uniform(0.9, 1.2),
+        "maintenance": current["maintenance"] * rng.uniform(0.7, 0.9),
+        "spare": current["spare"] * rng.uniform(1.0, 1.3),
+        "eu_ets": current["eu_ets"] * rng.uniform(0.4, 0.7),
+        "penalty": current["penalty"] * rng.uniform(0.0, 0.3),
+    }
+    return current, future
+
+
+def financial_payload(params, key, years=YEARS):
+    """
+    Financial model response with the sections the output page reads: summary
+    tables, savings tables, current/future timeseries and the cash-flow result.
+    Fields the page does not find fall back to its own defaults.
+    """
+    rng = _rng(key)
+    current, future = _yearly_costs(params, rng)
+    inflation = _num(params, "inflation_rate", 0.02)
+    npv_rate = _num(params, "npv_rate", 0)
+    capex = _num(params, "CAPEX", 19772750) * (_num(params, "price_conversion", 1) or 1)
+
+    current_ts, future_ts, result = [], [], []
+    cumulative = -capex
+    npv = -capex
+    for i, year in enumerate(years):
+        growth = (1 + inflation) ** i
+        cur = {k: v * growth for k, v in current.items()}
+        fut = {k: v * growth for k, v in future.items()}
+        cur_opex = sum(cur.values())
+        fut_opex = sum(fut.values())
+        current_ts.append({
+            "year": year,
+            "total_fuel_current_inflated": cur["fuel"],
+            "total_maintenance_current_inflated": cur["maintenance"],
+            "total_spare_current_inflated": cur["spare"],
+            "current_eu_ets": cur["eu_ets"],
+            "current_penalty": cur["penalty"],
+            "current_opex": cur_opex,
+        })
+        future_ts.append({
+            "year": year,
+            "total_fuel_future_inflated": fut["fuel"],
+            "total_maintenance_future_inflated": fut["maintenance"],
+            "total_spare_future_inflated": fut["spare"],
+            "future_eu_ets": fut["eu_ets"],
+            "future_penalty": fut["penalty"],
+            "future_opex": fut_opex,
+        })
+        saving = cur_opex - fut_opex
+        cumulative += saving
+        npv += saving / (1 + npv_rate) ** (i + 1)
+        result.append({"year": year, "result": saving, "cumulative": cumulative, "npv": npv})
+
+    def _table(costs, is_future=False):
+        p, side = ("future_", "future") if is_future else ("", "current")
+        return {
+            "opex_year": [{f"{p}total_opex_year": sum(costs.values())}],
+            "fuel_price_year": [{
+                f"{p}avg_fuel_price_year": costs["fuel"],
+                f"{p}avg_engine_maintenance_costs_year": costs["maintenance"],
+                f"{p}spares_consumables_costs_year": costs["spare"],
+            }],
+            "ets_penalty": [{f"{side}_eu_ets_year": costs["eu_ets"]}],
+            "fueleu_penalty": [{f"{p}total_fueleu_year": costs["penalty"]}],
+            "working_days": [{
+                "sailing_days": _num(params, "sailing_days", 199),
+                "working_days": _num(params, "working_days", 40),
+                "current_idle_days": _num(params, "idle_days", 126),
+            }],
+        }
+
+    savings_lines = (
+        ("fuel_price", "fuel"), ("maintenance_cost", "maintenance"), ("spare_cost", "spare"),
+        ("eu_ets", "eu_ets"), ("fuel_eu", "penalty"),
+    )
+
+    def _savings(suffix=""):
+        savings, perc = {}, {}
+        for name, src in savings_lines:
+            saved = current[src] - future[src]
+            savings[f"savings_{name}{suffix}"] = saved
+            perc[f"perc_savings_{name}{suffix}"] = saved / current[src] * 100 if current[src] else 0
+        if suffix:
+            total = sum(current.values())
+            saved = total - sum(future.values())
+            savings[f"savings_total_opex{suffix}"] = saved
+            perc[f"perc_savings_total_opex{suffix}"] = saved / total * 100 if total else 0
+        return {"Savings": [savings], "Savings_perc": [perc]}
+
+    return {
+        "current_table": _table(current),
+        "future_output_table": _table(future, is_future=True),
+        "opex_table": _savings(),
+        "opex_table_year": _savings("_year"),
+        "emissions_table": _savings(),
+        "emissions_table_year": _savings("_year"),
+        "current_timeseries": current_ts,
+        "future_timeseries": future_ts,
+        "result": result,
+    }
+
+
+def scenario_payload(params, key, years=YEARS, extra_scenarios=0):
+    """
+    {scenario_name: [yearly records]} for every requested fuel, padded with
+    `extra_scenarios` synthetic scenarios for load tests.
+    """
+    rng = _rng(key)
+    current, future = _yearly_costs(params, rng)
+    inflation = _num(params, "inflation_rate", 0.02)
+    names = _fuels(params) + [f"SYNTH-{i + 1:02d}" for i in range(extra_scenarios)]
+
+    payload = {}
+    for name in names:
+        srng = _rng(f"{key}:{name}")
+        factor = srng.uniform(0.8, 1.2)
+        blend = srng.choice([0.0, 0.1, 0.2, 0.3])
+        records = []
+        balance = -srng.uniform(1e5, 1e7)
+        for i, year in enumerate(years):
+            growth = (1 + inflation) ** i
+            line = {
+                "fuel_price": future["fuel"] * factor * growth,
+                "maintenance": future["maintenance"] * growth,
+                "spare": future["spare"] * growth,
+                "eu_ets": future["eu_ets"] * factor * growth,
+                "penalty": future["penalty"] * max(0.0, 1 - blend) * growth,
+            }
+            line["opex"] = sum(line.values())
+            balance *= srng.uniform(0.95, 1.1)
+            records.append({"year": year, **line,
+                            "compliance_balance": balance,
+                            "blend_percentage": blend})
+        payload[name] = records
+    return payload
@@ -0,0 +1,113 @@
+from dash import html, dcc, dash_table
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+
+import config
+
+PRIMARY_COLOR = "#0A4B8C"
+
+###############################################################################
+# FLEET SUMMARY PAGE
+###############################################################################
+TABLE_COLUMNS = [
+    ("imo", "IMO"), ("vessel_name", "Vessel"), ("vessel_category", "Category"),
+    ("current_opex", "Current OPEX"), ("future_opex", "Future OPEX"),
+    ("opex_savings", "OPEX Savings"), ("opex_savings_perc", "Savings (%)"),
+    ("future_penalty", "Future FuelEU Penalty"), ("npv", "NPV"), ("best_scenario", "Best Scenario"),
+]
+
+
+def kpi_card(title, value_id):
+    return dbc.Card(dbc.CardBody([
+        html.H6(title, className="text-muted"),
+        html.H4(id=value_id, className="mb-0", style={"color": PRIMARY_COLOR}),
+    ]), className="shadow-sm")
+
+
+def savings_figure(frame, currency_symbol="€", top=25):
+    fig = go.Figure()
+    if frame is not None and len(frame):
+        top_rows = frame.sort_values("opex_savings", ascending=False).head(top)
+        fig.add_trace(go.Bar(
+            x=top_rows["vessel_name"].fillna(top_rows["imo"].astype(str)),
+            y=top_rows["opex_savings"],
+            marker_color=["#2ca02c" if v >= 0 else "#d62728" for v in top_rows["opex_savings"]],
+        ))
+    fig.update_layout(
+        title=f"OPEX Savings by Vessel (top {top})",
+        yaxis_title=f"Savings ({currency_symbol})",
+        template="plotly_white",
+        margin=dict(l=40, r=20, t=50, b=120),
+    )
+    return fig
+
+
+def layout():
+    return dbc.Container([
+        dbc.Card([
+            dbc.CardHeader(html.H4("Fleet Batch Run", className="mb-0")),
+            dbc.CardBody([
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Vessels (CSV with an 'imo' column, or IMOs separated by commas)",
+                                   className="fw-bold"),
+                        dcc.Upload(
+                            id="fleet-upload",
+                            children=html.Div(["Drag and drop or ", html.A("select a CSV file")]),
+                            style={"border": "1px dashed #999", "borderRadius": "6px",
+                                   "padding": "12px", "textAlign": "center"},
+                            className="mb-2",
+                        ),
+                        dcc.Textarea(id="fleet-imos", placeholder="9803613, 9247455, ...",
+                                     style={"width": "100%", "height": "70px"}),
+                        html.Div(id="fleet-upload-status", className="text-muted small"),
+                    ], md=6),
+                    dbc.Col([
+                        html.Label("Scenario fuels to rank per vessel", className="fw-bold"),
+                        dcc.Dropdown(id="fleet-fuels", options=config.FUEL_OPTIONS, multi=True,
+                                     value=[], className="mb-2"),
+                        html.Label("Model", className="fw-bold"),
+                        dcc.RadioItems(
+                            id="fleet-source",
+                            options=[{"label": " Local engine", "value": "local"},
+                                     {"label": " Remote API", "value": "api"}],
+                            value=config.FINANCIAL_MODEL_SOURCE if config.FINANCIAL_MODEL_SOURCE == "local" else "api",
+                            inline=True, inputStyle={"marginLeft": "10px"},
+                        ),
+                        dbc.Button("Run Fleet", id="fleet-run-btn", color="primary", className="w-100 mt-3"),
+                    ], md=6),
+                ]),
+            ]),
+        ], className="mb-4 shadow"),
+
+        dbc.Card([
+            dbc.CardHeader(html.H4("Fleet Summary", className="mb-0")),
+            dbc.CardBody([
+                dbc.Row([
+                    dbc.Col(dcc.Dropdown(id="fleet-job-dropdown", placeholder="Select a fleet run..."), md=6),
+                    dbc.Col(html.Div(id="fleet-job-status", className="pt-2"), md=6),
+                ], className="mb-2"),
+                dbc.Progress(id="fleet-progress", value=0, striped=True, className="mb-3"),
+                dbc.Row([
+                    dbc.Col(kpi_card("Vessels", "fleet-kpi-vessels"), md=3),
+                    dbc.Col(kpi_card("Current OPEX / year", "fleet-kpi-current"), md=3),
+                    dbc.Col(kpi_card("Future OPEX / year", "fleet-kpi-future"), md=3),
+                    dbc.Col(kpi_card("Fleet NPV", "fleet-kpi-npv"), md=3),
+                ], className="mb-3"),
+                dcc.Graph(id="fleet-savings-chart", config={"displayModeBar": False}),
+                dash_table.DataTable(
+                    id="fleet-results-table",
+                    columns=[{"name": name, "id": col} for col, name in TABLE_COLUMNS],
+                    page_size=20,
+                    sort_action="native",
+                    filter_action="native",
+                    export_format="csv",
+                    style_table={"overflowX": "auto"},
+                    style_cell={"textAlign": "left", "padding": "8px", "fontSize": "14px"},
+                    style_header={"backgroundColor": PRIMARY_COLOR, "color": "white", "fontWeight": "bold"},
+                ),
+            ]),
+        ], className="shadow"),
+
+        dcc.Interval(id="fleet-progress-interval", interval=2000, n_intervals=0),
+    ], fluid=True)
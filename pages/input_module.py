@@ -5,6 +5,9 @@ from dash import html, dcc
 import dash_bootstrap_components as dbc
 import config  # Assumes config has FUEL_OPTIONS, DEFAULT_VESSEL, FINANCIAL_ENDPOINT, etc.
 import requests
+import sqlite3
+from services.api_client import api_get
+from services.vessel_index import get_vessel_index
 from urllib.parse import urlencode
 import config
 # -------------------------------------------------------------------------------
@@ -66,7 +69,7 @@ CURRENCY_OPTIONS=[{"label": "EUR", "value": "EUR"},
 # -------------------------------------------------------------------------------
 def create_input_group(label, id, value=None, input_type='number', options=None,
                        col_size=4, editable=True, info_text=None, units=None,
-                       min_val=None, max_val=None):
+                       min_val=None, max_val=None, datalist=None):
     col_settings = {"md": col_size, "xs": 12}
     
     label_contents = [label]
@@ -100,7 +103,8 @@ def create_input_group(label, id, value=None, input_type='number', options=None,
             placeholder=str(value) if value is not None else "",
             style={"backgroundColor": "#e9ecef"} if not editable else {},
             min=min_val,
-            max=max_val
+            max=max_val,
+            **({"list": datalist} if datalist else {})
         )
         if units:
             input_field = dbc.InputGroup([input_component, dbc.InputGroupText(units)])
@@ -116,25 +120,48 @@ def create_input_group(label, id, value=None, input_type='number', options=None,
 # -------------------------------------------------------------------------------
 # VESSEL DETAILS FETCHER
 # -------------------------------------------------------------------------------
-def get_vessel_details(search_term, search_type='imo'):
-    url = "https://natpower-marine-api-prod.azurewebsites.net/marinedata/getvesseldetails_engine_places?"
+def fetch_vessel_details(search_term, search_type='imo'):
+    """Query the vessel API. Returns (vessel_summary, places_summary) or None if not found."""
+    url = config.VESSEL_ENDPOINT
     params = {"imo": search_term, "mmsi": search_term} if search_type == 'imo' else {"vesselname": search_term}
-    
+
+    data = api_get(url, params=params, timeout=15)
+    if isinstance(data, dict) and data.get("vessel_summary") and data.get("places_summary"):
+        # Extract the first vessel and return it.
+        return data["vessel_summary"][0], data["places_summary"]
+    return None
+
+
+def get_vessel_details(search_term, search_type='imo'):
+    """
+    Vessel summary and port calls, from the local vessel index when this search
+    was answered recently, otherwise from the API. Falls back to the default
+    vessel (which is never cached) when nothing is found.
+    """
+    index = get_vessel_index()
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if isinstance(data, dict) and "vessel_summary" and "places_summary"in data:
-            if data["vessel_summary"] and data["places_summary"]:
-                # Extract the first vessel and return it.
-                return data["vessel_summary"][0], data["places_summary"]
-            else:
-                return DEFAULT_VESSEL, DEFAULT_PLACES
-        else:
-            return DEFAULT_VESSEL, DEFAULT_PLACES
+        cached = index.get(search_term, search_type)
+    except sqlite3.Error as e:
+        print(f"Vessel index unavailable: {e}")
+        cached = None
+    if cached is not None:
+        print(f"Vessel cache hit ({search_type}: {search_term})")
+        return cached
+
+    try:
+        found = fetch_vessel_details(search_term, search_type)
     except requests.RequestException as e:
         print(f"Exception fetching vessel details: {e}")
         return DEFAULT_VESSEL, DEFAULT_PLACES
+    if found is None:
+        return DEFAULT_VESSEL, DEFAULT_PLACES
+
+    vessel, places = found
+    try:
+        index.put(search_term, search_type, vessel, places)
+    except sqlite3.Error as e:
+        print(f"Could not index vessel: {e}")
+    return vessel, places
 
 
 # -------------------------------------------------------------------------------
@@ -362,7 +389,8 @@ def layout():
                                         value=None,
                                         input_type="text",
                                         col_size=6,
-                                        info_text="Enter IMO, MMSI, or vessel name"
+                                        info_text="Enter IMO, MMSI, or vessel name",
+                                        datalist="search-suggestions"
                                     ),
                                     dbc.Col(
                                         [
@@ -374,6 +402,7 @@ def layout():
                                 ],
                                 className="mb-3"
                             ),
+                            html.Datalist(id="search-suggestions"),
                             html.Div(id="search-results")
                         ],
                         style={"padding": "20px"}
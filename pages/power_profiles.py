@@ -15,6 +15,7 @@ from plotly.subplots import make_subplots
 import pages.input_module
 from pages.input_module import get_vessel_details, DEFAULT_VESSEL
 import pages.output_module
+from engine.results import ScenarioResults
 
 ###############################################################################
 # GLOBAL STYLES & CONSTANTS
@@ -24,6 +25,17 @@ HEADER_TEXT_STYLE = {"color": "white", "margin": "0"}
 MARGIN_STYLE = dict(l=60, r=30, t=60, b=50)
 TEMPLATE_STYLE = "plotly_white"
 
+# Charts of the financial metrics tab: (dashboard-chart-selector value, card title)
+DASHBOARD_CHARTS = [
+    ("metric", "Metric Comparison"),
+    ("min_future_opex", "Future Opex"),
+    ("dwelling", "Dwelling at Berth"),
+    ("single_year", "Cost Breakdown"),
+]
+
+# Scenarios selected in the global filter when the page first loads
+DEFAULT_SCENARIOS = ["MDO", "LNG"]
+
 ###############################################################################
 # COMMON CARD COMPONENT
 ###############################################################################
@@ -112,22 +124,19 @@ def load_min_future_opex_scenarios(dashboard_data=None):
       - 'opex': list of opex values
     Returns (sorted_years, {scenario: {'years':…, 'opex':…}, …})
     """
-    if not dashboard_data or not isinstance(dashboard_data, dict):
+    if not dashboard_data or not isinstance(dashboard_data, (dict, ScenarioResults)):
         return generate_fallback_scenarios()
 
-    all_years = set()
-    scenarios  = {}
-    for scenario, records in dashboard_data.items():
-        sorted_recs = sorted([r for r in records if r.get("year") is not None],
-                              key=lambda r: r["year"])
-        years = [r["year"] for r in sorted_recs]
-        opex  = [r.get("opex", 0)     for r in sorted_recs]
-        if years:
-            scenarios[scenario] = {"years": years, "opex": opex}
-            all_years.update(years)
+    results = ScenarioResults.of(dashboard_data)
+    present = results.present()
+    opex = np.nan_to_num(results.metric("opex"))
+    scenarios = {
+        name: {"years": results.years[present[s]].tolist(), "opex": opex[s, present[s]].tolist()}
+        for s, name in enumerate(results.scenarios) if present[s].any()
+    }
 
     if scenarios:
-        return sorted(all_years), scenarios
+        return results.years[present.any(axis=0)].tolist(), scenarios
     else:
         return generate_fallback_scenarios()
 
@@ -135,6 +144,11 @@ def load_min_future_opex_scenarios(dashboard_data=None):
 ###############################################################################
 # FIGURE HELPERS
 ###############################################################################
+def plotly_templates():
+    """Plotly templates used by the dashboard figures, for the clientside callbacks."""
+    import plotly.io as pio
+    return {name: pio.templates[name].to_plotly_json() for name in ("plotly", TEMPLATE_STYLE)}
+
 def set_figure_layout(fig, title, xaxis_title=None, yaxis_title=None):
     fig.update_layout(
         title=title,
@@ -171,20 +185,12 @@ def dwelling_at_berth_pie_figure(dashboard_data, selected_scenarios=None):
         subplot_titles=selected_scenarios
     )
 
+    results = ScenarioResults.of(dashboard_data)
+    sums = results.component_totals(["fuel_price", "maintenance", "spare", "eu_ets", "penalty"])
     for idx, scenario in enumerate(selected_scenarios):
-        records = dashboard_data.get(scenario, [])
-        # initialize sums
-        sums = {lab: 0 for lab in labels}
-
-        for rec in records:
-            sums["Fuel"]        += rec.get("fuel_price", 0)
-            sums["Maintenance"] += rec.get("maintenance", 0)
-            sums["Spares"]      += rec.get("spare", 0)
-            sums["EU ETS"]      += rec.get("eu_ets", 0)
-            sums["FuelEU"]      += rec.get("penalty", 0)
-
-        total_sum = sum(sums.values()) or 1
-        values    = [sums[lab] / total_sum * 100 for lab in labels]
+        row_sums = sums[results.scenarios.index(scenario)] if scenario in results else np.zeros(len(labels))
+        total_sum = row_sums.sum() or 1
+        values    = (row_sums / total_sum * 100).tolist()
 
         row = idx // cols + 1
         col = idx % cols  + 1
@@ -220,18 +226,12 @@ def min_future_opex_figure(dashboard_data=None, year_range=(2025, 2050)):
         return go.Figure().update_layout(title="No Data Available")
 
     start, end = year_range
-    aggregated = {}
-    for scenario, records in dashboard_data.items():
-        total = sum(
-            rec.get("opex", 0)
-            for rec in records
-            if rec.get("year") is not None and start <= rec["year"] <= end
-        )
-        if total:
-            aggregated[scenario] = total
+    opex = ScenarioResults.of(dashboard_data).subset(year_range=year_range)
+    sums = opex.totals("opex")
+    keep = sums != 0
 
-    scenarios = list(aggregated.keys())
-    totals    = [aggregated[s] for s in scenarios]
+    scenarios = [name for name, k in zip(opex.scenarios, keep) if k]
+    totals    = sums[keep].tolist()
 
     fig = go.Figure(
         go.Bar(
@@ -268,7 +268,7 @@ def create_range_stacked_bar(
     shows its value directly, and hovering still gives details.
 
     Args:
-        dashboard_data (dict): { scenario_name: [ {year, fuel_price, ...}, ... ], ... }
+        dashboard_data (dict or ScenarioResults): { scenario_name: [ {year, fuel_price, ...}, ... ], ... }
         year_range (tuple): (start_year, end_year)
         currency_symbol (str): e.g. "€", "$"
         conversion_rate (float): multiply raw values by this to convert into target currency
@@ -293,48 +293,32 @@ def create_range_stacked_bar(
 
     start, end = year_range
 
-    # 1) aggregate per scenario
-    aggregated = {}
-    for scenario, records in dashboard_data.items():
-        sums = {c: 0.0 for c in components}
-        for rec in records:
-            yr = rec.get("year")
-            if yr is None or yr < start or yr > end:
-                continue
-            for comp_name, key in components.items():
-                raw = rec.get(key, 0) or 0
-                sums[comp_name] += raw * conversion_rate
-        if any(v != 0 for v in sums.values()):
-            aggregated[scenario] = sums
+    # 1) aggregate per scenario: (scenario, component) sums over the range
+    results = ScenarioResults.of(dashboard_data).subset(year_range=year_range)
+    sums = results.component_totals(list(components.values())) * conversion_rate
+    keep = (sums != 0).any(axis=1)
+    sums = sums[keep]
 
     # 2) handle empty
-    if not aggregated:
+    if not keep.any():
         return go.Figure().update_layout(
             title=f"No data between {start} and {end}"
         )
 
-    # 3) sort scenarios by total
-    scenarios = sorted(
-        aggregated.keys(),
-        key=lambda sc: sum(aggregated[sc].values()),
-        reverse=True
-    )
+    # 3) sort scenarios by total (largest first, ties keep data order)
+    order = np.argsort(-sums.sum(axis=1), kind="stable")
+    scenarios = [name for name, k in zip(results.scenarios, keep) if k]
+    scenarios = [scenarios[i] for i in order]
+    sums = sums[order]
 
     # 4) rank components by total across all scenarios
-    comp_totals = {
-        comp: sum(aggregated[sc][comp] for sc in scenarios)
-        for comp in components
-    }
-    sorted_comps = sorted(
-        components.keys(),
-        key=lambda c: comp_totals[c],
-        reverse=True
-    )
+    comp_names = list(components)
+    sorted_comps = [comp_names[c] for c in np.argsort(-sums.sum(axis=0), kind="stable")]
 
     # 5) build traces with text displayed
     fig = go.Figure()
     for comp in sorted_comps:
-        values = [aggregated[sc][comp] for sc in scenarios]
+        values = sums[:, comp_names.index(comp)].tolist()
         fig.add_trace(
             go.Bar(
                 y=scenarios,
@@ -377,21 +361,13 @@ def generate_metric_figure(metric, year_range, selected_scenarios, dashboard_dat
     if not dashboard_data:
         return fig
 
-    start, end = year_range
+    results = ScenarioResults.of(dashboard_data).subset(year_range=year_range)
     for scenario in selected_scenarios:
-        records = dashboard_data.get(scenario, [])
-        x_vals, y_vals = [], []
-        for rec in records:
-            yr = rec.get("year")
-            if yr is None or yr < start or yr > end:
-                continue
-            if metric in rec:
-                x_vals.append(yr)
-                y_vals.append(rec.get(metric, 0))
-        if x_vals:
+        x_vals, y_vals = results.series(scenario, metric)
+        if len(x_vals):
             fig.add_trace(go.Scatter(
-                x=x_vals,
-                y=y_vals,
+                x=x_vals.tolist(),
+                y=y_vals.tolist(),
                 mode="lines+markers",
                 name=scenario
             ))
@@ -415,6 +391,8 @@ def filter_dashboard_data_by_scenarios(dashboard_data, selected_scenarios):
     """
     if not dashboard_data:
         return {}
+    if isinstance(dashboard_data, ScenarioResults):
+        return dashboard_data.subset(scenarios=selected_scenarios)
     return {scenario: data for scenario, data in dashboard_data.items() if scenario in selected_scenarios}
 
 ###############################################################################
@@ -564,8 +542,24 @@ def financial_metrics_layout():
                         className="mb-4"
                     ),
 
-                    # ─── Dynamic Chart Container ─────────────────────────────
-                    html.Div(id="dashboard-charts-container")
+                    # ─── Chart Container ─────────────────────────────────────
+                    # Fixed graphs, shown/hidden by the chart selector, so the
+                    # filters can restyle them clientside (see DASHBOARD_CHARTS).
+                    # dashboard-charts-view records what the graphs show, so the
+                    # server callback can send partial updates.
+                    html.Div(
+                        [html.Div(id="dashboard-charts-message"),
+                         dcc.Store(id="dashboard-charts-view")] + [
+                            html.Div(
+                                card_component(title, dcc.Graph(id=f"dashboard-chart-{key}",
+                                                                 className="chart-container")),
+                                id=f"dashboard-chart-{key}-card",
+                                style={"display": "none"},
+                            )
+                            for key, title in DASHBOARD_CHARTS
+                        ],
+                        id="dashboard-charts-container",
+                    )
                 ]
             )
         ],
@@ -726,7 +720,10 @@ def multi_chart_dashboard_layout():
             dbc.Row(dbc.Col(dbc.Card([
                 dbc.CardHeader("Annual Financial Metrics"),
                 dbc.CardBody(html.Div(id="dashboard-metrics-table"))
-            ]), className="mb-3"))
+            ]), className="mb-3")),
+
+            # What the graphs above show (figure signatures for partial updates)
+            dcc.Store(id="executive-dashboard-view")
         ])
     ], className="mb-4")
 
@@ -815,6 +812,49 @@ def projection_summary_layout():
         ])
     ], className="mb-4 shadow")
 
+# Blend Optimizer Layout
+
+def blend_optimizer_layout():
+    return dbc.Card([
+        dbc.CardHeader([
+            html.H4("Blend Optimizer", className="text-center"),
+            html.Small("Least-cost biofuel blend per year against the FuelEU GHG intensity targets",
+                       className="text-muted text-center d-block")
+        ]),
+        dbc.CardBody([
+            dbc.Row([
+                dbc.Col(dcc.Checklist(
+                    id="optimizer-require-compliance",
+                    options=[{"label": " Meet the FuelEU target every year", "value": "comply"}],
+                    value=["comply"],
+                ), md=8),
+                dbc.Col(dbc.Button("Optimize Blend", id="optimize-blend-btn",
+                                   color="primary", className="w-100"), md=4),
+            ], className="mb-3"),
+            dcc.Loading(dcc.Graph(id="optimizer-blend-chart", config={'displayModeBar': False})),
+            html.Div(id="optimizer-summary", className="mt-3"),
+        ])
+    ], className="mb-4 shadow")
+
+
+def blend_optimizer_figure(result, currency="EUR"):
+    years = result["years"]
+    factor = config.get_conversion(currency)
+    symbol = config.CURRENCIES.get(currency, {}).get("symbol", currency)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=years, y=[b * 100 for b in result["blend"]], name="Optimal blend (%)",
+                         marker_color="#2ca02c",
+                         customdata=[o * factor for o in result["opex"]],
+                         hovertemplate=f"%{{x}}: %{{y:.0f}}% blend<br>OPEX {symbol}%{{customdata:,.0f}}"
+                                       "<extra></extra>"))
+    fig.add_trace(go.Scatter(x=years, y=result["ghg_intensity"], name="GHG intensity (g/MJ)",
+                             mode="lines+markers", yaxis="y2"))
+    fig.add_trace(go.Scatter(x=years, y=result["target"], name="FuelEU target (g/MJ)",
+                             mode="lines", line=dict(dash="dash", color="#d62728"), yaxis="y2"))
+    set_figure_layout(fig, "Least-Cost Blend Trajectory", "Year", "Blend (%)")
+    fig.update_layout(yaxis2=dict(title="g CO2eq / MJ", overlaying="y", side="right"))
+    return fig
+
 # ----------------------------
 # Main App Layout
 # ----------------------------
@@ -832,7 +872,7 @@ def layout():
                         id="scenario-filter-global",
                         options=config.FUEL_OPTIONS,
                         multi=True,
-                        value=["MDO", "LNG"],
+                        value=DEFAULT_SCENARIOS,
                         placeholder="Select additional scenarios...",
                         className="mb-2"
                     ),
@@ -855,6 +895,7 @@ def layout():
                     dbc.Tab(financial_metrics_layout(), label="Financial Metrics"),
                     dbc.Tab(multi_chart_dashboard_layout(), label="Financial Dashboard"),
                     dbc.Tab(projection_summary_layout(), label="Projection Summary"),
+                    dbc.Tab(blend_optimizer_layout(), label="Blend Optimizer"),
                 ]
             ),
 
@@ -0,0 +1,133 @@
+# services/api_client.py
+import hashlib
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from services.resilience import guard_for
+from services.singleflight import SingleFlight
+
+# -------------------------------------------------------------------------------
+# SHARED HTTP SESSION
+# -------------------------------------------------------------------------------
+# One pooled session per worker process. Connections to the marine API are kept
+# alive between callbacks so repeated clicks skip the TCP/TLS handshake.
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.API_POOL_CONNECTIONS,
+        pool_maxsize=config.API_POOL_MAXSIZE,
+        pool_block=config.API_POOL_BLOCK,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def get_session():
+    """
+    Return the pooled session for the current process.
+
+    The session is created lazily and rebuilt after a fork, so gunicorn workers
+    never share sockets inherited from the master process.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def close_session():
+    """Close the pooled session (e.g. on worker shutdown)."""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+# -------------------------------------------------------------------------------
+# CANONICAL KEYS
+# -------------------------------------------------------------------------------
+def _normalize_value(value):
+    """Make equivalent parameter values hash identically (10400 == 10400.0)."""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def canonical_params(params):
+    """Return the params as a sorted, type-normalized dict."""
+    return {str(k): _normalize_value(v) for k, v in sorted((params or {}).items())}
+
+
+def canonical_key(endpoint, params):
+    """SHA-256 over the endpoint and its normalized parameter set."""
+    payload = json.dumps([endpoint, canonical_params(params)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------------------------------------
+# REQUESTS
+# -------------------------------------------------------------------------------
+# Identical requests issued concurrently by several callback threads share one
+# round-trip to the backend.
+inflight = SingleFlight()
+
+
+def _get_once(url, params, timeout):
+    response = get_session().get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def _fetch_body(url, params, timeout):
+    # Retries, circuit breaking, hedging and the endpoint's latency budget apply
+    # here; `timeout` bounds each individual attempt.
+    return guard_for(url).call(lambda attempt_timeout: _get_once(url, params, attempt_timeout), timeout)
+
+
+def api_get(url, params=None, timeout=15):
+    """
+    GET `url` through the shared session and return the decoded JSON body.
+    Raises requests exceptions on transport or HTTP errors, and on a body that is
+    not JSON (requests' JSONDecodeError, as response.json() would).
+
+    Concurrent calls with the same canonical params are coalesced; each caller
+    decodes its own copy of the shared body.
+    """
+    if config.API_SINGLE_FLIGHT:
+        body = inflight.do(canonical_key(url, params), _fetch_body, url, params, timeout)
+    else:
+        body = _fetch_body(url, params, timeout)
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
@@ -0,0 +1,80 @@
+# services/async_client.py
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from services.api_client import api_get
+from services.cache import cached_get
+
+# -------------------------------------------------------------------------------
+# EVENT-LOOP BRIDGE
+# -------------------------------------------------------------------------------
+# Dash callbacks are synchronous, so a single asyncio loop runs in a daemon thread
+# per worker process. Callbacks hand coroutines to it with run_sync() (wait for the
+# result) or submit() (fire and forget). HTTP calls are dispatched from the loop to
+# an I/O thread pool that uses the pooled requests session, so they share its
+# keep-alive connections and response caches.
+_loop = None
+_loop_pid = None
+_io_executor = None
+_lock = threading.Lock()
+
+
+def _ensure_loop():
+    global _loop, _loop_pid, _io_executor
+    pid = os.getpid()
+    if _loop is not None and _loop_pid == pid:
+        return _loop
+    with _lock:
+        if _loop is None or _loop_pid != pid:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="api-event-loop", daemon=True)
+            thread.start()
+            _io_executor = ThreadPoolExecutor(
+                max_workers=config.ASYNC_IO_WORKERS,
+                thread_name_prefix="api-io",
+            )
+            _loop, _loop_pid = loop, pid
+    return _loop
+
+
+def run_sync(coro, timeout=None):
+    """Run `coro` on the background loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _ensure_loop()).result(timeout)
+
+
+def submit(coro, label="background task"):
+    """Schedule `coro` on the background loop without waiting for it."""
+    future = asyncio.run_coroutine_threadsafe(coro, _ensure_loop())
+
+    def _log_failure(done):
+        if not done.cancelled() and done.exception() is not None:
+            print(f"Async {label} failed: {done.exception()}")
+
+    future.add_done_callback(_log_failure)
+    return future
+
+
+async def to_io(func, *args, **kwargs):
+    """Run a blocking call on the I/O pool and await its result."""
+    _ensure_loop()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, functools.partial(func, *args, **kwargs))
+
+
+async def fetch_json(url, params=None, timeout=15, cache=None):
+    """Async GET returning decoded JSON, optionally through a response cache."""
+    if cache is not None:
+        return await to_io(cached_get, cache, url, params, timeout)
+    return await to_io(api_get, url, params=params, timeout=timeout)
+
+
+async def gather(*coros):
+    """
+    Await `coros` concurrently. Failures are returned in place of results so one
+    slow or broken endpoint never cancels the others.
+    """
+    return await asyncio.gather(*coros, return_exceptions=True)
@@ -0,0 +1,216 @@
+# services/cache.py
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import config
+from services.api_client import api_get, canonical_key
+
+
+# -------------------------------------------------------------------------------
+# TWO-TIER RESPONSE CACHE
+# -------------------------------------------------------------------------------
+class ResponseCache:
+    """
+    JSON response cache with an in-process LRU tier and an optional on-disk tier.
+
+    Entries are stored as JSON text, so every hit hands back a fresh object and
+    callers can never mutate a cached payload. The disk tier lives in a shared
+    directory (one file per key) so all gunicorn workers on a host reuse it.
+
+    The disk tier is not rescanned on every put: the bytes written since the
+    last scan are tracked, and eviction runs every DISK_EVICT_EVERY puts or as
+    soon as the tracked total crosses disk_max_bytes. An eviction trims the
+    tier to DISK_EVICT_TARGET of the limit so a full cache is not rescanned on
+    every following put.
+    """
+
+    DISK_EVICT_EVERY = 64
+    DISK_EVICT_TARGET = 0.9
+
+    def __init__(self, name, ttl=3600, max_entries=256, max_bytes=64 * 1024 * 1024,
+                 disk_dir=None, disk_max_bytes=256 * 1024 * 1024):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()  # key -> (stored_at, text)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # tracked disk tier size, None until the first scan
+        self._disk_puts = 0  # puts since the last scan
+        self._stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    # --- memory tier -------------------------------------------------------------
+    def _memory_get(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, text = entry
+        if now - stored_at > self.ttl:
+            self._memory_pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    def _memory_put(self, key, text, stored_at):
+        if key in self._entries:
+            self._memory_pop(key)
+        self._entries[key] = (stored_at, text)
+        self._bytes += len(text)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._memory_pop(oldest)
+            self._stats["evictions"] += 1
+
+    def _memory_pop(self, key):
+        _, text = self._entries.pop(key)
+        self._bytes -= len(text)
+
+    # --- disk tier ---------------------------------------------------------------
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_get(self, key, now):
+        if not self.disk_dir:
+            return None, None
+        path = self._disk_path(key)
+        try:
+            stored_at = os.path.getmtime(path)
+            if now - stored_at > self.ttl:
+                os.remove(path)
+                return None, None
+            with open(path, "r", encoding="utf-8") as fh:
+                return fh.read(), stored_at
+        except OSError:
+            return None, None
+
+    def _disk_put(self, key, text):
+        if not self.disk_dir:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(text)
+            os.replace(tmp_path, self._disk_path(key))
+            if self._disk_evict_due(len(text)):
+                self._disk_evict()
+        except OSError as e:
+            print(f"Cache '{self.name}' disk write failed: {e}")
+
+    def _disk_evict_due(self, size):
+        """Count a put of `size` bytes; True when it is time to rescan the directory."""
+        with self._lock:
+            self._disk_puts += 1
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+            due = (self._disk_bytes is None or self._disk_puts >= self.DISK_EVICT_EVERY
+                   or self._disk_bytes > self.disk_max_bytes)
+            if due:
+                self._disk_puts = 0
+            return due
+
+    def _disk_evict(self):
+        now = time.time()
+        files = []
+        total = 0
+        for entry in os.scandir(self.disk_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                self._safe_remove(entry.path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        files.sort()
+        limit = self.disk_max_bytes * self.DISK_EVICT_TARGET if total > self.disk_max_bytes else total
+        while files and total > limit:
+            _, size, path = files.pop(0)
+            self._safe_remove(path)
+            total -= size
+            self._stats["evictions"] += 1
+        with self._lock:
+            self._disk_bytes = total
+
+    @staticmethod
+    def _safe_remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # --- public API --------------------------------------------------------------
+    def get(self, key):
+        """Return the cached payload for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            text = self._memory_get(key, now)
+            if text is not None:
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return json.loads(text)
+        text, stored_at = self._disk_get(key, now)
+        with self._lock:
+            if text is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+            self._memory_put(key, text, stored_at)
+        return json.loads(text)
+
+    def put(self, key, payload):
+        text = json.dumps(payload, separators=(",", ":"))
+        with self._lock:
+            self._memory_put(key, text, time.time())
+        self._disk_put(key, text)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._disk_bytes = 0
+            self._disk_puts = 0
+        if self.disk_dir:
+            for entry in os.scandir(self.disk_dir):
+                self._safe_remove(entry.path)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._bytes}
+
+
+def cached_get(cache, url, params, timeout=15):
+    """
+    Return the JSON response for `url` + `params`, serving repeats from `cache`.
+    Failed requests raise as usual and are never cached.
+    """
+    key = canonical_key(url, params)
+    payload = cache.get(key)
+    if payload is not None:
+        print(f"Cache '{cache.name}' hit ({key[:12]})")
+        return payload
+    payload = api_get(url, params=params, timeout=timeout)
+    cache.put(key, payload)
+    return payload
+
+
+financial_cache = ResponseCache(
+    "financial",
+    ttl=config.API_CACHE_TTL,
+    max_entries=config.API_CACHE_MAX_ENTRIES,
+    max_bytes=config.API_CACHE_MAX_MB * 1024 * 1024,
+    disk_dir=config.API_CACHE_DIR,
+    disk_max_bytes=config.API_CACHE_DISK_MAX_MB * 1024 * 1024,
+)
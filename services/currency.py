@@ -0,0 +1,51 @@
+# services/currency.py
+import re
+
+import config
+
+# -------------------------------------------------------------------------------
+# LOCAL CURRENCY CONVERSION
+# -------------------------------------------------------------------------------
+# Model results are fetched and cached in EUR (price_conversion=1) and converted
+# here, so switching the display currency never goes back to the API.
+BASE_CURRENCY = "EUR"
+
+# Field names that carry money, across the financial payload (tables, savings,
+# timeseries, result) and the scenario records. Percentages, emissions, energy,
+# days and compliance balances are left alone.
+_MONETARY = re.compile(
+    r"(price|cost|opex|eu_ets|penalty|fueleu|fuel_eu|capex|maintenance|spare|"
+    r"financing|inflated|cumulative|npv|^result$)",
+    re.IGNORECASE,
+)
+
+
+def is_monetary(key):
+    return bool(_MONETARY.search(key)) and not key.lower().startswith("perc_")
+
+
+def convert_monetary(data, factor):
+    """
+    Copy of `data` (nested dicts/lists, as stored in dcc.Store) with every
+    monetary numeric field multiplied by `factor`.
+    """
+    if factor == 1:
+        return data
+
+    def _walk(node, monetary):
+        if isinstance(node, dict):
+            return {k: _walk(v, is_monetary(k)) for k, v in node.items()}
+        if isinstance(node, list):
+            return [_walk(v, monetary) for v in node]
+        if monetary and isinstance(node, (int, float)) and not isinstance(node, bool):
+            return node * factor
+        return node
+
+    return _walk(data, False)
+
+
+def to_currency(data, currency):
+    """EUR payload -> the same payload in `currency` (no API call)."""
+    if not data:
+        return data
+    return convert_monetary(data, config.get_conversion(currency or BASE_CURRENCY))
@@ -0,0 +1,222 @@
+# services/exchange_rates.py
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, workers may refresh twice
+    fcntl = None
+
+from services.api_client import api_get
+
+# -------------------------------------------------------------------------------
+# EXCHANGE RATE PROVIDER
+# -------------------------------------------------------------------------------
+# Rates live in a small JSON table on disk that every worker on the host reads,
+# so all workers convert with the same numbers. Nothing touches the network at
+# import: the table is loaded on first use, and a daemon thread refreshes it in
+# the background. Until the first refresh succeeds the configured fallback rates
+# are used.
+
+
+class ExchangeRateProvider:
+    """
+    Base-currency exchange rates backed by a shared on-disk table.
+
+    Staleness policy:
+      - younger than `refresh_interval`: served as is
+      - older: still served, and a background refresh is triggered
+      - older than `max_age`: still served, but reported as stale (and logged once)
+    """
+
+    def __init__(self, path, base="EUR", url=None, refresh_interval=6 * 3600,
+                 max_age=7 * 24 * 3600, fallback=None, background=True, timeout=5):
+        self.path = path
+        self.base = base.upper()
+        self.url = url or f"https://api.exchangerate-api.com/v4/latest/{self.base}"
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.fallback = {k.upper(): float(v) for k, v in (fallback or {}).items()}
+        self.background = background
+        self.timeout = timeout
+        self._rates = None
+        self._fetched_at = 0.0
+        self._mtime = None
+        self._warned_stale = False
+        self._lock = threading.Lock()
+        self._refreshing = threading.Event()
+        self._refresher_pid = None
+
+    # --- disk table --------------------------------------------------------------
+    def _load(self):
+        """(Re)load the table if another worker rewrote it since we last read it."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                table = json.load(fh)
+        except (OSError, ValueError) as e:
+            print(f"Exchange rate table unreadable ({self.path}): {e}")
+            return
+        if str(table.get("base", "")).upper() != self.base or not isinstance(table.get("rates"), dict):
+            return
+        self._rates = {k.upper(): float(v) for k, v in table["rates"].items()}
+        self._fetched_at = float(table.get("fetched_at", mtime))
+        self._mtime = mtime
+        self._warned_stale = False
+
+    def _save(self, rates, fetched_at):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"base": self.base, "fetched_at": fetched_at, "rates": rates}, fh)
+        os.replace(tmp, self.path)
+
+    # --- refresh -----------------------------------------------------------------
+    def refresh(self):
+        """
+        Fetch fresh rates and rewrite the table. Only one process on the host
+        fetches at a time; the others pick the new table up from disk.
+        Returns True if the table is fresh afterwards.
+        """
+        lock_fh = None
+        try:
+            if fcntl is not None:
+                lock_fh = open(f"{self.path}.lock", "a")
+                try:
+                    fcntl.flock(lock_fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return False  # another worker is refreshing right now
+
+            with self._lock:
+                self._load()
+                if self._rates is not None and self.age() < self.refresh_interval:
+                    return True
+
+            data = api_get(self.url, timeout=self.timeout)
+            rates = data.get("rates") if isinstance(data, dict) else None
+            if not rates:
+                print(f"Error: exchange rate response for {self.base} has no rates.")
+                return False
+            fetched_at = time.time()
+            self._save(rates, fetched_at)
+            with self._lock:
+                self._load()
+            print(f"Exchange rates refreshed ({self.base}, {len(rates)} currencies)")
+            return True
+        except (requests.exceptions.RequestException, ValueError, OSError) as e:
+            print(f"Error refreshing exchange rates: {e}")
+            return False
+        finally:
+            if lock_fh is not None:
+                lock_fh.close()
+            self._refreshing.clear()
+
+    def _refresh_async(self):
+        if self._refreshing.is_set():
+            return
+        self._refreshing.set()
+        threading.Thread(target=self.refresh, name="fx-refresh", daemon=True).start()
+
+    def _refresh_loop(self):
+        while True:
+            # Jitter so workers booted together do not all wake at once.
+            time.sleep(self.refresh_interval * random.uniform(0.9, 1.1))
+            if not self._refreshing.is_set():
+                self._refreshing.set()
+                self.refresh()
+
+    def _ensure_started(self):
+        """First use in this process: load the table and start the refresher."""
+        pid = os.getpid()
+        if self._refresher_pid == pid:
+            return
+        with self._lock:
+            if self._refresher_pid == pid:
+                return
+            self._refresher_pid = pid
+            self._load()
+        if not self.background:
+            return
+        if self._rates is None or self.age() >= self.refresh_interval:
+            self._refresh_async()
+        threading.Thread(target=self._refresh_loop, name="fx-refresh-loop", daemon=True).start()
+
+    # --- lookups -----------------------------------------------------------------
+    def age(self):
+        """Seconds since the table was fetched (inf if there is no table yet)."""
+        return time.time() - self._fetched_at if self._rates is not None else float("inf")
+
+    def is_stale(self):
+        return self.age() > self.max_age
+
+    def rate(self, currency):
+        """
+        Conversion factor from the base currency to `currency`, never blocking on
+        the network. Returns None if the currency is unknown.
+        """
+        currency = (currency or self.base).upper()
+        if currency == self.base:
+            return 1.0
+        self._ensure_started()
+        with self._lock:
+            self._load()
+            rates = self._rates
+            age = self.age()
+        if rates is None or currency not in rates:
+            return self.fallback.get(currency)
+        if self.background and age >= self.refresh_interval:
+            self._refresh_async()
+        if age > self.max_age and not self._warned_stale:
+            self._warned_stale = True
+            print(f"Warning: exchange rates are {age / 86400:.1f} days old; serving last known values.")
+        return rates[currency]
+
+    def status(self):
+        return {
+            "base": self.base,
+            "path": self.path,
+            "source": "table" if self._rates is not None else "fallback",
+            "age_seconds": None if self._rates is None else round(self.age(), 1),
+            "stale": self._rates is None or self.is_stale(),
+        }
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """Process-wide provider configured from config (created on first use)."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                import config
+                _provider = ExchangeRateProvider(
+                    config.EXCHANGE_RATE_FILE,
+                    base="EUR",
+                    url=config.EXCHANGE_RATE_URL,
+                    refresh_interval=config.EXCHANGE_RATE_REFRESH,
+                    max_age=config.EXCHANGE_RATE_MAX_AGE,
+                    fallback=config.EXCHANGE_RATE_FALLBACK,
+                    background=config.EXCHANGE_RATE_BACKGROUND,
+                )
+    return _provider
+
+
+def conversion(currency):
+    """EUR -> `currency` factor used for `price_conversion` (1 if unknown)."""
+    rate = get_provider().rate(currency)
+    return rate if rate is not None else 1.0
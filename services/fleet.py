@@ -0,0 +1,455 @@
+# services/fleet.py
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+
+import config
+from engine.results import ScenarioResults
+from services.cache import cached_get, financial_cache
+from services.vessel_index import get_vessel_index
+
+# -------------------------------------------------------------------------------
+# FLEET BATCH RUNNER
+# -------------------------------------------------------------------------------
+# Models a whole fleet in one job. A job is a directory:
+#   manifest.json   IMOs, scenario fuels and model source
+#   vessels.jsonl   fetched vessel summaries (append-only journal)
+#   results.jsonl   one result row per modelled vessel (append-only journal)
+#   failures.jsonl  vessels that could not be fetched or modelled
+#   progress.json   phase and counters, rewritten as the job advances
+#   results.parquet one row per vessel, columnar (results.csv without a parquet engine)
+# Local-engine chunks run on the shared-reference process pool when
+# FLEET_MODEL_WORKERS > 1.
+# Both journals are flushed per vessel. An interrupted job picks up where it
+# stopped when run again: fetched vessels are not fetched again, and modelled
+# vessels are not modelled again. Failures are retried.
+
+RESULT_COLUMNS = [
+    "imo", "vessel_name", "vessel_category", "main_fuel_type", "future_main_fuel_type",
+    "reporting_year", "current_opex", "future_opex", "opex_savings", "opex_savings_perc",
+    "current_eu_ets", "future_eu_ets", "current_penalty", "future_penalty",
+    "co2_savings_kg", "co2_savings_perc", "npv", "cumulative_result",
+    "best_scenario", "best_scenario_opex",
+]
+
+
+def _parquet_available():
+    for module in ("pyarrow", "fastparquet"):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def read_imos(source):
+    """IMOs from a list, a CSV path or CSV text (column 'imo', else the first column)."""
+    if isinstance(source, (list, tuple)):
+        values = source
+    else:
+        if os.path.exists(str(source)):
+            with open(source, encoding="utf-8-sig") as fh:
+                text = fh.read()
+        else:
+            text = str(source)
+        rows = list(csv.reader(io.StringIO(text)))
+        header = [h.strip().lower() for h in rows[0]] if rows else []
+        if "imo" in header:
+            col = header.index("imo")
+            values = [r[col] for r in rows[1:] if len(r) > col]
+        else:
+            values = [r[0] for r in rows if r and r[0].strip().isdigit()]
+    imos = []
+    for value in values:
+        value = str(value).strip().split(".")[0]
+        if value.isdigit() and value not in imos:
+            imos.append(value)
+    return imos
+
+
+def _append(path, record, lock):
+    with lock, open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record) + "\n")
+        fh.flush()
+
+
+def _read_journal(path):
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass  # half-written last line of an interrupted run
+    return records
+
+
+def _timeseries_value(payload, section, year, key):
+    for row in payload.get(section) or []:
+        if int(row.get("year", 0)) == int(year):
+            return float(row.get(key, 0) or 0)
+    return 0.0
+
+
+def result_row(imo, vessel, params, payload, scenarios=None):
+    """
+    One fleet result row from a financialmodelling payload (local or API).
+    `scenarios` is a ScenarioResults or the scenarios endpoint's dict.
+    """
+    year = int(params.get("reporting_year", 2030))
+    current = _timeseries_value(payload, "current_timeseries", year, "current_opex")
+    future = _timeseries_value(payload, "future_timeseries", year, "future_opex")
+    emissions = (payload.get("emissions_table_year") or {})
+    savings = (emissions.get("Savings") or [{}])[0]
+    savings_perc = (emissions.get("Savings_perc") or [{}])[0]
+    result = payload.get("result") or [{}]
+
+    # Cheapest scenario in the reporting year (first one on ties)
+    best, best_opex = None, None
+    scenarios = ScenarioResults.of(scenarios)
+    opex = scenarios.subset(year_range=(year, year)).metric("opex")
+    if opex.shape[1] and not np.isnan(opex[:, 0]).all():
+        s = int(np.nanargmin(opex[:, 0]))
+        best, best_opex = scenarios.scenarios[s], float(opex[s, 0])
+
+    return {
+        "imo": str(imo),
+        "vessel_name": vessel.get("vessel_name"),
+        "vessel_category": vessel.get("vessel_category"),
+        "main_fuel_type": params.get("main_fuel_type"),
+        "future_main_fuel_type": params.get("future_main_fuel_type"),
+        "reporting_year": year,
+        "current_opex": current,
+        "future_opex": future,
+        "opex_savings": current - future,
+        "opex_savings_perc": (current - future) / current * 100 if current else 0.0,
+        "current_eu_ets": _timeseries_value(payload, "current_timeseries", year, "current_eu_ets"),
+        "future_eu_ets": _timeseries_value(payload, "future_timeseries", year, "future_eu_ets"),
+        "current_penalty": _timeseries_value(payload, "current_timeseries", year, "current_penalty"),
+        "future_penalty": _timeseries_value(payload, "future_timeseries", year, "future_penalty"),
+        "co2_savings_kg": float(savings.get("savings_avg_co2_ttw_year", 0) or 0),
+        "co2_savings_perc": float(savings_perc.get("perc_savings_avg_co2_ttw_year", 0) or 0),
+        "npv": float(result[-1].get("npv", 0) or 0),
+        "cumulative_result": float(result[-1].get("cumulative", 0) or 0),
+        "best_scenario": best,
+        "best_scenario_opex": best_opex,
+    }
+
+
+# Errors from modelling one vessel (e.g. a fuel missing from the reference data).
+# They fail that vessel only, never the job.
+_MODEL_ERRORS = (LookupError, ValueError, TypeError, ArithmeticError)
+
+
+def _model_failure(imo, error):
+    return {"imo": imo, "stage": "model", "error": f"{type(error).__name__}: {error}"}
+
+
+def _model_chunk(task):
+    """
+    (rows, failures) for a chunk of vessels with the local engine (also run in
+    pool workers). If the batch fails, the vessels are modelled one by one so
+    only the bad ones end up in failures.
+    """
+    from engine import evaluate_scenarios, run_model, to_financial_payload
+
+    chunk, fuels = task
+    try:
+        model = run_model([params for _, _, params, _ in chunk])
+    except _MODEL_ERRORS as e:
+        if len(chunk) == 1:
+            return [], [_model_failure(chunk[0][0], e)]
+        rows, failures = [], []
+        for job in chunk:
+            one_rows, one_failures = _model_chunk(([job], fuels))
+            rows += one_rows
+            failures += one_failures
+        return rows, failures
+    rows, failures = [], []
+    for b, (imo, vessel, params, scenario_params) in enumerate(chunk):
+        try:
+            scenarios = evaluate_scenarios(scenario_params, fuels).to_results() if fuels else None
+            rows.append(result_row(imo, vessel, params, to_financial_payload(model, b), scenarios))
+        except _MODEL_ERRORS as e:
+            failures.append(_model_failure(imo, e))
+    return rows, failures
+
+
+class FleetJob:
+    """A resumable fleet run in `job_dir`."""
+
+    def __init__(self, job_dir):
+        self.job_dir = job_dir
+        self._lock = threading.Lock()
+        self._progress = {}
+
+    def _path(self, name):
+        return os.path.join(self.job_dir, name)
+
+    @property
+    def results_path(self):
+        return self._path("results.parquet" if _parquet_available() else "results.csv")
+
+    @classmethod
+    def create(cls, job_dir, imos, fuels=None, source=None):
+        """New job (or the existing one in `job_dir`, which is then resumed)."""
+        job = cls(job_dir)
+        if os.path.exists(job._path("manifest.json")):
+            return job
+        os.makedirs(job_dir, exist_ok=True)
+        manifest = {
+            "imos": read_imos(imos),
+            "fuels": list(fuels or []),
+            "source": source or config.FINANCIAL_MODEL_SOURCE,
+            "created_at": time.time(),
+        }
+        with open(job._path("manifest.json"), "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh)
+        job._write_progress(phase="queued", total=len(manifest["imos"]), fetched=0, modelled=0, failed=0)
+        return job
+
+    @property
+    def manifest(self):
+        with open(self._path("manifest.json"), encoding="utf-8") as fh:
+            return json.load(fh)
+
+    # --- progress ----------------------------------------------------------------
+    def _write_progress(self, **fields):
+        with self._lock:
+            self._progress.update(fields, updated_at=time.time())
+            tmp = self._path("progress.json.tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self._progress, fh)
+            os.replace(tmp, self._path("progress.json"))
+            return dict(self._progress)
+
+    def progress(self):
+        try:
+            with open(self._path("progress.json"), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _report(self, on_progress, **fields):
+        state = self._write_progress(**fields)
+        if on_progress:
+            on_progress(state)
+
+    # --- phases ------------------------------------------------------------------
+    def _fetch(self, imos, concurrency, on_progress):
+        """Vessel details for `imos` (vessel index first), with at most `concurrency` API calls."""
+        from pages.input_module import fetch_vessel_details
+
+        index = get_vessel_index()
+
+        def fetch(imo):
+            # The index is only a cache: a read error falls through to the API
+            # and a write error is ignored, as in get_vessel_details.
+            try:
+                cached = index.get(imo, "imo")
+            except sqlite3.Error as e:
+                print(f"Vessel index unavailable: {e}")
+                cached = None
+            if cached is not None:
+                return cached[0]
+            found = fetch_vessel_details(imo, "imo")
+            if found is None:
+                raise LookupError("vessel not found")
+            try:
+                index.put(imo, "imo", *found)
+            except sqlite3.Error as e:
+                print(f"Could not index vessel: {e}")
+            return found[0]
+
+        fetched = self.progress().get("fetched", 0)
+        failed = 0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fleet-fetch") as pool:
+            futures = {pool.submit(fetch, imo): imo for imo in imos}
+            for future in as_completed(futures):
+                imo = futures[future]
+                try:
+                    vessel = future.result()
+                    _append(self._path("vessels.jsonl"), {"imo": imo, "vessel": vessel}, self._lock)
+                    fetched += 1
+                except (requests.RequestException, LookupError, ValueError) as e:
+                    _append(self._path("failures.jsonl"), {"imo": imo, "stage": "fetch", "error": str(e)}, self._lock)
+                    failed += 1
+                self._report(on_progress, phase="fetching", fetched=fetched, failed=failed)
+        return failed
+
+    def _model(self, vessels, manifest, concurrency, on_progress, failed):
+        from callbacks import build_financial_params, build_scenario_params, default_financial_form
+
+        fuels = manifest["fuels"]
+        modelled = self.progress().get("modelled", 0)
+        jobs = []
+        for imo, vessel in vessels:
+            try:
+                jobs.append((imo, vessel, build_financial_params(default_financial_form(vessel)),
+                             build_scenario_params(vessel, {})))
+            except (ValueError, TypeError) as e:
+                _append(self._path("failures.jsonl"), {"imo": imo, "stage": "params", "error": str(e)}, self._lock)
+                failed += 1
+
+        if manifest["source"] == "local":
+            batch = config.FLEET_MODEL_BATCH
+            chunks = [(jobs[start:start + batch], fuels) for start in range(0, len(jobs), batch)]
+            if config.FLEET_MODEL_WORKERS > 1 and len(chunks) > 1:
+                from engine.executor import get_executor
+                results = (result for _, result in get_executor(config.FLEET_MODEL_WORKERS).stream(_model_chunk, chunks))
+            else:
+                results = map(_model_chunk, chunks)
+            for rows, failures in results:
+                for row in rows:
+                    _append(self._path("results.jsonl"), row, self._lock)
+                for failure in failures:
+                    _append(self._path("failures.jsonl"), failure, self._lock)
+                modelled += len(rows)
+                failed += len(failures)
+                self._report(on_progress, phase="modelling", modelled=modelled, failed=failed)
+            return
+
+        from services.scenarios import fetch_scenarios
+
+        def model_one(job):
+            imo, vessel, params, scenario_params = job
+            payload = cached_get(financial_cache, config.FINANCIAL_ENDPOINT, params, timeout=30)
+            scenarios = fetch_scenarios(scenario_params, fuels, timeout=60) if fuels else None
+            return result_row(imo, vessel, params, payload or {}, scenarios)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fleet-model") as pool:
+            futures = {pool.submit(model_one, job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                imo = futures[future]
+                try:
+                    _append(self._path("results.jsonl"), future.result(), self._lock)
+                    modelled += 1
+                except (requests.RequestException, *_MODEL_ERRORS) as e:
+                    _append(self._path("failures.jsonl"), _model_failure(imo, e), self._lock)
+                    failed += 1
+                self._report(on_progress, phase="modelling", modelled=modelled, failed=failed)
+
+    def run(self, concurrency=None, on_progress=None):
+        """Run (or resume) the job. Returns the results DataFrame."""
+        concurrency = concurrency or config.FLEET_FETCH_CONCURRENCY
+        manifest = self.manifest
+        fetched = {r["imo"]: r["vessel"] for r in _read_journal(self._path("vessels.jsonl"))}
+        modelled = {r["imo"] for r in _read_journal(self._path("results.jsonl"))}
+        if os.path.exists(self._path("failures.jsonl")):
+            os.replace(self._path("failures.jsonl"), self._path("failures.prev.jsonl"))  # retried below
+
+        self._progress = self.progress()
+        self._report(on_progress, phase="fetching", total=len(manifest["imos"]), fetched=len(fetched),
+                     modelled=len(modelled), failed=0, started_at=time.time(), done=False)
+
+        to_fetch = [imo for imo in manifest["imos"] if imo not in fetched]
+        failed = self._fetch(to_fetch, concurrency, on_progress) if to_fetch else 0
+        fetched = {r["imo"]: r["vessel"] for r in _read_journal(self._path("vessels.jsonl"))}
+
+        to_model = [(imo, fetched[imo]) for imo in manifest["imos"] if imo in fetched and imo not in modelled]
+        self._model(to_model, manifest, concurrency, on_progress, failed)
+
+        frame = self.write_results()
+        self._report(on_progress, phase="done", done=True, modelled=len(frame))
+        return frame
+
+    def write_results(self):
+        """Rewrite the columnar results file from the results journal."""
+        rows = {r["imo"]: r for r in _read_journal(self._path("results.jsonl"))}
+        frame = pd.DataFrame(list(rows.values()), columns=RESULT_COLUMNS)
+        if _parquet_available():
+            frame.to_parquet(self.results_path, index=False)
+        else:
+            frame.to_csv(self.results_path, index=False)
+        return frame
+
+    def results(self):
+        """Results so far (columnar file if written, otherwise the journal)."""
+        if os.path.exists(self.results_path):
+            if self.results_path.endswith(".parquet"):
+                return pd.read_parquet(self.results_path)
+            return pd.read_csv(self.results_path, dtype={"imo": str})
+        rows = {r["imo"]: r for r in _read_journal(self._path("results.jsonl"))}
+        return pd.DataFrame(list(rows.values()), columns=RESULT_COLUMNS)
+
+    def failures(self):
+        return _read_journal(self._path("failures.jsonl"))
+
+
+# -------------------------------------------------------------------------------
+# Jobs started from the app (one background thread per job)
+# -------------------------------------------------------------------------------
+_running = {}
+_running_lock = threading.Lock()
+
+
+def list_jobs(root=None):
+    """[(job_name, progress)] newest first."""
+    root = root or config.FLEET_JOBS_DIR
+    if not os.path.isdir(root):
+        return []
+    jobs = []
+    for name in os.listdir(root):
+        if os.path.exists(os.path.join(root, name, "manifest.json")):
+            jobs.append((name, FleetJob(os.path.join(root, name)).progress()))
+    return sorted(jobs, key=lambda j: j[1].get("updated_at", 0), reverse=True)
+
+
+def start_job(imos, fuels=None, source=None, name=None, root=None):
+    """Create (or resume) a job and run it in a background thread. Returns the job name."""
+    root = root or config.FLEET_JOBS_DIR
+    name = name or time.strftime("fleet-%Y%m%d-%H%M%S")
+    job = FleetJob.create(os.path.join(root, name), imos, fuels, source)
+    with _running_lock:
+        thread = _running.get(name)
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=_run_logged, args=(job,), name=f"fleet-{name}", daemon=True)
+            _running[name] = thread
+            thread.start()
+    return name
+
+
+def _run_logged(job):
+    try:
+        job.run()
+    except Exception as e:
+        print(f"Fleet job {job.job_dir} failed: {e}")
+        job._write_progress(phase="error", error=str(e))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the financial model for a fleet of vessels.")
+    parser.add_argument("imos", help="CSV file with an 'imo' column, or comma-separated IMOs")
+    parser.add_argument("--job-dir", help="Job directory (an existing one is resumed)")
+    parser.add_argument("--fuels", default="", help="Comma-separated scenario fuels to rank per vessel")
+    parser.add_argument("--source", choices=("api", "local"), default=config.FINANCIAL_MODEL_SOURCE)
+    parser.add_argument("--concurrency", type=int, default=config.FLEET_FETCH_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    imos = args.imos if os.path.exists(args.imos) else args.imos.split(",")
+    job_dir = args.job_dir or os.path.join(config.FLEET_JOBS_DIR, time.strftime("fleet-%Y%m%d-%H%M%S"))
+    job = FleetJob.create(job_dir, imos, [f for f in args.fuels.split(",") if f], args.source)
+
+    def report(state):
+        print(f"[{state.get('phase')}] fetched {state.get('fetched', 0)}/{state.get('total', 0)}, "
+              f"modelled {state.get('modelled', 0)}, failed {state.get('failed', 0)}", flush=True)
+
+    frame = job.run(concurrency=args.concurrency, on_progress=report)
+    print(f"{len(frame)} vessels written to {job.results_path}")
+
+
+if __name__ == "__main__":
+    main()
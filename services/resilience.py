@@ -0,0 +1,269 @@
+# services/resilience.py
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without touching the network while an endpoint's breaker is open."""
+
+
+def is_retryable(exc):
+    """Transport errors, timeouts, 5xx and 429 are worth another attempt; other 4xx are not."""
+    if isinstance(exc, requests.exceptions.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        return status is None or status >= 500 or status == 429
+    return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+# -------------------------------------------------------------------------------
+# CIRCUIT BREAKER
+# -------------------------------------------------------------------------------
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures. While open,
+    calls fail fast. After `reset_timeout` seconds a single trial call is let
+    through (half-open) and other callers are still rejected; success closes
+    the breaker, failure re-opens it. A trial that reports back neither way
+    within `reset_timeout` is replaced by a new one.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if self.state == "open":
+                if now - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self._trial_in_flight and now - self._trial_started < self.reset_timeout:
+                return False
+            self._trial_in_flight = True
+            self._trial_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+# -------------------------------------------------------------------------------
+# LATENCY TRACKING
+# -------------------------------------------------------------------------------
+class LatencyTracker:
+    """Rolling window of successful request latencies (seconds)."""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct, min_samples=1):
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+# -------------------------------------------------------------------------------
+# HEDGING POOL
+# -------------------------------------------------------------------------------
+_hedge_executor = None
+_hedge_pid = None
+_hedge_lock = threading.Lock()
+
+
+def _get_hedge_executor(max_workers):
+    global _hedge_executor, _hedge_pid
+    pid = os.getpid()
+    if _hedge_executor is None or _hedge_pid != pid:
+        with _hedge_lock:
+            if _hedge_executor is None or _hedge_pid != pid:
+                _hedge_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-hedge")
+                _hedge_pid = pid
+    return _hedge_executor
+
+
+# -------------------------------------------------------------------------------
+# ENDPOINT GUARD
+# -------------------------------------------------------------------------------
+class EndpointGuard:
+    """
+    Wraps calls to one endpoint with jittered exponential retries, a circuit
+    breaker, optional hedging and an overall latency budget.
+
+    `fn(timeout)` performs a single idempotent request and must raise on failure.
+    The budget caps the wall time of all attempts and back-off sleeps together.
+    """
+
+    def __init__(self, name, budget=30.0, max_attempts=3, base_delay=0.25, max_delay=4.0,
+                 breaker=None, hedge=False, hedge_percentile=95, hedge_min_samples=20,
+                 hedge_workers=8):
+        self.name = name
+        self.budget = budget
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_workers = hedge_workers
+        self._stats = {"calls": 0, "retries": 0, "hedges": 0, "failures": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def backoff(self, attempt):
+        """Full-jitter exponential back-off for the given retry number (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def hedge_delay(self):
+        if not self.hedge:
+            return None
+        return self.latency.percentile(self.hedge_percentile, self.hedge_min_samples)
+
+    def call(self, fn, timeout):
+        self._count("calls")
+        deadline = time.monotonic() + self.budget
+        attempt = 0
+        while True:
+            # Budget first: once allow() admits a half-open trial, the attempt
+            # must run and report back to the breaker.
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"{self.name}: latency budget of {self.budget}s exhausted")
+
+            if not self.breaker.allow():
+                self._count("rejected")
+                raise CircuitOpenError(f"{self.name}: circuit open, backend marked as degraded")
+
+            try:
+                result = self._attempt(fn, min(timeout, remaining))
+            except Exception as e:
+                if not is_retryable(e):
+                    # The backend answered; it is up even if it rejected the request.
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                attempt += 1
+                delay = self.backoff(attempt)
+                if attempt >= self.max_attempts or time.monotonic() + delay >= deadline:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                print(f"{self.name}: attempt {attempt} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def _attempt(self, fn, timeout):
+        start = time.monotonic()
+        hedge_after = self.hedge_delay()
+        if hedge_after is None or hedge_after >= timeout:
+            result = fn(timeout)
+        else:
+            result = self._hedged(fn, timeout, hedge_after)
+        self.latency.record(time.monotonic() - start)
+        return result
+
+    def _hedged(self, fn, timeout, hedge_after):
+        executor = _get_hedge_executor(self.hedge_workers)
+        primary = executor.submit(fn, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        self._count("hedges")
+        backup = executor.submit(fn, max(timeout - hedge_after, 0.1))
+        pending = {primary, backup}
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["state"] = self.breaker.state
+        stats["p95"] = self.latency.percentile(95)
+        return stats
+
+
+# -------------------------------------------------------------------------------
+# REGISTRY
+# -------------------------------------------------------------------------------
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def guard_for(url):
+    """Return the shared guard for the endpoint `url` (query string ignored)."""
+    import config
+
+    endpoint = url.split("?", 1)[0]
+    guard = _guards.get(endpoint)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.get(endpoint)
+            if guard is None:
+                guard = EndpointGuard(
+                    endpoint.rsplit("/", 1)[-1] or endpoint,
+                    budget=config.API_LATENCY_BUDGETS.get(endpoint, config.API_DEFAULT_LATENCY_BUDGET),
+                    max_attempts=config.API_RETRY_ATTEMPTS,
+                    base_delay=config.API_RETRY_BASE_DELAY,
+                    max_delay=config.API_RETRY_MAX_DELAY,
+                    breaker=CircuitBreaker(config.API_BREAKER_FAILURES, config.API_BREAKER_RESET),
+                    hedge=config.API_HEDGE_ENABLED,
+                    hedge_percentile=config.API_HEDGE_PERCENTILE,
+                    hedge_min_samples=config.API_HEDGE_MIN_SAMPLES,
+                )
+                _guards[endpoint] = guard
+    return guard
+
+
+def resilience_stats():
+    with _guards_lock:
+        guards = dict(_guards)
+    return {endpoint: guard.stats() for endpoint, guard in guards.items()}
@@ -0,0 +1,242 @@
+# services/result_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# -------------------------------------------------------------------------------
+# SERVER-SIDE RESULT STORE
+# -------------------------------------------------------------------------------
+# Model results (financial payloads, dashboard scenarios) stay on the server. The
+# browser's dcc.Store only holds a short key such as "res:3f9c...", and callbacks
+# resolve that key here. Without this, the full JSON would travel in every
+# request that lists the store as an Input or State.
+#
+# Keys are content hashes, so storing the same result twice gives the same key.
+# Two tiers:
+#   - an in-process LRU of decoded results (treat them as read-only)
+#   - a SQLite file shared by all gunicorn workers (zlib-compressed JSON)
+# Entries expire `ttl` seconds after their last use. A memory hit also refreshes
+# the row's used_at in the shared file (at most once per ttl/10), so another
+# worker's purge() does not drop a result this worker is still serving. A key
+# that has expired (or a browser session older than the store) resolves to None,
+# which the callbacks already treat as "no data yet".
+
+KEY_PREFIX = "res:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at);
+"""
+
+
+def is_result_key(value):
+    return isinstance(value, str) and value.startswith(KEY_PREFIX)
+
+
+def _dumps(payload):
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ResultStore:
+    """Results by key: in-process LRU in front of a SQLite file shared by workers."""
+
+    def __init__(self, path, ttl=24 * 3600, max_entries=64, max_bytes=128 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (used_at, payload, size, touched_at in the file)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized_pid = None
+        self._last_purge = 0.0
+        self._stats = {"puts": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    # --- connections -------------------------------------------------------------
+    def _connect(self):
+        """One connection per thread (and per process, after a fork)."""
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == pid:
+            return conn
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.pid = pid
+        with self._init_lock:
+            if self._initialized_pid != pid:
+                conn.executescript(_SCHEMA)
+                conn.commit()
+                self._initialized_pid = pid
+        return conn
+
+    # --- memory tier -------------------------------------------------------------
+    def _memory_put(self, key, payload, size, now):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[2]
+            self._entries[key] = (now, payload, size, now)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def _memory_get(self, key, now):
+        """(payload, whether the file's used_at is due for a refresh); (None, False) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            used_at, payload, size, touched_at = entry
+            if now - used_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                return None, False
+            touch = now - touched_at >= self.ttl / 10
+            self._entries[key] = (now, payload, size, now if touch else touched_at)
+            self._entries.move_to_end(key)
+            return payload, touch
+
+    # --- file tier ---------------------------------------------------------------
+    def _write(self, key, text, now):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, body, size, used_at) VALUES (?, ?, ?, ?)",
+                (key, zlib.compress(text.encode(), 1), len(text), now),
+            )
+
+    def _touch(self, key, payload, now):
+        """Refresh used_at in the file; re-insert if another worker's purge() dropped the row."""
+        conn = self._connect()
+        with conn:
+            updated = conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (now, key)).rowcount
+        if not updated:
+            self._write(key, _dumps(payload), now)
+
+    # --- public API --------------------------------------------------------------
+    def put(self, payload):
+        """Store a JSON-serializable result and return its key."""
+        text = _dumps(payload)
+        key = KEY_PREFIX + hashlib.blake2b(text.encode(), digest_size=12).hexdigest()
+        now = time.time()
+        self._memory_put(key, payload, len(text), now)
+        self._write(key, text, now)
+        self._stats["puts"] += 1
+        if now - self._last_purge > 300:
+            self.purge(now)
+        return key
+
+    def get(self, key):
+        """The result stored under `key`, or None if unknown or expired."""
+        if not is_result_key(key):
+            return None
+        now = time.time()
+        payload, touch = self._memory_get(key, now)
+        if payload is not None:
+            self._stats["memory_hits"] += 1
+            if touch:
+                self._touch(key, payload, now)
+            return payload
+        conn = self._connect()
+        row = conn.execute("SELECT body, used_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            self._stats["misses"] += 1
+            return None
+        text = zlib.decompress(row[0]).decode()
+        payload = json.loads(text)
+        with conn:
+            conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (now, key))
+        self._memory_put(key, payload, len(text), now)
+        self._stats["disk_hits"] += 1
+        return payload
+
+    def purge(self, now=None):
+        """Drop entries unused for longer than the TTL from the shared file."""
+        now = now or time.time()
+        self._last_purge = now
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM results WHERE used_at < ?", (now - self.ttl,))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM results")
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._entries), "memory_bytes": self._bytes}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """Process-wide store configured from config (created on first use)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                import config
+                _store = ResultStore(config.RESULT_STORE_PATH, ttl=config.RESULT_STORE_TTL,
+                                     max_entries=config.RESULT_STORE_MAX_ENTRIES,
+                                     max_bytes=config.RESULT_STORE_MAX_MB * 1024 * 1024)
+    return _store
+
+
+def store_result(payload):
+    """Key for the browser store (None and empty results pass through unchanged)."""
+    if not payload:
+        return payload
+    return get_result_store().put(payload)
+
+
+def resolve_result(value):
+    """The result behind a store value. Keys are looked up; inline payloads pass through."""
+    if is_result_key(value):
+        return get_result_store().get(value)
+    return value
+
+
+def load_scenario_results(value):
+    """
+    ScenarioResults for a dashboard-scenarios store value. Keyed results are
+    built once per key and carry the aggregate cache, so their subsets and
+    totals are shared by every callback.
+    """
+    from engine.results import ScenarioResults, default_aggregate_cache
+
+    if not is_result_key(value):
+        return ScenarioResults.of(value)
+    cache = default_aggregate_cache()
+
+    def build():
+        payload = get_result_store().get(value)
+        if not payload:
+            return None  # expired or unknown key: not cached
+        results = ScenarioResults.from_store(payload)
+        results.values.flags.writeable = False
+        results.key, results.cache = value, cache
+        return results
+
+    results = cache.get_or_compute(("results", value), build)
+    return results if results is not None else ScenarioResults.of(None)
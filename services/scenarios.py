@@ -0,0 +1,57 @@
+# services/scenarios.py
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from services.cache import ResponseCache, cached_get
+
+# -------------------------------------------------------------------------------
+# PER-FUEL SCENARIO FAN-OUT
+# -------------------------------------------------------------------------------
+# The scenarios endpoint accepts a comma-joined fuel list, but asking for one fuel
+# per request lets each fuel be cached on its own: adding a fuel to the selection
+# only costs the request for that fuel.
+scenario_cache = ResponseCache(
+    "scenarios",
+    ttl=config.API_CACHE_TTL,
+    max_entries=config.API_CACHE_MAX_ENTRIES,
+    max_bytes=config.API_CACHE_MAX_MB * 1024 * 1024,
+    disk_dir=config.API_CACHE_DIR,
+    disk_max_bytes=config.API_CACHE_DISK_MAX_MB * 1024 * 1024,
+)
+
+_executor = ThreadPoolExecutor(
+    max_workers=config.SCENARIO_FANOUT_WORKERS,
+    thread_name_prefix="scenario-fetch",
+)
+
+
+def _fetch_one(base_params, fuel, timeout):
+    params = {**base_params, "scenario_future_aux_fuel": fuel}
+    return cached_get(scenario_cache, config.DASHBOARD_ENDPOINT, params, timeout=timeout)
+
+
+def fetch_scenarios(base_params, fuels, timeout=60):
+    """
+    Fetch each fuel scenario separately (cached per base params + fuel) and merge
+    them into the dashboard-scenarios-store shape: {scenario_name: [records]}.
+
+    Fuels that fail are logged and skipped. Returns None if every fuel failed.
+    """
+    fuels = list(dict.fromkeys(f for f in fuels if f))
+    futures = [(fuel, _executor.submit(_fetch_one, base_params, fuel, timeout)) for fuel in fuels]
+
+    merged = {}
+    failures = 0
+    for fuel, future in futures:
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Scenario API Error ({fuel}): {str(e)}")
+            failures += 1
+            continue
+        if isinstance(result, dict):
+            merged.update(result)
+
+    if failures and failures == len(futures):
+        return None
+    return merged
@@ -0,0 +1,187 @@
+# services/vessel_index.py
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# -------------------------------------------------------------------------------
+# VESSEL LOOKUP CACHE + TYPEAHEAD INDEX
+# -------------------------------------------------------------------------------
+# Vessel summaries fetched from getvesseldetails_engine_places are kept in a small
+# SQLite file shared by all workers. It answers two questions:
+#   - "have we looked this IMO/MMSI/name up recently?" (TTL'd lookup cache)
+#   - "which known vessels start with what the user is typing?" (typeahead)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vessels (
+    imo TEXT PRIMARY KEY,
+    mmsi TEXT,
+    name TEXT NOT NULL,
+    name_norm TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    places TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vessels_name_norm ON vessels (name_norm);
+CREATE INDEX IF NOT EXISTS vessels_mmsi ON vessels (mmsi);
+CREATE TABLE IF NOT EXISTS lookups (
+    key TEXT PRIMARY KEY,
+    imo TEXT NOT NULL
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vessels_fts USING fts5(name, imo UNINDEXED, tokenize='unicode61');
+"""
+
+
+def normalize_term(term):
+    return " ".join(str(term or "").split()).lower()
+
+
+def lookup_key(search_term, search_type):
+    kind = "name" if search_type == "name" else "id"
+    return f"{kind}:{normalize_term(search_term)}"
+
+
+class VesselIndex:
+    """SQLite-backed vessel cache with prefix search over names, IMOs and MMSIs."""
+
+    def __init__(self, path, ttl=24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized_pid = None
+        self.fts = False
+
+    # --- connections -------------------------------------------------------------
+    def _connect(self):
+        """One connection per thread (and per process, after a fork)."""
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == pid:
+            return conn
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.pid = pid
+        self._ensure_schema(conn, pid)
+        return conn
+
+    def _ensure_schema(self, conn, pid):
+        with self._init_lock:
+            if self._initialized_pid == pid:
+                return
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False  # SQLite built without FTS5: fall back to LIKE
+            conn.commit()
+            self._initialized_pid = pid
+
+    # --- lookup cache ------------------------------------------------------------
+    def get(self, search_term, search_type):
+        """(vessel_summary, places_summary) for a recent search, else None."""
+        if not normalize_term(search_term):
+            return None
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT v.summary, v.places, v.fetched_at FROM lookups l "
+            "JOIN vessels v ON v.imo = l.imo WHERE l.key = ?",
+            (lookup_key(search_term, search_type),),
+        ).fetchone()
+        if row is None or time.time() - row[2] > self.ttl:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def put(self, search_term, search_type, vessel, places):
+        """Store a fetched vessel under the search that found it and its own IMO/MMSI/name."""
+        imo = str(vessel.get("imo") or "").strip()
+        if not imo:
+            return
+        name = str(vessel.get("vessel_name") or "").strip()
+        mmsi = str(vessel.get("mmsi") or "").strip() or None
+        keys = {lookup_key(search_term, search_type), lookup_key(imo, "imo")}
+        if mmsi:
+            keys.add(lookup_key(mmsi, "imo"))
+        if name:
+            keys.add(lookup_key(name, "name"))
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO vessels (imo, mmsi, name, name_norm, summary, places, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (imo, mmsi, name, normalize_term(name), json.dumps(vessel), json.dumps(places), time.time()),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO lookups (key, imo) VALUES (?, ?)",
+                [(key, imo) for key in keys],
+            )
+            if self.fts:
+                conn.execute("DELETE FROM vessels_fts WHERE imo = ?", (imo,))
+                conn.execute("INSERT INTO vessels_fts (name, imo) VALUES (?, ?)", (name, imo))
+
+    # --- typeahead ---------------------------------------------------------------
+    def suggest(self, prefix, search_type="imo", limit=8):
+        """
+        Known vessels matching what has been typed so far, as
+        [{"imo", "mmsi", "name"}]. IMO/MMSI searches match on number prefix;
+        name searches match any word prefix ("grand" finds "MSC GRANDIOSA").
+        """
+        term = normalize_term(prefix)
+        if not term:
+            return []
+        conn = self._connect()
+        if search_type != "name":
+            upper = term[:-1] + chr(ord(term[-1]) + 1)
+            rows = conn.execute(
+                "SELECT imo, mmsi, name FROM vessels "
+                "WHERE (imo >= ? AND imo < ?) OR (mmsi >= ? AND mmsi < ?) "
+                "ORDER BY imo LIMIT ?",
+                (term, upper, term, upper, limit),
+            ).fetchall()
+        elif self.fts:
+            words = [w.replace('"', "") for w in term.split() if w.replace('"', "")]
+            match = " ".join(f'"{w}"*' for w in words)
+            rows = conn.execute(
+                "SELECT v.imo, v.mmsi, v.name FROM vessels_fts f JOIN vessels v ON v.imo = f.imo "
+                "WHERE vessels_fts MATCH ? ORDER BY v.name_norm LIMIT ?",
+                (match, limit),
+            ).fetchall() if match else []
+        else:
+            rows = conn.execute(
+                "SELECT imo, mmsi, name FROM vessels WHERE name_norm LIKE ? ORDER BY name_norm LIMIT ?",
+                (f"%{term}%", limit),
+            ).fetchall()
+        return [{"imo": imo, "mmsi": mmsi, "name": name} for imo, mmsi, name in rows]
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM lookups")
+            conn.execute("DELETE FROM vessels")
+            if self.fts:
+                conn.execute("DELETE FROM vessels_fts")
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_vessel_index():
+    """Process-wide index configured from config (created on first use)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                import config
+                _index = VesselIndex(config.VESSEL_INDEX_PATH, ttl=config.VESSEL_CACHE_TTL)
+    return _index